@@ -0,0 +1,112 @@
+"""
+분산 백필 API 엔드포인트
+다년치 재적재 작업을 날짜 청크로 등록하고, 각 노드의 백필 워커가 청크를 리스하여 처리
+"""
+from fastapi import APIRouter, Depends, HTTPException
+from datetime import datetime
+import logging
+
+from app.core.serialization import FastJSONResponse
+from app.models.schemas import BackfillJobRequest
+from app.services.backfill_service import get_backfill_service, BackfillService
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/backfill", tags=["Backfill"])
+
+@router.post("/jobs")
+async def create_backfill_job(
+    request: BackfillJobRequest,
+    service: BackfillService = Depends(get_backfill_service)
+):
+    """
+    백필 작업 등록 (날짜 범위를 청크로 나누어 클레임 테이블에 저장)
+
+    - **start_date**: 시작 날짜 (YYYY-MM-DD) - 필수
+    - **end_date**: 종료 날짜 (YYYY-MM-DD, 포함) - 필수
+    - **chunk_days**: 청크 일수 (선택)
+    - **job_id**: 중단된 작업을 같은 ID 로 재등록하면 완료된 청크는 그대로 유지 (선택)
+
+    **예시**: `{"start_date": "2022-01-01", "end_date": "2024-12-31", "chunk_days": 14}`
+    """
+    try:
+        start = datetime.strptime(request.start_date, '%Y-%m-%d')
+        end = datetime.strptime(request.end_date, '%Y-%m-%d')
+    except ValueError:
+        raise HTTPException(status_code=400, detail="날짜 형식이 올바르지 않습니다 (YYYY-MM-DD)")
+
+    if start > end:
+        raise HTTPException(status_code=400, detail="start_date 는 end_date 보다 이후일 수 없습니다")
+
+    try:
+        job = await service.create_job(request.start_date, request.end_date,
+                                       request.chunk_days, request.job_id)
+        return FastJSONResponse(job)
+    except Exception as e:
+        logger.error(f"❌ [Backfill] 작업 등록 API 오류: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"서버 오류: {str(e)}")
+
+@router.get("/jobs/{job_id}")
+async def get_backfill_job(
+    job_id: str,
+    service: BackfillService = Depends(get_backfill_service)
+):
+    """
+    백필 작업 진행 상태 조회 (상태별 청크 수, 처리 중인 청크와 리스 보유 노드, 실패 청크)
+    """
+    try:
+        job = await service.get_job(job_id)
+    except Exception as e:
+        logger.error(f"❌ [Backfill] 작업 조회 API 오류: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"서버 오류: {str(e)}")
+
+    if job["total_chunks"] == 0:
+        raise HTTPException(status_code=404, detail=f"백필 작업을 찾을 수 없습니다: {job_id}")
+    return FastJSONResponse(job)
+
+@router.post("/jobs/{job_id}/retry")
+async def retry_backfill_job(
+    job_id: str,
+    service: BackfillService = Depends(get_backfill_service)
+):
+    """
+    최대 시도 횟수를 넘겨 실패한 청크를 다시 대기 상태로 변경
+    """
+    try:
+        retried = await service.retry_failed(job_id)
+        return FastJSONResponse({"job_id": job_id, "retried_chunks": retried})
+    except Exception as e:
+        logger.error(f"❌ [Backfill] 재시도 API 오류: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"서버 오류: {str(e)}")
+
+@router.get("/worker")
+async def get_backfill_worker(
+    service: BackfillService = Depends(get_backfill_service)
+):
+    """
+    이 노드(프로세스)의 백필 워커 상태 조회
+
+    - **current**: 처리 중인 청크 목록
+    - **concurrency**: 자동 조정된 동시 처리 수, 일당 처리 시간 기준과 변경 이력(history)
+    """
+    return FastJSONResponse(service.get_stats())
+
+@router.post("/worker/start")
+async def start_backfill_worker(
+    service: BackfillService = Depends(get_backfill_service)
+):
+    """
+    이 노드(프로세스)의 백필 워커 시작 (BACKFILL_WORKER_ENABLED 가 꺼진 노드를 작업에 참여시킬 때)
+    """
+    await service.start()
+    return FastJSONResponse(service.get_stats())
+
+@router.post("/worker/stop")
+async def stop_backfill_worker(
+    service: BackfillService = Depends(get_backfill_service)
+):
+    """
+    이 노드(프로세스)의 백필 워커 중지 (처리 중인 청크는 대기 상태로 반납)
+    """
+    await service.stop()
+    return FastJSONResponse(service.get_stats())
@@ -0,0 +1,78 @@
+"""
+적재 현황(coverage) API 엔드포인트
+날짜별 소스 데이터 유무와 대상 테이블 누락/지연 조회, 해당 날짜만 재적재 등록
+"""
+from fastapi import APIRouter, Depends, HTTPException, Query
+from datetime import datetime
+from typing import Optional
+import logging
+
+from app.core.admission import admission
+from app.core.config import settings
+from app.core.serialization import FastJSONResponse
+from app.services.coverage_service import get_coverage_service, CoverageService
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/coverage", tags=["Coverage"])
+
+def _validate_period(start: str, end: str):
+    try:
+        start_dt = datetime.strptime(start, '%Y-%m-%d')
+        end_dt = datetime.strptime(end, '%Y-%m-%d')
+    except ValueError:
+        raise HTTPException(status_code=400, detail="날짜 형식이 올바르지 않습니다 (YYYY-MM-DD)")
+
+    if start_dt > end_dt:
+        raise HTTPException(status_code=400, detail="start 는 end 보다 이후일 수 없습니다")
+    if (end_dt - start_dt).days + 1 > settings.COVERAGE_MAX_DAYS:
+        raise HTTPException(status_code=400,
+                            detail=f"조회 기간은 최대 {settings.COVERAGE_MAX_DAYS}일입니다")
+
+@router.get("", dependencies=[Depends(admission("aggregate"))])
+async def get_coverage(
+    start: str = Query(..., description="시작 날짜 (YYYY-MM-DD)"),
+    end: str = Query(..., description="종료 날짜 (YYYY-MM-DD, 포함)"),
+    only_gaps: bool = Query(False, description="누락/지연 대상이 있는 날짜만 반환"),
+    service: CoverageService = Depends(get_coverage_service)
+):
+    """
+    날짜별 소스 데이터 유무와 대상 테이블 적재 상태 조회
+
+    - **sources**: 소스 테이블별 해당 날짜 행 수 (tb_solar_day, tb_weather_info, tb_aggregate_smarteye_day)
+    - **targets**: 대상별 상태
+      - `ok`: 현재 소스로 계산한 값과 적재값이 같음
+      - `missing`: 소스는 있으나 대상 행(값)이 없음
+      - `stale`: 적재 후 소스가 바뀌어 적재값이 현재 소스와 다름
+      - `no_source`: 집계할 소스 데이터가 없음
+    - **gap_ranges**: 재적재가 필요한 연속 날짜 구간
+
+    **예시**: `/api/v1/coverage?start=2025-01-01&end=2025-01-31&only_gaps=true`
+    """
+    _validate_period(start, end)
+
+    try:
+        return FastJSONResponse(await service.get_coverage(start, end, only_gaps=only_gaps))
+    except Exception as e:
+        logger.error(f"❌ [Coverage] 조회 API 오류: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"서버 오류: {str(e)}")
+
+@router.post("/enqueue", dependencies=[Depends(admission("aggregate"))])
+async def enqueue_coverage_gaps(
+    start: str = Query(..., description="시작 날짜 (YYYY-MM-DD)"),
+    end: str = Query(..., description="종료 날짜 (YYYY-MM-DD, 포함)"),
+    chunk_days: Optional[int] = Query(None, ge=1, description="청크 일수"),
+    service: CoverageService = Depends(get_coverage_service)
+):
+    """
+    누락/지연 날짜만 백필 작업으로 등록 (진행 상태는 `/api/v1/backfill/jobs/{job_id}` 로 조회)
+
+    **예시**: `/api/v1/coverage/enqueue?start=2024-01-01&end=2024-12-31`
+    """
+    _validate_period(start, end)
+
+    try:
+        return FastJSONResponse(await service.enqueue_gaps(start, end, chunk_days))
+    except Exception as e:
+        logger.error(f"❌ [Coverage] 재적재 등록 API 오류: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"서버 오류: {str(e)}")
@@ -0,0 +1,58 @@
+"""
+ESS 예측 규칙 what-if API 엔드포인트
+과거 기간에 대해 ESS 용량/태양광 보정 배율을 바꿔 가며 예측값을 평가 (tb_nrt_bms_daily_stat 에 쓰지 않음)
+"""
+from fastapi import APIRouter, Depends, HTTPException
+from datetime import datetime
+import logging
+
+from app.core.admission import admission
+from app.core.config import settings
+from app.core.serialization import FastJSONResponse
+from app.models.schemas import ESSWhatIfRequest
+from app.services.ess_whatif_service import get_ess_whatif_service, ESSWhatIfService
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/ess-predict", tags=["ESS Predict What-If"])
+
+@router.post("/what-if", dependencies=[Depends(admission("aggregate"))])
+async def evaluate_ess_what_if(
+    request: ESSWhatIfRequest,
+    service: ESSWhatIfService = Depends(get_ess_whatif_service)
+):
+    """
+    기간의 일별 태양광 예측 SUM / 스마트아이 예측값을 한 번 읽어 용량 x 보정 배율 격자 평가
+
+    - **capacities**: 평가할 ESS 용량 목록 (현재 규칙은 3120)
+    - **solar_scales**: 태양광 예측 SUM 보정 배율 목록 (기본 [1.0])
+    - **include_series**: false 면 요약만 반환 (큰 격자/긴 기간)
+    - **scenarios[].summary**: 합계/평균/최댓값, 용량에 걸려 잘린 일수(saturated_days), 0 인 일수,
+      현재 규칙(용량 3120, 배율 1.0) 대비 합계 차이(total_delta_vs_current)
+
+    **예시**: `{"start_date": "2024-01-01", "end_date": "2024-12-31", "capacities": [2000, 3120, 4000]}`
+    """
+    try:
+        start = datetime.strptime(request.start_date, '%Y-%m-%d')
+        end = datetime.strptime(request.end_date, '%Y-%m-%d')
+    except ValueError:
+        raise HTTPException(status_code=400, detail="날짜 형식이 올바르지 않습니다 (YYYY-MM-DD)")
+
+    if start > end:
+        raise HTTPException(status_code=400, detail="start_date 는 end_date 보다 이후일 수 없습니다")
+    if (end - start).days + 1 > settings.WHATIF_MAX_DAYS:
+        raise HTTPException(status_code=400, detail=f"조회 기간은 최대 {settings.WHATIF_MAX_DAYS}일입니다")
+    if any(capacity < 0 for capacity in request.capacities):
+        raise HTTPException(status_code=400, detail="capacities 는 0 이상이어야 합니다")
+    scenarios = len(set(request.capacities)) * len(set(request.solar_scales))
+    if scenarios > settings.WHATIF_MAX_SCENARIOS:
+        raise HTTPException(status_code=400,
+                            detail=f"시나리오 수({scenarios})는 최대 {settings.WHATIF_MAX_SCENARIOS}개입니다")
+
+    try:
+        result = await service.what_if(request.start_date, request.end_date, request.capacities,
+                                       request.solar_scales, request.include_series)
+        return FastJSONResponse(result)
+    except Exception as e:
+        logger.error(f"❌ [ESS What-If] 평가 API 오류: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"서버 오류: {str(e)}")
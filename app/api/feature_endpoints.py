@@ -0,0 +1,63 @@
+"""
+AI 피처 벡터 조회 API 엔드포인트
+"""
+from fastapi import APIRouter, Depends, HTTPException, Query
+from datetime import datetime
+from typing import Optional
+import logging
+
+from app.core.admission import admission
+from app.core.config import settings
+from app.core.downsampling import DOWNSAMPLE_METHODS
+from app.core.serialization import FastJSONResponse
+from app.services.feature_service import get_feature_service, FeatureService, NUMERIC_FEATURE_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/features", tags=["Features"])
+
+@router.get("", dependencies=[Depends(admission("verify"))])
+async def get_features(
+    start: str = Query(..., description="시작 날짜 (YYYY-MM-DD)", example="2025-01-01"),
+    end: str = Query(..., description="종료 날짜 (YYYY-MM-DD, 포함)", example="2025-01-31"),
+    max_points: Optional[int] = Query(None, ge=3, le=settings.DOWNSAMPLE_MAX_POINTS,
+                                      description="응답 행 수 상한 (범위가 더 길면 다운샘플링)"),
+    method: str = Query("lttb", description="다운샘플링 방식 (lttb / minmax)"),
+    y: str = Query("today_generation", description="다운샘플링 기준 컬럼"),
+    service: FeatureService = Depends(get_feature_service)
+):
+    """
+    날짜별 Solar Power / Power Usage / ESS Charge / ESS 예측값을 조인한 피처 행렬 조회
+
+    - **start**: 시작 날짜 (YYYY-MM-DD)
+    - **end**: 종료 날짜 (YYYY-MM-DD, 포함)
+    - **max_points**: 응답 행 수 상한 (선택). 범위 일수가 더 크면 `y` 컬럼의 모양을 유지하도록 대표 행만 반환
+    - **method**: `lttb` (Largest-Triangle-Three-Buckets, 기본) / `minmax` (버킷별 최솟값·최댓값 행)
+    - **y**: 다운샘플링 기준 컬럼 (기본 `today_generation`, `y` 가 null 인 행은 제외)
+
+    **응답**: `columns` 순서의 `rows` 행렬 (해당 테이블에 데이터가 없으면 null),
+    다운샘플링 시 `downsampling` (method, column, source_count, count 등)
+    """
+    try:
+        start_date = datetime.strptime(start, '%Y-%m-%d')
+        end_date = datetime.strptime(end, '%Y-%m-%d')
+    except ValueError:
+        raise HTTPException(status_code=400, detail="날짜 형식이 올바르지 않습니다 (YYYY-MM-DD)")
+
+    if start_date > end_date:
+        raise HTTPException(status_code=400, detail="start 는 end 보다 이후일 수 없습니다")
+
+    if method not in DOWNSAMPLE_METHODS:
+        raise HTTPException(status_code=400, detail=f"method 는 {', '.join(DOWNSAMPLE_METHODS)} 중 하나여야 합니다")
+
+    if y not in NUMERIC_FEATURE_COLUMNS:
+        raise HTTPException(status_code=400, detail=f"y 는 {', '.join(NUMERIC_FEATURE_COLUMNS)} 중 하나여야 합니다")
+
+    try:
+        logger.info(f"📊 [Feature] 피처 조회 API 호출 - {start} ~ {end}"
+                    + (f" (max_points={max_points}, {method}, {y})" if max_points else ""))
+        return FastJSONResponse(await service.get_features(start, end, max_points, method, y))
+
+    except Exception as e:
+        logger.error(f"❌ [Feature] API 오류: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"서버 오류: {str(e)}")
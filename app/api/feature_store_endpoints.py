@@ -0,0 +1,67 @@
+"""
+로컬 피처 스냅샷 API 엔드포인트
+(값은 같은 호스트의 소비자가 파일을 직접 메모리 매핑하여 읽고, API 는 파일 구성/오프셋 안내와 갱신만 담당)
+"""
+from fastapi import APIRouter, Depends, HTTPException, Query
+from datetime import datetime
+from typing import Optional
+import logging
+
+from app.core.serialization import FastJSONResponse
+from app.services.feature_store import get_feature_store, FeatureStore
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/feature-store", tags=["Feature Store"])
+
+def _validate_period(start: str, end: str):
+    try:
+        if datetime.strptime(start, '%Y-%m-%d') > datetime.strptime(end, '%Y-%m-%d'):
+            raise HTTPException(status_code=400, detail="start 는 end 보다 이후일 수 없습니다")
+    except ValueError:
+        raise HTTPException(status_code=400, detail="날짜 형식이 올바르지 않습니다 (YYYY-MM-DD)")
+
+@router.get("")
+async def describe_feature_store(
+    start: Optional[str] = Query(None, description="시작 날짜 (YYYY-MM-DD)"),
+    end: Optional[str] = Query(None, description="종료 날짜 (YYYY-MM-DD, 포함)"),
+    store: FeatureStore = Depends(get_feature_store)
+):
+    """
+    스냅샷 파일 경로/형식과 (start, end 지정 시) 날짜 범위의 파일 오프셋 조회
+
+    - **files**: 컬럼별 float64 파일 (NULL 은 NaN), `present` 는 날짜별 데이터 유무(uint8)
+    - **range.offset** / **range.count**: 컬럼 파일에서 범위의 시작 위치와 일수 (byte_offset = offset * 8)
+
+    **예시**: `/api/v1/feature-store?start=2022-01-01&end=2024-12-31`
+    """
+    if start or end:
+        if not (start and end):
+            raise HTTPException(status_code=400, detail="start 와 end 를 함께 지정하세요")
+        _validate_period(start, end)
+
+    try:
+        return FastJSONResponse(store.describe(start, end))
+    except Exception as e:
+        logger.error(f"❌ [FeatureStore] 조회 API 오류: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"서버 오류: {str(e)}")
+
+@router.post("/sync")
+async def sync_feature_store(
+    start: str = Query(..., description="시작 날짜 (YYYY-MM-DD)"),
+    end: str = Query(..., description="종료 날짜 (YYYY-MM-DD, 포함)"),
+    store: FeatureStore = Depends(get_feature_store)
+):
+    """
+    날짜 범위의 피처를 DB 에서 다시 읽어 스냅샷 갱신 (최초 적재 또는 외부 적재 반영용)
+
+    **예시**: `/api/v1/feature-store/sync?start=2022-01-01&end=2024-12-31`
+    """
+    _validate_period(start, end)
+
+    try:
+        written = await store.sync(start, end)
+        return FastJSONResponse({"start": start, "end": end, "synced_days": written, **store.describe()})
+    except Exception as e:
+        logger.error(f"❌ [FeatureStore] 갱신 API 오류: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"서버 오류: {str(e)}")
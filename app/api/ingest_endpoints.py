@@ -0,0 +1,57 @@
+"""
+원천 데이터 적재 API 엔드포인트
+"""
+from fastapi import APIRouter, Depends, HTTPException
+import logging
+import math
+
+from app.core.config import settings
+from app.models.schemas import IngestRequest, IngestResponse
+from app.services.ingest_service import get_ingest_service, IngestService, IngestBufferFull, INGEST_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/ingest", tags=["Ingest"])
+
+@router.post("/{source}", response_model=IngestResponse, status_code=202)
+async def ingest_readings(
+    source: str,
+    request: IngestRequest,
+    service: IngestService = Depends(get_ingest_service)
+):
+    """
+    원천 측정값 배치를 버퍼에 적재 (크기/시간 임계치 도달 시 다중 행 INSERT)
+
+    - **source**: solar_day, weather_info, smarteye_day
+    - **readings**: 측정값 리스트 (시간 컬럼 필수)
+
+    버퍼가 가득 차면 `503` 과 `Retry-After` 헤더를 반환합니다.
+
+    **예시**: `{"readings": [{"ymdhms": "2025-01-15 14:00:00", "forecast_quantity": 12.5}]}`
+    """
+    if source not in INGEST_COLUMNS:
+        raise HTTPException(status_code=404, detail=f"알 수 없는 소스입니다: {source} (허용: {list(INGEST_COLUMNS)})")
+
+    try:
+        result = await service.add(source, request.readings)
+        return IngestResponse(**result)
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except IngestBufferFull as e:
+        logger.warning(f"⚠️ [Ingest] 백프레셔 - {str(e)}")
+        raise HTTPException(
+            status_code=503,
+            detail=str(e),
+            headers={"Retry-After": str(max(1, math.ceil(settings.INGEST_FLUSH_INTERVAL_SECONDS)))}
+        )
+    except Exception as e:
+        logger.error(f"❌ [Ingest] API 오류: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"서버 오류: {str(e)}")
+
+@router.get("/stats")
+async def get_ingest_stats(
+    service: IngestService = Depends(get_ingest_service)
+):
+    """소스별 버퍼 상태 (수신/적재/거부 건수, 현재 버퍼 크기)"""
+    return service.get_stats()
@@ -0,0 +1,29 @@
+"""
+당일 실시간 집계 조회 API 엔드포인트
+"""
+from fastapi import APIRouter, Depends, HTTPException
+import logging
+
+from app.core.serialization import FastJSONResponse
+from app.services.live_aggregate_service import get_live_aggregate_service, LiveAggregateService
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/live", tags=["Live Aggregates"])
+
+@router.get("/today")
+async def get_today_aggregates(
+    service: LiveAggregateService = Depends(get_live_aggregate_service)
+):
+    """
+    오늘 날짜의 실시간 누적 집계 조회 (DB 조회 없이 메모리에서 응답)
+
+    **응답**:
+    - **targets**: 대상 테이블 기준 값 (solar_power: tmn/tmx/ics/SUM, ess_predict: pwr_ess 등)
+    - **sources**: 소스 컬럼별 count/sum/min/max
+    - **watermarks**: 소스별 마지막 반영 시각
+    """
+    if service.day is None:
+        raise HTTPException(status_code=503, detail="실시간 집계가 아직 초기화되지 않았습니다")
+
+    return FastJSONResponse(service.snapshot())
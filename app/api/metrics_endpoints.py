@@ -0,0 +1,99 @@
+"""
+운영 지표 조회 API 엔드포인트
+"""
+from fastapi import APIRouter, Depends, Query
+import logging
+
+from app.core.admission import admission_controller
+from app.core.database import get_db_manager, DatabaseManager
+from app.core.serialization import FastJSONResponse
+from app.core.slow_query import slow_query_log
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/metrics", tags=["Metrics"])
+
+@router.get("/write-scheduler")
+async def get_write_scheduler_metrics(
+    db: DatabaseManager = Depends(get_db_manager)
+):
+    """
+    대상 테이블별 쓰기 스케줄러 카운터 조회
+
+    - **writes**: 성공한 쓰기 수
+    - **retries**: 데드락/락 대기 타임아웃으로 인한 재시도 수
+    - **deadlocks** / **lock_wait_timeouts**: 오류 유형별 발생 수
+    - **failures**: 재시도 후에도 실패한 쓰기 수
+    - **waiting**: 현재 테이블 슬롯을 기다리는 쓰기 수
+    """
+    return {
+        "concurrency_per_table": db.write_scheduler.concurrency,
+        "max_attempts": db.write_scheduler.max_attempts,
+        "tables": db.write_scheduler.get_stats()
+    }
+
+@router.get("/db-pool")
+async def get_db_pool_metrics(
+    db: DatabaseManager = Depends(get_db_manager)
+):
+    """
+    현재 워커 프로세스의 연결 풀 상태 조회
+
+    - **pool_size**: 프로세스별 풀 크기 (DB_CONNECTION_BUDGET / WEB_CONCURRENCY - 락 전용 연결)
+    - **in_use** / **idle**: 사용 중 / 유휴 연결 수
+    - **created** / **reused** / **discarded**: 누적 생성 / 재사용 / 폐기 수
+    - **statement_timeouts**: max_statement_time 초과로 중단된 쿼리 수
+    - **killed_queries**: 요청 취소(클라이언트 연결 종료)로 KILL QUERY 한 수
+    - **lanes**: 우선순위 레인(interactive / scheduled / bulk)별 연결 상한, 사용/대기 수, 평균 대기 시간
+    """
+    return db.get_pool_stats()
+
+@router.get("/db-breaker")
+async def get_db_breaker_metrics(
+    db: DatabaseManager = Depends(get_db_manager)
+):
+    """
+    현재 워커 프로세스의 DB 회로 차단기 상태 조회
+
+    - **state**: closed(정상) / open(DB 접근 없이 즉시 실패) / half_open(시험 요청으로 복구 확인 중)
+    - **consecutive_failures**: 연속 연결/쿼리 실패 수 (failure_threshold 도달 시 open)
+    - **retry_after**: open 상태가 끝나기까지 남은 시간 (초)
+    - **rejected** / **failures** / **opened** / **closed** / **trials**: 누적 거절 / 실패 / 열림 / 닫힘 / 시험 요청 수
+    """
+    return db.breaker.get_state()
+
+@router.get("/admission")
+async def get_admission_metrics(
+    db: DatabaseManager = Depends(get_db_manager)
+):
+    """
+    엔드포인트 그룹(aggregate / verify)별 수용 제어 상태와 DB 전용 스레드 풀 대기열 조회
+
+    - **active** / **waiting**: 실행 중 / 슬롯 대기 중 요청 수
+    - **rejected_queue_full** / **rejected_timeout**: 대기열 초과 / 대기 시간 초과로 503 거절된 수
+    - **db_executor.queued**: DB 스레드를 기다리는 작업 수
+    """
+    return {
+        "lanes": admission_controller.get_stats(),
+        "db_executor": db.get_executor_stats()
+    }
+
+@router.get("/slow-queries")
+async def get_slow_queries(
+    limit: int = Query(50, ge=0, le=1000, description="반환할 최근 기록 수")
+):
+    """
+    SLOW_QUERY_THRESHOLD_SECONDS 를 넘긴 문장 조회 (현재 워커 프로세스)
+
+    - **entries**: 최근 느린 쿼리 (최신순) - 문장 이름, 서비스, 문장/파라미터 지문, 실행 시간, 행 수
+    - **fingerprints**: 문장 지문별 발생 수 / 누적·최대 실행 시간 / 첫 발생 시 수집한 EXPLAIN (누적 시간 순)
+    """
+    return FastJSONResponse(slow_query_log.get_stats(limit))
+
+@router.delete("/slow-queries")
+async def clear_slow_queries():
+    """
+    느린 쿼리 기록 초기화 (인덱스 추가 등 조치 후 EXPLAIN 을 다시 수집할 때 사용)
+    """
+    slow_query_log.clear()
+    return {"cleared": True}
@@ -0,0 +1,66 @@
+"""
+파티션 관리 API 엔드포인트
+(테이블 전체를 재작성하는 파티션 전환은 CLI `python -m app.cli partitions convert` 로만 실행)
+"""
+from fastapi import APIRouter, Depends, HTTPException, Query
+from datetime import datetime
+from typing import Optional
+import logging
+
+from app.core.serialization import FastJSONResponse
+from app.services.partition_service import get_partition_service, PartitionService
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/partitions", tags=["Partitions"])
+
+@router.get("")
+async def get_partition_status(
+    service: PartitionService = Depends(get_partition_service)
+):
+    """
+    소스 / tb_ai_* 테이블별 파티션 상태 조회 (파티션 목록, 경계값, 파티션 키를 포함하지 않는 고유 키)
+    """
+    try:
+        return FastJSONResponse(await service.status())
+    except Exception as e:
+        logger.error(f"❌ [Partition] 상태 조회 API 오류: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"서버 오류: {str(e)}")
+
+@router.post("/precreate")
+async def precreate_partitions(
+    months_ahead: Optional[int] = Query(None, ge=0, le=24, description="이번 달 이후 미리 만들 월 수"),
+    dry_run: bool = Query(False, description="ALTER 문만 반환"),
+    service: PartitionService = Depends(get_partition_service)
+):
+    """
+    파티션 테이블에 다가올 월 파티션을 미리 생성 (MAXVALUE 파티션 분할)
+    """
+    try:
+        return FastJSONResponse(await service.precreate(months_ahead=months_ahead, dry_run=dry_run))
+    except Exception as e:
+        logger.error(f"❌ [Partition] 사전 생성 API 오류: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"서버 오류: {str(e)}")
+
+@router.get("/explain")
+async def explain_partition_pruning(
+    start: str = Query(..., description="시작 날짜 (YYYY-MM-DD)"),
+    end: str = Query(..., description="종료 날짜 (YYYY-MM-DD, 포함)"),
+    service: PartitionService = Depends(get_partition_service)
+):
+    """
+    집계/피처 서비스 쿼리의 EXPLAIN PARTITIONS 결과 (테이블별 접근 파티션 목록)
+
+    **예시**: `/api/v1/partitions/explain?start=2025-01-15&end=2025-01-15`
+    """
+    try:
+        if datetime.strptime(start, '%Y-%m-%d') > datetime.strptime(end, '%Y-%m-%d'):
+            raise HTTPException(status_code=400, detail="start 는 end 보다 이후일 수 없습니다")
+    except ValueError:
+        raise HTTPException(status_code=400, detail="날짜 형식이 올바르지 않습니다 (YYYY-MM-DD)")
+
+    try:
+        return FastJSONResponse(await service.explain(start, end))
+    except Exception as e:
+        logger.error(f"❌ [Partition] EXPLAIN API 오류: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"서버 오류: {str(e)}")
@@ -0,0 +1,47 @@
+"""
+집계 실행 이력 API 엔드포인트
+서비스별 소요 시간 백분위수와 구간별 추세 조회 (점진적 성능 저하 확인용)
+"""
+from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Optional
+import logging
+
+from app.core.config import settings
+from app.core.serialization import FastJSONResponse
+from app.services.pipeline_service import PIPELINE_SERVICES
+from app.services.run_history_service import get_run_history_service, RunHistoryService
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/run-history", tags=["Run History"])
+
+@router.get("/stats")
+async def get_run_history_stats(
+    hours: int = Query(24 * 7, description="조회 기간 (현재 시각 기준 과거 시간 수)"),
+    bucket_hours: int = Query(24, description="추세 구간 크기 (시간)"),
+    service: Optional[str] = Query(None, description=f"서비스 이름 ({', '.join(PIPELINE_SERVICES)}, 생략 시 전체)"),
+    history: RunHistoryService = Depends(get_run_history_service)
+):
+    """
+    서비스별 집계 실행 소요 시간 백분위수와 추세 조회
+
+    - **summary**: 실행/실패 수, 성공률, 소요 시간(ms) p50/p90/p95/p99/max/avg (성공한 실행 기준), 영향받은 행 수, 오류 종류별 건수
+    - **trend.buckets**: 구간별 실행 수, p50/p95 소요 시간, 대상 1일당 소요 시간 p50
+    - **trend.ms_per_day_slope_per_day**: 하루 경과마다 늘어난 대상 1일당 소요 시간(ms), 양수면 점점 느려지는 중
+    - **trend.change_pct**: 첫 구간 대비 마지막 구간의 대상 1일당 소요 시간 변화율
+
+    **예시**: `/api/v1/run-history/stats?hours=720&bucket_hours=24&service=solar_power`
+    """
+    if not 1 <= hours <= settings.RUN_HISTORY_MAX_WINDOW_HOURS:
+        raise HTTPException(status_code=400,
+                            detail=f"hours 는 1 ~ {settings.RUN_HISTORY_MAX_WINDOW_HOURS} 사이여야 합니다")
+    if not 1 <= bucket_hours <= hours:
+        raise HTTPException(status_code=400, detail="bucket_hours 는 1 이상 hours 이하여야 합니다")
+    if service is not None and service not in PIPELINE_SERVICES:
+        raise HTTPException(status_code=400, detail=f"알 수 없는 서비스: {service} (가능: {PIPELINE_SERVICES})")
+
+    try:
+        return FastJSONResponse(await history.get_stats(hours, bucket_hours, service))
+    except Exception as e:
+        logger.error(f"❌ [RunHistory] 통계 조회 API 오류: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"서버 오류: {str(e)}")
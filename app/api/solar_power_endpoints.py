@@ -2,9 +2,10 @@
 Solar Power 관련 API 엔드포인트
 """
 from fastapi import APIRouter, Depends, HTTPException
-from typing import List
 import logging
 
+from app.core.admission import admission
+from app.core.serialization import FastJSONResponse
 from app.models.schemas import AggregationRequest, AggregationResponse
 from app.services.solar_power_service import get_solar_power_service, SolarPowerService
 
@@ -12,7 +13,7 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/solar-power", tags=["Solar Power"])
 
-@router.post("/aggregate", response_model=AggregationResponse)
+@router.post("/aggregate", response_model=AggregationResponse, dependencies=[Depends(admission("aggregate"))])
 async def aggregate_solar_power_data(
     request: AggregationRequest,
     service: SolarPowerService = Depends(get_solar_power_service)
@@ -43,7 +44,7 @@ async def aggregate_solar_power_data(
         logger.error(f"❌ [Solar Power] API 오류: {str(e)}")
         raise HTTPException(status_code=500, detail=f"서버 오류: {str(e)}")
 
-@router.get("/verify", response_model=List[dict])
+@router.get("/verify", response_model=dict, dependencies=[Depends(admission("verify"))])
 async def verify_solar_power_data(
     limit: int = 10,
     service: SolarPowerService = Depends(get_solar_power_service)
@@ -58,18 +59,8 @@ async def verify_solar_power_data(
 
         results = await service.verify_data(limit=limit)
 
-        # datetime 객체를 문자열로 변환
-        formatted_results = []
-        for row in results:
-            formatted_row = {}
-            for key, value in row.items():
-                if hasattr(value, 'strftime'):
-                    formatted_row[key] = value.strftime('%Y-%m-%d %H:%M:%S')
-                else:
-                    formatted_row[key] = value
-            formatted_results.append(formatted_row)
-
-        return formatted_results
+        # datetime 포맷은 SQL 에서 처리되므로 orjson 으로 바로 직렬화
+        return FastJSONResponse(results)
 
     except Exception as e:
         logger.error(f"❌ [Solar Power] API 오류: {str(e)}")
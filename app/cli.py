@@ -0,0 +1,275 @@
+"""
+운영 CLI
+
+사용법:
+    python -m app.cli aggregate --date 2025-01-15 [--service solar_power ...]
+    python -m app.cli aggregate --start 2025-01-01 --end 2025-01-31 [--service ...]
+    python -m app.cli partitions status
+    python -m app.cli partitions convert [--table ai_solar_power ...] [--months-ahead 3] [--apply]
+    python -m app.cli partitions precreate [--table ...] [--months-ahead 3] [--dry-run]
+    python -m app.cli partitions explain --start 2025-01-01 --end 2025-01-31
+    python -m app.cli snapshot export --start 2022-01-01 --end 2024-12-31 [--source solar_day ...] [--path ...]
+    python -m app.cli snapshot status [--path ...]
+    python -m app.cli recompute --start 2022-01-01 --end 2024-12-31 [--engine sqlite] [--target ...] [--dry-run]
+
+서비스 모듈은 실행할 하위 명령에서만 import 하여 시작 시간을 줄임
+
+aggregate 종료 코드: 0 성공, 1 집계 실패, 2 인자 오류,
+75 (EX_TEMPFAIL) 실패가 모두 다른 프로세스의 집계 중/DB 연결 불가/회로 차단으로 인한 것 (cron 에서 다음 주기에 재시도)
+"""
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import time
+from datetime import datetime
+
+# import 직후 시각 (aggregate 의 시작 비용 측정 기준)
+_STARTED = time.perf_counter()
+
+AGGREGATE_SERVICES = ["solar_power", "power_usage", "ess_predict", "ess_charge"]
+
+EXIT_FAILED = 1
+EXIT_TEMPFAIL = 75
+# 재시도하면 성공할 수 있는 실패
+TEMPORARY_ERROR_CLASSES = {"AggregationLockBusy", "CircuitOpenError"}
+
+
+def _print(result):
+    print(json.dumps(result, ensure_ascii=False, indent=2, default=str))
+
+
+async def _partitions(args) -> int:
+    from app.services.partition_service import get_partition_service_instance
+
+    service = get_partition_service_instance()
+    if args.action == "status":
+        _print(await service.status())
+        return 0
+    if args.action == "explain":
+        _print(await service.explain(args.start, args.end))
+        return 0
+
+    if args.action == "convert":
+        results = await service.convert(args.table, args.months_ahead, dry_run=not args.apply)
+    else:
+        results = await service.precreate(args.table, args.months_ahead, dry_run=args.dry_run)
+    _print(results)
+    return 1 if any(str(result.get("message", "")).startswith("처리 실패") for result in results) else 0
+
+
+async def _snapshot(args) -> int:
+    from app.services.scan_backends import SQLiteScanBackend
+
+    backend = SQLiteScanBackend(args.path)
+    if args.action == "status":
+        _print(await backend.status())
+        return 0
+
+    from app.core.database import db_manager
+
+    started = time.perf_counter()
+    exported = await backend.export(db_manager, args.start, args.end, args.source)
+    _print({"path": backend.path, "rows": exported, "elapsed_seconds": round(time.perf_counter() - started, 3)})
+    return 0
+
+
+async def _recompute(args) -> int:
+    from app.core.database import db_manager
+    from app.services.aggregation_planner import get_aggregation_planner
+    from app.services.ess_charge_service import get_ess_charge_service
+    from app.services.pipeline_service import PLANNED_TARGETS
+    from app.services.scan_backends import get_scan_backend
+
+    planner = await get_aggregation_planner()
+    backend = get_scan_backend(args.engine, db_manager=db_manager, path=args.path)
+    targets = args.target or PLANNED_TARGETS
+
+    started = time.perf_counter()
+    results = await planner.run(args.start, args.end, targets=targets, backend=backend, dry_run=args.dry_run)
+    # ESS Charge 는 적재된 tb_ai_* 를 MariaDB 안에서 복사하므로 적재한 경우에만 이어서 실행
+    if not args.dry_run and set(PLANNED_TARGETS) <= set(targets):
+        ess_charge_service = await get_ess_charge_service()
+        results["ess_charge"] = await ess_charge_service.aggregate_range(args.start, args.end)
+
+    _print({"engine": backend.name, "results": results,
+            "elapsed_seconds": round(time.perf_counter() - started, 3)})
+    return 0 if all(result["success"] for result in results.values()) else 1
+
+
+async def _resolve_runner(name: str, start: str, end: str):
+    """
+    서비스 이름에 해당하는 모듈만 import 하여 집계 실행 함수 반환 (import/초기화를 실행 시간과 분리)
+
+    Returns:
+        인자 없이 호출하면 결과 dict 를 돌려주는 코루틴 함수
+    """
+    if name == "all":
+        # 전체는 /aggregate/all 과 같은 파이프라인 (소스 테이블당 1회 스캔 후 ESS Charge)
+        from app.services.pipeline_service import get_aggregation_pipeline
+        pipeline = await get_aggregation_pipeline()
+        return lambda: pipeline.run(start, end)
+    if name == "ess_charge":
+        from app.services.ess_charge_service import get_ess_charge_service
+        service = await get_ess_charge_service()
+        return lambda: service.aggregate_range(start, end)
+    # 단일 날짜도 범위·전체와 같은 공유 스캔 플래너로 집계 (실행 경로에 따라 적재 행이 달라지지 않도록)
+    from app.services.aggregation_planner import get_aggregation_planner
+    planner = await get_aggregation_planner()
+
+    async def _run_planned():
+        return (await planner.run(start, end, targets=[name]))[name]
+    return _run_planned
+
+
+def _failure(error: Exception, start: str, end: str):
+    """서비스 밖으로 전파된 예외(락 연결 실패 등)를 서비스 결과 형식으로 변환"""
+    from app.core.circuit_breaker import is_breaker_failure
+
+    return {
+        "success": False,
+        "error_class": type(error).__name__,
+        # DB 연결 불가/연결 끊김은 재시도 대상
+        "temporary": is_breaker_failure(error),
+        "affected_rows": 0,
+        "target_date": start if start == end else f"{start} ~ {end}",
+        "message": str(error),
+    }
+
+
+def _exit_code(results) -> int:
+    failed = [result for result in results.values() if not result["success"]]
+    if not failed:
+        return 0
+    if all(result.get("temporary") or result.get("error_class") in TEMPORARY_ERROR_CLASSES for result in failed):
+        return EXIT_TEMPFAIL
+    return EXIT_FAILED
+
+
+async def _aggregate(args) -> int:
+    start, end = (args.date, args.date) if args.date else (args.start, args.end)
+    services = args.service or AGGREGATE_SERVICES
+    # 지정 순서와 관계없이 ESS Charge 는 다른 대상 적재 후 실행
+    if set(services) == set(AGGREGATE_SERVICES):
+        names = ["all"]
+    else:
+        names = sorted(set(services), key=AGGREGATE_SERVICES.index)
+    runners = {name: await _resolve_runner(name, start, end) for name in names}
+    ready = time.perf_counter()
+
+    results = {}
+    timings = {}
+    for name, runner in runners.items():
+        service_started = time.perf_counter()
+        try:
+            result = await runner()
+            results.update(result if name == "all" else {name: result})
+        except Exception as e:
+            failed = AGGREGATE_SERVICES if name == "all" else [name]
+            results.update({service: _failure(e, start, end) for service in failed})
+        timings[name] = round(time.perf_counter() - service_started, 3)
+
+    finished = time.perf_counter()
+    _print({
+        "start_date": start,
+        "end_date": end,
+        "results": results,
+        "timings": {
+            "startup_seconds": round(ready - _STARTED, 3),
+            "services": timings,
+            "total_seconds": round(finished - _STARTED, 3),
+        },
+    })
+    return _exit_code(results)
+
+
+def _valid_date(value: str) -> str:
+    try:
+        datetime.strptime(value, '%Y-%m-%d')
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"날짜 형식이 올바르지 않습니다 (YYYY-MM-DD): {value}")
+    return value
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="TB AI Data Aggregation 운영 CLI")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    aggregate = commands.add_parser("aggregate", help="웹 서버 없이 날짜/범위 집계 및 적재 (cron 용)")
+    aggregate.add_argument("--date", type=_valid_date, help="대상 날짜 (YYYY-MM-DD)")
+    aggregate.add_argument("--start", type=_valid_date, help="시작 날짜 (YYYY-MM-DD)")
+    aggregate.add_argument("--end", type=_valid_date, help="종료 날짜 (YYYY-MM-DD, 포함)")
+    aggregate.add_argument("--service", action="append", choices=AGGREGATE_SERVICES,
+                           help="집계할 서비스 (반복 지정 가능, 기본은 전체)")
+
+    partitions = commands.add_parser("partitions", help="월 단위 파티션 관리")
+    partitions.add_argument("action", choices=["status", "convert", "precreate", "explain"])
+    partitions.add_argument("--table", action="append", help="대상 테이블 키 (settings.table_names, 반복 지정 가능)")
+    partitions.add_argument("--months-ahead", type=int, default=None, help="이번 달 이후 미리 만들 월 수")
+    partitions.add_argument("--apply", action="store_true", help="convert: ALTER 문을 실제로 실행 (기본은 출력만)")
+    partitions.add_argument("--dry-run", action="store_true", help="precreate: ALTER 문만 출력")
+    partitions.add_argument("--start", help="explain: 시작 날짜 (YYYY-MM-DD)")
+    partitions.add_argument("--end", help="explain: 종료 날짜 (YYYY-MM-DD)")
+
+    snapshot = commands.add_parser("snapshot", help="소스 테이블 로컬 스냅샷(SQLite) 관리")
+    snapshot.add_argument("action", choices=["export", "status"])
+    snapshot.add_argument("--start", help="export: 시작 날짜 (YYYY-MM-DD)")
+    snapshot.add_argument("--end", help="export: 종료 날짜 (YYYY-MM-DD)")
+    snapshot.add_argument("--source", action="append", help="소스 이름 (반복 지정 가능, 기본은 전체)")
+    snapshot.add_argument("--path", help="스냅샷 파일 경로 (기본값: SNAPSHOT_PATH)")
+
+    recompute = commands.add_parser("recompute", help="스캔 백엔드를 지정하여 날짜 범위 재계산 후 MariaDB 에 적재")
+    recompute.add_argument("--start", required=True, help="시작 날짜 (YYYY-MM-DD)")
+    recompute.add_argument("--end", required=True, help="종료 날짜 (YYYY-MM-DD)")
+    recompute.add_argument("--engine", choices=["mariadb", "sqlite"], default=None,
+                           help="스캔 백엔드 (기본값: SCAN_BACKEND)")
+    recompute.add_argument("--path", help="sqlite 스냅샷 파일 경로 (기본값: SNAPSHOT_PATH)")
+    recompute.add_argument("--target", action="append", help="대상 이름 (반복 지정 가능, 기본은 플래너 대상 전체)")
+    recompute.add_argument("--dry-run", action="store_true", help="계산만 수행하고 적재하지 않음 (벤치마크/오프라인 확인용)")
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    if args.command == "aggregate":
+        if args.date and (args.start or args.end):
+            parser.error("--date 와 --start/--end 는 함께 지정할 수 없습니다")
+        if not args.date and not (args.start and args.end):
+            parser.error("--date 또는 --start 와 --end 가 필요합니다")
+        if not args.date and args.start > args.end:
+            parser.error("--start 는 --end 보다 이후일 수 없습니다")
+        return asyncio.run(_aggregate(args))
+
+    if args.command == "partitions":
+        if args.action == "explain" and not (args.start and args.end):
+            parser.error("explain 에는 --start 와 --end 가 필요합니다")
+        if args.table:
+            from app.services.partition_service import PARTITION_SPECS
+            unknown = [key for key in args.table if key not in PARTITION_SPECS]
+            if unknown:
+                parser.error(f"알 수 없는 테이블 키: {unknown} (가능: {list(PARTITION_SPECS)})")
+        return asyncio.run(_partitions(args))
+
+    if args.command == "snapshot":
+        if args.action == "export" and not (args.start and args.end):
+            parser.error("export 에는 --start 와 --end 가 필요합니다")
+        if args.source:
+            from app.services.aggregation_specs import SOURCE_SPECS
+            unknown = [name for name in args.source if name not in SOURCE_SPECS]
+            if unknown:
+                parser.error(f"알 수 없는 소스: {unknown} (가능: {list(SOURCE_SPECS)})")
+        return asyncio.run(_snapshot(args))
+
+    if args.command == "recompute":
+        if args.target:
+            from app.services.aggregation_specs import TARGET_SPECS
+            unknown = [name for name in args.target if name not in TARGET_SPECS]
+            if unknown:
+                parser.error(f"알 수 없는 대상: {unknown} (가능: {list(TARGET_SPECS)})")
+        return asyncio.run(_recompute(args))
+
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,126 @@
+"""
+적응형 동시 실행 수 제어 (AIMD + 지연 기울기)
+백필 청크를 몇 개씩 동시에 처리할지 고정값으로 정하지 않고,
+관측한 일당 처리 시간과 락 충돌(데드락/락 대기 타임아웃)로 설정 범위 안에서 자동 조정
+
+- 증가: 일당 처리 시간이 기준 지연의 허용 배수 이내이고 락 충돌이 없으면 완료 1건마다 1/limit 씩 (한 바퀴에 +1)
+- 감소: 락 충돌/실패가 있거나 일당 처리 시간이 허용 배수를 넘으면 limit * 감소 비율
+- 기준 지연은 관측값 중 최솟값을 따라가되 천천히 위로 이동 (데이터 증가로 정상 지연이 늘어나는 경우 반영)
+- 감소 직후에는 감소 이전에 시작한 작업의 결과로 다시 감소하지 않음 (같은 혼잡에 대한 중복 반응 방지)
+"""
+import logging
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# 기준 지연이 더 느린 관측값 쪽으로 이동하는 비율
+BASELINE_DRIFT = 0.05
+
+
+class AdaptiveConcurrency:
+    """완료 결과를 받아 동시 실행 상한(limit)을 조정하는 AIMD 제어기"""
+
+    def __init__(self, name: str = "backfill", max_limit: Optional[int] = None):
+        """
+        Args:
+            name: 로그/상태 표시용 이름
+            max_limit: 상한의 최댓값 (None 이면 BACKFILL_CONCURRENCY_MAX)
+        """
+        self.name = name
+        if max_limit is None:
+            max_limit = settings.BACKFILL_CONCURRENCY_MAX
+        self.min_limit = min(max(1, settings.BACKFILL_CONCURRENCY_MIN), max(1, max_limit))
+        self.max_limit = max(self.min_limit, max_limit)
+        self.latency_tolerance = max(1.0, settings.BACKFILL_LATENCY_TOLERANCE)
+        self.decrease_factor = min(0.95, max(0.1, settings.BACKFILL_DECREASE_FACTOR))
+
+        initial = settings.BACKFILL_CONCURRENCY_INITIAL
+        self._limit = float(min(self.max_limit, max(self.min_limit, initial)))
+        self.baseline_ms_per_day: Optional[float] = None
+        self.last_ms_per_day: Optional[float] = None
+        self.epoch = 0
+        self.stats = {"samples": 0, "increases": 0, "decreases": 0, "congestion_signals": 0}
+        self.history: Deque[Dict[str, Any]] = deque(maxlen=max(1, settings.BACKFILL_CONCURRENCY_HISTORY))
+        self._record("initial")
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    def _record(self, reason: str):
+        self.history.append({
+            "at": datetime.now().isoformat(timespec="seconds"),
+            "limit": self.limit,
+            "reason": reason,
+            "ms_per_day": self.last_ms_per_day,
+            "baseline_ms_per_day": self.baseline_ms_per_day,
+        })
+
+    def on_sample(self, started_epoch: int, days: int, seconds: float, congested: bool):
+        """
+        작업 하나의 완료 결과 반영
+
+        Args:
+            started_epoch: 작업 시작 시점의 epoch (begin() 반환값)
+            days: 처리한 일수
+            seconds: 처리 시간 (초)
+            congested: 락 충돌/실패 발생 여부
+        """
+        ms_per_day = seconds * 1000 / max(1, days)
+        self.last_ms_per_day = round(ms_per_day, 1)
+        self.stats["samples"] += 1
+
+        if self.baseline_ms_per_day is None or ms_per_day < self.baseline_ms_per_day:
+            self.baseline_ms_per_day = round(ms_per_day, 1)
+            slow = False
+        else:
+            slow = ms_per_day > self.baseline_ms_per_day * self.latency_tolerance
+            self.baseline_ms_per_day = round(
+                self.baseline_ms_per_day + (ms_per_day - self.baseline_ms_per_day) * BASELINE_DRIFT, 1
+            )
+
+        if congested:
+            self.stats["congestion_signals"] += 1
+
+        if congested or slow:
+            if started_epoch < self.epoch:
+                # 이미 감소한 뒤: 감소 이전 동시 실행 수에서 측정된 결과
+                return
+            previous = self.limit
+            self._limit = max(float(self.min_limit), self._limit * self.decrease_factor)
+            self.epoch += 1
+            self.stats["decreases"] += 1
+            reason = "lock_conflict" if congested else "latency"
+            self._record(reason)
+            logger.warning(f"⚠️ [Adaptive] {self.name} 동시 실행 {previous} → {self.limit} "
+                           f"({reason}, 일당 {self.last_ms_per_day}ms / 기준 {self.baseline_ms_per_day}ms)")
+            return
+
+        previous = self.limit
+        self._limit = min(float(self.max_limit), self._limit + 1 / max(1.0, self._limit))
+        if self.limit != previous:
+            self.stats["increases"] += 1
+            self._record("increase")
+            logger.info(f"📊 [Adaptive] {self.name} 동시 실행 {previous} → {self.limit} "
+                        f"(일당 {self.last_ms_per_day}ms / 기준 {self.baseline_ms_per_day}ms)")
+
+    def begin(self) -> int:
+        """작업 시작 시 현재 epoch 반환 (on_sample 에 그대로 전달)"""
+        return self.epoch
+
+    def get_state(self) -> Dict[str, Any]:
+        """현재 상한, 범위, 지연 기준과 변경 이력 조회"""
+        return {
+            "limit": self.limit,
+            "min": self.min_limit,
+            "max": self.max_limit,
+            "baseline_ms_per_day": self.baseline_ms_per_day,
+            "last_ms_per_day": self.last_ms_per_day,
+            "latency_tolerance": self.latency_tolerance,
+            **self.stats,
+            "history": list(self.history),
+        }
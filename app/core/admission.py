@@ -0,0 +1,153 @@
+"""
+요청 수용 제어 (admission control)
+엔드포인트 그룹(aggregate / verify)별로 동시 실행 수와 대기열 길이를 제한하고,
+대기열이 가득 차거나 DB 회로 차단기가 열려 있으면 DB 로 보내지 않고 즉시 503 + Retry-After 로 거절
+"""
+import asyncio
+import logging
+import math
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Dict
+
+from fastapi import HTTPException
+
+from app.core.circuit_breaker import CircuitOpenError
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class AdmissionRejected(Exception):
+    """수용 거절 (대기열 초과 또는 대기 시간 초과)"""
+
+    def __init__(self, lane: str, reason: str, retry_after: int):
+        super().__init__(f"{lane} 요청 거절: {reason}")
+        self.lane = lane
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionLane:
+    """엔드포인트 그룹 하나의 동시 실행 슬롯과 대기열"""
+
+    def __init__(self, name: str, concurrency: int, queue_depth: int, queue_timeout: float):
+        self.name = name
+        self.concurrency = max(1, concurrency)
+        self.queue_depth = max(0, queue_depth)
+        self.queue_timeout = queue_timeout
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self.active = 0
+        self.waiting = 0
+        # 처리 시간 지수 이동 평균 (Retry-After 추정용)
+        self.avg_seconds = 0.0
+        self.stats = {"admitted": 0, "rejected_queue_full": 0, "rejected_timeout": 0, "completed": 0}
+
+    def retry_after(self) -> int:
+        """대기열이 비워질 때까지의 예상 시간 (초)"""
+        if not self.avg_seconds:
+            return settings.ADMISSION_RETRY_AFTER_SECONDS
+        backlog = (self.active + self.waiting) / self.concurrency
+        return min(60, max(1, math.ceil(self.avg_seconds * backlog)))
+
+    @asynccontextmanager
+    async def admit(self):
+        """
+        슬롯 획득 후 실행 (대기열이 가득 차면 즉시 AdmissionRejected)
+
+        Raises:
+            AdmissionRejected: 대기열 초과 또는 대기 시간 초과
+        """
+        # 실행 중 + 대기 중 수로 판단 (waiting 은 await 전에 동기적으로 증가하므로 동시 요청에도 정확)
+        if self.active + self.waiting >= self.concurrency + self.queue_depth:
+            self.stats["rejected_queue_full"] += 1
+            raise AdmissionRejected(self.name, "대기열이 가득 찼습니다", self.retry_after())
+
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=self.queue_timeout or None)
+        except asyncio.TimeoutError:
+            self.stats["rejected_timeout"] += 1
+            raise AdmissionRejected(self.name, "대기 시간이 초과되었습니다", self.retry_after())
+        finally:
+            self.waiting -= 1
+
+        self.active += 1
+        self.stats["admitted"] += 1
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            elapsed = time.monotonic() - started
+            self.avg_seconds = elapsed if not self.avg_seconds else 0.8 * self.avg_seconds + 0.2 * elapsed
+            self.active -= 1
+            self.stats["completed"] += 1
+            self._semaphore.release()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "active": self.active,
+            "waiting": self.waiting,
+            "concurrency": self.concurrency,
+            "queue_depth": self.queue_depth,
+            "avg_seconds": round(self.avg_seconds, 4),
+        }
+
+
+class AdmissionController:
+    """엔드포인트 그룹별 수용 제어"""
+
+    def __init__(self):
+        timeout = settings.ADMISSION_QUEUE_TIMEOUT_SECONDS
+        self.lanes: Dict[str, AdmissionLane] = {
+            "aggregate": AdmissionLane("aggregate", settings.ADMISSION_AGGREGATE_CONCURRENCY,
+                                       settings.ADMISSION_AGGREGATE_QUEUE_DEPTH, timeout),
+            "verify": AdmissionLane("verify", settings.ADMISSION_VERIFY_CONCURRENCY,
+                                    settings.ADMISSION_VERIFY_QUEUE_DEPTH, timeout),
+        }
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """그룹별 실행/대기/거절 수 조회"""
+        return {name: lane.get_stats() for name, lane in self.lanes.items()}
+
+# 전역 수용 제어 인스턴스
+admission_controller = AdmissionController()
+
+def admission(lane: str):
+    """
+    엔드포인트 수용 제어 의존성 생성
+
+    사용 예:
+        @router.post("/all", dependencies=[Depends(admission("aggregate"))])
+
+    Args:
+        lane: 엔드포인트 그룹 (aggregate / verify)
+    """
+    target = admission_controller.lanes[lane]
+
+    async def _admit():
+        from app.core.database import db_manager
+
+        # DB 회로가 열려 있으면 슬롯을 차지하지 않고 바로 거절
+        try:
+            db_manager.breaker.check()
+        except CircuitOpenError as e:
+            raise HTTPException(
+                status_code=503,
+                detail=f"{e}. 잠시 후 다시 시도하세요",
+                headers={"Retry-After": str(e.retry_after)}
+            )
+
+        try:
+            async with target.admit():
+                yield
+        except AdmissionRejected as e:
+            logger.warning(f"⚠️ [Admission] {e} (active={target.active}, waiting={target.waiting})")
+            raise HTTPException(
+                status_code=503,
+                detail=f"요청이 많아 처리할 수 없습니다 ({e.reason}). 잠시 후 다시 시도하세요",
+                headers={"Retry-After": str(e.retry_after)}
+            )
+
+    return _admit
@@ -0,0 +1,88 @@
+"""
+날짜 범위 키 기반 인메모리 캐시
+재집계로 해당 날짜(범위)가 갱신되면 그 날짜와 겹치는 항목만 무효화
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+
+class DateRangeCache:
+    """(start, end) 날짜 범위를 키로 하는 LRU + TTL 캐시"""
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: float = 0):
+        """
+        Args:
+            max_entries: 최대 보관 항목 수 (초과 시 가장 오래 사용하지 않은 항목 제거)
+            ttl_seconds: 항목 유효 시간 (0이면 무기한, 무효화로만 제거)
+        """
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, start: str, end: str) -> Optional[Any]:
+        """캐시 조회 (없거나 만료되었으면 None)"""
+        key = (start, end)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            stored_at, value = entry
+            if self.ttl_seconds and time.monotonic() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, start: str, end: str, value: Any):
+        """캐시 저장"""
+        with self._lock:
+            self._entries[(start, end)] = (time.monotonic(), value)
+            self._entries.move_to_end((start, end))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, target_date: Optional[str] = None, end_date: Optional[str] = None) -> int:
+        """
+        target_date ~ end_date 와 겹치는 범위의 항목 제거
+
+        Args:
+            target_date: 갱신된 날짜 (YYYY-MM-DD, 범위면 시작 날짜). None 이면 전체 제거
+            end_date: 갱신된 범위의 종료 날짜 (None 이면 target_date 하루)
+
+        Returns:
+            int: 제거된 항목 수
+        """
+        end_date = end_date or target_date
+        with self._lock:
+            if target_date is None:
+                removed = len(self._entries)
+                self._entries.clear()
+            else:
+                keys = [key for key in self._entries if key[0] <= end_date and target_date <= key[1]]
+                for key in keys:
+                    del self._entries[key]
+                removed = len(keys)
+
+            self.invalidations += removed
+            return removed
+
+    def get_stats(self) -> Dict[str, int]:
+        """캐시 통계 조회"""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+            }
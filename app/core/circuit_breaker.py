@@ -0,0 +1,214 @@
+"""
+데이터베이스 회로 차단기 (circuit breaker)
+연결 실패(연결 불가, 연결 끊김, 연결 수 초과)가 연속으로 발생하면 회로를 열어
+DB 에 접속을 시도하지 않고 즉시 실패시키고, 일정 시간 후 제한된 수의 시험 요청(half-open)으로 복구 여부를 확인
+
+- closed: 정상 (연속 실패 수만 집계)
+- open: 즉시 CircuitOpenError (DB_BREAKER_OPEN_SECONDS 경과 후 half_open 으로 전환)
+- half_open: 동시에 DB_BREAKER_HALF_OPEN_MAX_CALLS 개까지만 통과, 연속 성공 시 closed / 실패 시 다시 open
+"""
+import asyncio
+import logging
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
+
+import pymysql
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# 회로 차단 대상 MariaDB / pymysql 오류 코드
+# (연결 수 초과, 연결 불가, 서버 연결 끊김 - 데드락/문법/무결성 오류는 제외)
+# 문장 실행 시간 초과(1969)는 DB 가 응답한 것이므로 제외 (무거운 조회 몇 건으로 정상 요청까지 막지 않도록)
+BREAKER_ERROR_CODES = (
+    1040,  # ER_CON_COUNT_ERROR (Too many connections)
+    1203,  # ER_TOO_MANY_USER_CONNECTIONS
+    2002,  # CR_CONNECTION_ERROR
+    2003,  # CR_CONN_HOST_ERROR (Can't connect)
+    2006,  # CR_SERVER_GONE_ERROR
+    2013,  # CR_SERVER_LOST
+)
+
+
+class CircuitOpenError(Exception):
+    """회로가 열려 있어 DB 접근 없이 거절됨"""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"데이터베이스 회로 차단 중 (약 {retry_after}초 후 재시도)")
+        self.retry_after = retry_after
+
+
+def is_breaker_failure(error: Optional[BaseException]) -> bool:
+    """회로 차단 대상 실패인지 판단 (DB 가 응답한 일반 오류는 DB 정상으로 간주, 감싼 원인 예외까지 확인)"""
+    while error is not None:
+        if isinstance(error, pymysql.err.InterfaceError):
+            return True
+        if isinstance(error, pymysql.err.MySQLError):
+            return bool(error.args) and error.args[0] in BREAKER_ERROR_CODES
+        # 연결 시도 중 소켓 오류/타임아웃
+        if isinstance(error, OSError):
+            return True
+        error = error.__cause__
+    return False
+
+
+class CircuitBreaker:
+    """연속 실패 기반 회로 차단기 (이벤트 루프와 DB 스레드에서 함께 사용하므로 스레드 락으로 보호)"""
+
+    def __init__(self, name: str = "database"):
+        self.name = name
+        self.failure_threshold = max(1, settings.DB_BREAKER_FAILURE_THRESHOLD)
+        self.open_seconds = settings.DB_BREAKER_OPEN_SECONDS
+        self.half_open_max_calls = max(1, settings.DB_BREAKER_HALF_OPEN_MAX_CALLS)
+        self.success_threshold = max(1, settings.DB_BREAKER_SUCCESS_THRESHOLD)
+
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.half_open_successes = 0
+        self.trials_in_flight = 0
+        self.opened_at: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.stats = {"rejected": 0, "failures": 0, "opened": 0, "closed": 0, "trials": 0}
+        self._lock = threading.Lock()
+
+    def _retry_after(self, now: float) -> int:
+        remaining = self.open_seconds - (now - (self.opened_at or now))
+        return max(1, math.ceil(remaining))
+
+    def _open(self, now: float):
+        self.state = OPEN
+        self.opened_at = now
+        self.half_open_successes = 0
+        self.stats["opened"] += 1
+        logger.error(f"🧯 [Breaker] {self.name} 회로 열림 - 연속 실패 {self.consecutive_failures}회, "
+                     f"{self.open_seconds}초 동안 즉시 실패 (마지막 오류: {self.last_error})")
+
+    def _admit(self) -> bool:
+        """
+        호출 허용 여부 판단
+
+        Returns:
+            bool: half-open 시험 요청이면 True
+
+        Raises:
+            CircuitOpenError: 회로가 열려 있거나 시험 요청 수가 가득 참
+        """
+        if not settings.DB_BREAKER_ENABLED:
+            return False
+
+        with self._lock:
+            now = time.monotonic()
+            if self.state == OPEN:
+                if now - self.opened_at < self.open_seconds:
+                    self.stats["rejected"] += 1
+                    raise CircuitOpenError(self._retry_after(now))
+                self.state = HALF_OPEN
+                self.half_open_successes = 0
+                logger.warning(f"⚠️ [Breaker] {self.name} 회로 half-open - 시험 요청으로 복구 확인")
+
+            if self.state == HALF_OPEN:
+                if self.trials_in_flight >= self.half_open_max_calls:
+                    self.stats["rejected"] += 1
+                    raise CircuitOpenError(1)
+                self.trials_in_flight += 1
+                self.stats["trials"] += 1
+                return True
+
+            return False
+
+    def check(self):
+        """
+        열린 회로면 즉시 거절 (시험 슬롯을 소비하지 않는 사전 확인, 요청 수용 단계에서 사용)
+
+        Raises:
+            CircuitOpenError: 회로가 열려 있고 열림 시간이 아직 지나지 않음
+        """
+        if not settings.DB_BREAKER_ENABLED:
+            return
+        with self._lock:
+            now = time.monotonic()
+            if self.state == OPEN and now - self.opened_at < self.open_seconds:
+                self.stats["rejected"] += 1
+                raise CircuitOpenError(self._retry_after(now))
+
+    def _on_success(self, trial: bool):
+        with self._lock:
+            self.consecutive_failures = 0
+            if not trial:
+                return
+            self.trials_in_flight -= 1
+            if self.state != HALF_OPEN:
+                return
+            self.half_open_successes += 1
+            if self.half_open_successes >= self.success_threshold:
+                self.state = CLOSED
+                self.opened_at = None
+                self.stats["closed"] += 1
+                logger.info(f"✅ [Breaker] {self.name} 회로 닫힘 - 시험 요청 {self.half_open_successes}회 성공")
+
+    def _on_failure(self, trial: bool, error: BaseException):
+        with self._lock:
+            now = time.monotonic()
+            self.consecutive_failures += 1
+            self.stats["failures"] += 1
+            self.last_error = f"{type(error).__name__}: {error}"
+            if trial:
+                self.trials_in_flight -= 1
+            if self.state == HALF_OPEN or (self.state == CLOSED
+                                           and self.consecutive_failures >= self.failure_threshold):
+                self._open(now)
+
+    def _on_neutral(self, trial: bool):
+        # 취소 등 DB 상태를 알 수 없는 종료는 시험 슬롯만 반환
+        if trial:
+            with self._lock:
+                self.trials_in_flight -= 1
+
+    @contextmanager
+    def guard(self):
+        """
+        DB 접근 구간 감시 (진입 시 허용 여부 확인, 종료 시 성공/실패 기록)
+
+        Raises:
+            CircuitOpenError: 회로가 열려 있음 (DB 접근 없이 즉시)
+        """
+        trial = self._admit()
+        try:
+            yield
+        except (asyncio.CancelledError, GeneratorExit):
+            self._on_neutral(trial)
+            raise
+        except BaseException as e:
+            if is_breaker_failure(e):
+                self._on_failure(trial, e)
+            else:
+                self._on_success(trial)
+            raise
+        else:
+            self._on_success(trial)
+
+    def get_state(self) -> Dict[str, Any]:
+        """회로 상태 조회"""
+        with self._lock:
+            now = time.monotonic()
+            # 열림 시간이 지났으면 다음 요청에서 half-open 으로 전환됨
+            retry_after = self._retry_after(now) if self.state == OPEN else 0
+            return {
+                "enabled": settings.DB_BREAKER_ENABLED,
+                "state": self.state,
+                "consecutive_failures": self.consecutive_failures,
+                "failure_threshold": self.failure_threshold,
+                "open_seconds": self.open_seconds,
+                "retry_after": retry_after,
+                "trials_in_flight": self.trials_in_flight,
+                "last_error": self.last_error,
+                **self.stats,
+            }
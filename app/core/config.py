@@ -10,6 +10,9 @@ class Settings(BaseSettings):
     API_VERSION: str = "1.0.0"
     API_DESCRIPTION: str = "TB AI 테이블 데이터 집계 및 적재 API"
 
+    # 응답 압축 설정 (이 크기(bytes) 이상의 응답만 gzip 압축)
+    GZIP_MINIMUM_SIZE: int = 1024
+
     # 데이터베이스 설정
     # database_config: Dict[str, Any] = {
     #     'host': '192.168.213.250',
@@ -40,8 +43,182 @@ class Settings(BaseSettings):
         # AI 테이블
         'ai_solar_power': 'tb_ai_solar_power',
         'ai_ess_charge_amt': 'tb_ai_ess_charge_amt',
-        'ai_pwr_usage': 'tb_ai_pwr_usage'
+        'ai_pwr_usage': 'tb_ai_pwr_usage',
+
+        # 운영 테이블 - 분산 백필 청크 클레임
+        'backfill_chunk': 'tb_ai_backfill_chunk',
+        # 운영 테이블 - 집계 실행 이력
+        'run_history': 'tb_ai_run_history'
+    }
+
+    # 연결 풀 설정
+    # 전체 연결 예산(DB_CONNECTION_BUDGET)을 워커 프로세스 수(WEB_CONCURRENCY)로 나눈 값에서
+    # 락 전용 연결(DB_LOCK_LANE_CONNECTIONS 합계)을 뺀 크기로 프로세스별 풀을 구성 (DB_POOL_SIZE > 0 이면 고정)
+    WEB_CONCURRENCY: int = 1
+    DB_CONNECTION_BUDGET: int = 40
+    DB_POOL_SIZE: int = 0
+    # 집계 락 전용 연결의 레인별 상한 (GET_LOCK 은 연결 종료로 해제하므로 집계하는 동안 연결을 유지)
+    # 레인마다 따로 세므로 백필이 락 연결을 모두 써도 API 집계는 기다리지 않음
+    # bulk 가 0 이면 백필 워커 노드(BACKFILL_WORKER_ENABLED)에서는 백필 동시 실행 상한(BACKFILL_CONCURRENCY_MAX),
+    # 그 외에는 1 (락 연결 수만큼 풀이 줄어들므로 백필을 돌리지 않는 노드는 작게 유지)
+    DB_LOCK_LANE_CONNECTIONS: Dict[str, int] = {
+        'interactive': 2,
+        'scheduled': 1,
+        'bulk': 0,
     }
+    DB_POOL_RECYCLE_SECONDS: float = 300
+    # 레인별 DB 전용 스레드 풀 크기 (0이면 레인 연결 상한 + 레인 락 전용 연결 수)
+    DB_EXECUTOR_WORKERS: int = 0
+
+    # DB 작업 우선순위 레인 설정 (레인별 최대 연결 비율 / interactive 전용 예약 연결 수)
+    # interactive: API 요청, scheduled: 주기 작업, bulk: 백필/CLI 재계산 - 빈 연결은 항상 interactive 부터 배정
+    DB_LANE_SHARES: Dict[str, float] = {
+        'interactive': 1.0,
+        'scheduled': 0.5,
+        'bulk': 0.5,
+    }
+    DB_LANE_INTERACTIVE_RESERVED: int = 2
+
+    # 연결 시도 시간 상한 (초)
+    DB_CONNECT_TIMEOUT_SECONDS: float = 10
+
+    # DB 회로 차단기 설정 (연결/쿼리 연속 실패 횟수 / 열림 유지 시간 / half-open 동시 시험 요청 수 / 닫힘에 필요한 연속 성공 수)
+    # 회로가 열려 있는 동안은 DB 에 접속하지 않고 즉시 실패하며, 수용 제어 엔드포인트는 503 + Retry-After 로 거절
+    DB_BREAKER_ENABLED: bool = True
+    DB_BREAKER_FAILURE_THRESHOLD: int = 5
+    DB_BREAKER_OPEN_SECONDS: float = 30
+    DB_BREAKER_HALF_OPEN_MAX_CALLS: int = 1
+    DB_BREAKER_SUCCESS_THRESHOLD: int = 2
+
+    # 문장 실행 시간 상한 설정 (서비스별 MariaDB max_statement_time, 초, 0이면 제한 없음)
+    # 목록에 없는 서비스는 DB_STATEMENT_TIMEOUT_SECONDS 적용
+    DB_STATEMENT_TIMEOUT_SECONDS: float = 60
+    STATEMENT_TIMEOUTS: Dict[str, float] = {
+        'planner': 600,
+        'solar_power': 120,
+        'power_usage': 120,
+        'ess_predict': 120,
+        'ess_charge': 300,
+        'verify': 10,
+        'feature': 30,
+        'live': 30,
+        'ingest': 60,
+        'backfill': 10,
+        'partition': 0,
+        'coverage': 300,
+        'snapshot': 0,
+        'run_history': 30,
+    }
+
+    # 느린 쿼리 기록 설정 (임계값 초과 문장을 최근 N건 메모리에 보관, 지문별 첫 발생 시 EXPLAIN 수집, 0이면 비활성)
+    SLOW_QUERY_THRESHOLD_SECONDS: float = 1.0
+    SLOW_QUERY_BUFFER_SIZE: int = 200
+    SLOW_QUERY_EXPLAIN: bool = True
+    SLOW_QUERY_MAX_FINGERPRINTS: int = 500
+
+    # 클라이언트 연결 종료 시 처리 중인 요청 취소 (실행 중인 쿼리는 KILL QUERY)
+    CANCEL_ON_DISCONNECT: bool = True
+
+    # 요청 단위 CPU 프로파일링 설정 (활성 시 PROFILING_HEADER 헤더가 있는 요청만 프로파일링)
+    # 헤더 값: 1 / true (PROFILING_MODE 사용), sampling (collapsed stack), cprofile (pstats)
+    PROFILING_ENABLED: bool = False
+    PROFILING_HEADER: str = "X-Profile"
+    PROFILING_MODE: str = "sampling"
+    PROFILING_DIR: str = "profiles"
+    PROFILING_SAMPLE_INTERVAL_SECONDS: float = 0.001
+
+    # 요청 수용 제어 설정 (엔드포인트 그룹별 동시 실행 수 / 대기열 길이 / 대기 시간 상한)
+    # 대기열이 가득 차거나 대기 시간이 상한을 넘으면 503 + Retry-After 로 즉시 거절
+    ADMISSION_AGGREGATE_CONCURRENCY: int = 4
+    ADMISSION_AGGREGATE_QUEUE_DEPTH: int = 16
+    ADMISSION_VERIFY_CONCURRENCY: int = 16
+    ADMISSION_VERIFY_QUEUE_DEPTH: int = 64
+    ADMISSION_QUEUE_TIMEOUT_SECONDS: float = 30
+    ADMISSION_RETRY_AFTER_SECONDS: int = 5
+
+    # 프로세스 간 집계 락 설정 ((서비스, 날짜) 단위 GET_LOCK, 대기 시간 0이면 즉시 건너뜀)
+    AGGREGATION_LOCK_ENABLED: bool = True
+    AGGREGATION_LOCK_PREFIX: str = "tb_ai"
+    AGGREGATION_LOCK_WAIT_SECONDS: int = 0
+
+    # 쓰기 스케줄러 설정 (대상 테이블별 동시 쓰기 수, 데드락/락 대기 재시도)
+    WRITE_CONCURRENCY_PER_TABLE: int = 1
+    WRITE_RETRY_MAX_ATTEMPTS: int = 5
+    WRITE_RETRY_BASE_DELAY: float = 0.05
+    WRITE_RETRY_MAX_DELAY: float = 2.0
+
+    # 공유 스캔 플래너 설정 (다중 행 UPSERT 배치 크기)
+    PLAN_WRITE_BATCH_SIZE: int = 500
+
+    # 집계 스캔 백엔드 설정 (mariadb: 운영 DB 소스 테이블 스캔, sqlite: 로컬 스냅샷 파일 스캔, 적재는 항상 MariaDB)
+    SCAN_BACKEND: str = "mariadb"
+    SNAPSHOT_PATH: str = "snapshots/source.sqlite3"
+    SNAPSHOT_BATCH_ROWS: int = 10000
+
+    # 원천 데이터 적재 버퍼 설정 (플러시 행 수 / 플러시 주기 / 최대 버퍼 크기 / DB 가 거부한 측정값 보관 건수)
+    INGEST_FLUSH_ROWS: int = 1000
+    INGEST_FLUSH_INTERVAL_SECONDS: float = 2.0
+    INGEST_BUFFER_MAX_ROWS: int = 20000
+    INGEST_REJECTED_KEEP_ROWS: int = 100
+
+    # 당일 실시간 집계 설정 (신규 행 반영 주기 / tb_ai_* 적재 주기 / 전체 재초기화 주기 /
+    # 날짜 변경 후 전날 원천 재집계까지의 유예 시간, 0이면 비활성)
+    LIVE_AGGREGATES_ENABLED: bool = True
+    LIVE_POLL_INTERVAL_SECONDS: float = 30
+    LIVE_FLUSH_INTERVAL_SECONDS: float = 300
+    LIVE_RESEED_INTERVAL_SECONDS: float = 3600
+    LIVE_ROLLOVER_GRACE_SECONDS: float = 600
+
+    # 분산 백필 설정 (청크 일수 / 리스 만료 / 하트비트 주기 / 최대 시도 횟수 / 대기 청크 조회 주기)
+    # BACKFILL_WORKER_ENABLED 인 노드는 시작 시 백필 워커를 띄워 대기 청크를 리스하여 처리
+    BACKFILL_WORKER_ENABLED: bool = False
+    BACKFILL_CHUNK_DAYS: int = 7
+    BACKFILL_LEASE_SECONDS: int = 120
+    BACKFILL_HEARTBEAT_SECONDS: float = 30
+    BACKFILL_MAX_ATTEMPTS: int = 5
+    BACKFILL_POLL_INTERVAL_SECONDS: float = 10
+
+    # 백필 적응형 동시 실행 설정 (동시 처리 청크 수 하한/상한/초기값, 기준 대비 허용 일당 지연 배수,
+    # 락 충돌/지연 초과 시 감소 비율, 보관할 변경 이력 수)
+    BACKFILL_CONCURRENCY_MIN: int = 1
+    BACKFILL_CONCURRENCY_MAX: int = 8
+    BACKFILL_CONCURRENCY_INITIAL: int = 2
+    BACKFILL_LATENCY_TOLERANCE: float = 2.0
+    BACKFILL_DECREASE_FACTOR: float = 0.5
+    BACKFILL_CONCURRENCY_HISTORY: int = 200
+
+    # 파티션 관리 설정 (이번 달 이후 미리 만들 월 파티션 수 / 사전 생성 주기)
+    PARTITION_MAINTENANCE_ENABLED: bool = False
+    PARTITION_MONTHS_AHEAD: int = 3
+    PARTITION_MAINTENANCE_INTERVAL_SECONDS: float = 86400
+
+    # 적재 현황(coverage) 조회 설정 (한 번에 조회할 수 있는 최대 일수)
+    COVERAGE_MAX_DAYS: int = 3660
+
+    # ESS 예측 what-if 평가 설정 (한 번에 평가할 수 있는 최대 일수 / 최대 시나리오 수(용량 x 배율))
+    WHATIF_MAX_DAYS: int = 3660
+    WHATIF_MAX_SCENARIOS: int = 200
+
+    # 로컬 피처 스냅샷 설정 (컬럼별 메모리 매핑 파일, 재집계 범위 자동 갱신, DB 조회 청크 일수)
+    FEATURE_STORE_ENABLED: bool = False
+    FEATURE_STORE_DIR: str = "feature_store"
+    FEATURE_STORE_SYNC_CHUNK_DAYS: int = 366
+
+    # 집계 실행 이력 설정 (실행별 소요 시간/영향 행 수를 메모리에 모았다가 행 수/주기 임계치에서 다중 행 INSERT)
+    # 버퍼가 가득 차면 가장 오래된 이력부터 버림, 통계 조회 기간 상한(시간)
+    RUN_HISTORY_ENABLED: bool = True
+    RUN_HISTORY_FLUSH_ROWS: int = 200
+    RUN_HISTORY_FLUSH_INTERVAL_SECONDS: float = 10.0
+    RUN_HISTORY_BUFFER_MAX_ROWS: int = 10000
+    RUN_HISTORY_MAX_WINDOW_HOURS: int = 24 * 90
+
+    # 피처 조회 캐시 설정 (재집계 시 무효화, TTL 은 외부 적재 대비 안전장치)
+    FEATURE_CACHE_MAX_ENTRIES: int = 256
+    FEATURE_CACHE_TTL_SECONDS: float = 3600
+
+    # 장기 범위 조회 다운샘플링 설정 (max_points 상한, 서버 측 커서로 한 번에 가져올 행 수)
+    DOWNSAMPLE_MAX_POINTS: int = 5000
+    DOWNSAMPLE_FETCH_ROWS: int = 1000
 
     class Config:
         env_file = ".env"
@@ -1,38 +1,378 @@
 import pymysql
 import asyncio
+import concurrent.futures
 import logging
-from typing import Dict, Any, List
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Callable, Optional, Tuple, TypeVar
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from pymysql.constants import SERVER_STATUS
+from app.core.circuit_breaker import CircuitBreaker
 from app.core.config import settings
+from app.core.priority_lanes import BULK, LANES, LaneScheduler, current_lane
+from app.core.slow_query import TimedCursor
+from app.core.write_scheduler import WriteScheduler
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# MariaDB max_statement_time 초과 오류 코드
+ER_STATEMENT_TIMEOUT = 1969
+
+# 현재 대여 중인 연결로 DB 스레드에 넘긴 작업 목록 (취소 후 연결을 닫기 전에 끝나기를 기다리기 위해 사용)
+_connection_calls: ContextVar[Optional[List[concurrent.futures.Future]]] = ContextVar("db_connection_calls", default=None)
+
+def _date_range(start_date: str, end_date: str) -> List[str]:
+    """start_date ~ end_date (포함) 날짜 목록 (YYYY-MM-DD)"""
+    current = datetime.strptime(start_date, '%Y-%m-%d')
+    end = datetime.strptime(end_date, '%Y-%m-%d')
+    dates = []
+    while current <= end:
+        dates.append(current.strftime('%Y-%m-%d'))
+        current += timedelta(days=1)
+    return dates
+
 class DatabaseManager:
     """데이터베이스 연결 및 쿼리 관리 클래스"""
 
     def __init__(self):
         self.db_config = settings.database_config
+        self.write_scheduler = WriteScheduler(self)
+        self._write_listeners: List[Callable[[str, Optional[str], Optional[str]], None]] = []
+        # 연결/쿼리 연속 실패 시 DB 접근 없이 즉시 실패시키는 회로 차단기
+        self.breaker = CircuitBreaker()
+
+        # 집계 락 전용 연결은 레인별로 따로 배정 (예약분 없이 레인 상한 합계 = 전체이므로 레인끼리 기다리지 않음)
+        self.lock_budgets = self._resolve_lock_budgets()
+        self.lock_connections = sum(self.lock_budgets.values())
+        self.lock_lanes = LaneScheduler(self.lock_connections, caps=self.lock_budgets, reserved=0)
+        # 프로세스별 연결 풀 (전체 연결 예산을 워커 수로 나눈 크기, 락 전용 연결 제외)
+        self.pool_size = self._resolve_pool_size()
+        # 풀 슬롯은 우선순위 레인(interactive / scheduled / bulk)별 상한과 interactive 예약분을 지키며 배정
+        self.lanes = LaneScheduler(self.pool_size)
+        self._idle: List[Tuple[Any, float]] = []
+        self.pool_stats = {"created": 0, "reused": 0, "discarded": 0, "in_use": 0,
+                           "statement_timeouts": 0, "killed_queries": 0}
+
+        # 레인별 DB 전용 스레드 풀 (기본 executor 와 분리, 연결 수를 넘는 동시 작업은 의미가 없으므로 레인 연결 상한에 맞춤)
+        # 대량 작업이 스레드를 모두 차지해도 interactive 작업은 자기 스레드 풀에서 바로 실행됨
+        self.executor_workers = {
+            lane: settings.DB_EXECUTOR_WORKERS or self.lanes.caps[lane] + self.lock_budgets[lane]
+            for lane in LANES
+        }
+        self.executors = {
+            lane: ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"db-{lane}")
+            for lane, workers in self.executor_workers.items()
+        }
+
+    def _resolve_lock_budgets(self) -> Dict[str, int]:
+        budgets = {}
+        for lane in LANES:
+            budget = settings.DB_LOCK_LANE_CONNECTIONS.get(lane, 1)
+            if lane == BULK and budget <= 0:
+                # 백필 워커 노드는 동시 실행 제어기가 올릴 수 있는 상한만큼 (락 연결이 실제 병렬도를 막지 않도록)
+                budget = settings.BACKFILL_CONCURRENCY_MAX if settings.BACKFILL_WORKER_ENABLED else 1
+            budgets[lane] = max(1, budget)
+        return budgets
+
+    def _resolve_pool_size(self) -> int:
+        if settings.DB_POOL_SIZE > 0:
+            return settings.DB_POOL_SIZE
+        per_process = settings.DB_CONNECTION_BUDGET // max(1, settings.WEB_CONCURRENCY)
+        return max(1, per_process - self.lock_connections)
+
+    def run_in_executor(self, func: Callable[..., T], *args) -> "asyncio.Future[T]":
+        """현재 레인의 DB 전용 스레드 풀에서 동기 함수 실행"""
+        future = self.executors[current_lane.get()].submit(func, *args)
+        calls = _connection_calls.get()
+        if calls is not None:
+            calls[:] = [call for call in calls if not call.done()]
+            calls.append(future)
+        return asyncio.wrap_future(future)
+
+    def get_executor_stats(self) -> Dict[str, Any]:
+        """DB 전용 스레드 풀 상태 조회 (queued: 스레드를 기다리는 작업 수, lanes: 레인별)"""
+        lanes = {
+            lane: {
+                "workers": self.executor_workers[lane],
+                "threads": len(executor._threads),
+                "queued": executor._work_queue.qsize(),
+            }
+            for lane, executor in self.executors.items()
+        }
+        return {
+            "workers": sum(stats["workers"] for stats in lanes.values()),
+            "threads": sum(stats["threads"] for stats in lanes.values()),
+            "queued": sum(stats["queued"] for stats in lanes.values()),
+            "lanes": lanes,
+        }
 
     def get_connection(self):
         """데이터베이스 연결 생성"""
         try:
-            connection = pymysql.connect(**self.db_config)
+            # 느린 쿼리 기록을 위해 실행 시간을 측정하는 커서를 기본 커서로 사용
+            connection = pymysql.connect(**self.db_config, cursorclass=TimedCursor,
+                                         connect_timeout=settings.DB_CONNECT_TIMEOUT_SECONDS)
             return connection
         except Exception as e:
             logger.error(f"데이터베이스 연결 실패: {str(e)}")
-            raise Exception(f"데이터베이스 연결 실패: {str(e)}")
+            # 회로 차단기가 원인 오류 코드를 확인할 수 있도록 원인 예외 연결
+            raise Exception(f"데이터베이스 연결 실패: {str(e)}") from e
+
+    def _checkout(self):
+        """유휴 연결 꺼내기 (recycle 시간을 넘긴 연결은 폐기)"""
+        now = time.monotonic()
+        while self._idle:
+            connection, released_at = self._idle.pop()
+            if now - released_at < settings.DB_POOL_RECYCLE_SECONDS and connection.open:
+                self.pool_stats["reused"] += 1
+                return connection
+            self.pool_stats["discarded"] += 1
+            try:
+                connection.close()
+            except Exception:
+                pass
+        return None
+
+    def _checkin(self, connection):
+        """사용한 연결 반납 (열린 트랜잭션이 있으면 롤백하여 스냅샷 해제)"""
+        try:
+            if connection.server_status & SERVER_STATUS.SERVER_STATUS_IN_TRANS:
+                connection.rollback()
+            self._idle.append((connection, time.monotonic()))
+        except Exception:
+            self.pool_stats["discarded"] += 1
+            try:
+                connection.close()
+            except Exception:
+                pass
+
+    def statement_timeout(self, service: Optional[str]) -> float:
+        """서비스별 문장 실행 시간 상한 (초, 0 이면 제한 없음)"""
+        return settings.STATEMENT_TIMEOUTS.get(service, settings.DB_STATEMENT_TIMEOUT_SECONDS)
+
+    def _apply_statement_timeout(self, connection, timeout: float):
+        """세션 max_statement_time 설정 (풀 연결에 마지막으로 적용한 값과 다를 때만 호출)"""
+        cursor = connection.cursor()
+        try:
+            cursor.execute("SET SESSION max_statement_time = %s", (timeout,))
+        finally:
+            cursor.close()
+        connection._statement_timeout = timeout
+
+    def _kill_query(self, thread_id: int):
+        """별도 연결로 서버 측 실행 중인 문장 중단"""
+        connection = self.get_connection()
+        try:
+            cursor = connection.cursor()
+            cursor.execute("KILL QUERY %s", (thread_id,))
+            cursor.close()
+        finally:
+            connection.close()
+
+    @asynccontextmanager
+    async def get_async_connection(self, service: Optional[str] = None):
+        """
+        비동기 데이터베이스 연결 컨텍스트 매니저 (프로세스별 풀에서 대여)
+
+        Args:
+            service: 서비스 이름 (STATEMENT_TIMEOUTS 의 키, 문장 실행 시간 상한 적용)
+
+        Raises:
+            CircuitOpenError: 회로 차단기가 열려 있음 (연결을 시도하지 않고 즉시)
+        """
+        # 연결 생성부터 사용 종료까지의 실패를 회로 차단기에 기록
+        with self.breaker.guard():
+            async with self._pooled_connection(service) as connection:
+                yield connection
+
+    @staticmethod
+    def _close_after(connection, calls: List[concurrent.futures.Future]):
+        """연결로 실행 중인 작업이 끝난 뒤 닫기 (pymysql 연결은 다른 스레드가 쓰는 중에 닫으면 안 됨)"""
+        concurrent.futures.wait(calls)
+        try:
+            connection.close()
+        except Exception:
+            pass
 
     @asynccontextmanager
-    async def get_async_connection(self):
-        """비동기 데이터베이스 연결 컨텍스트 매니저"""
+    async def _pooled_connection(self, service: Optional[str]):
+        lane = current_lane.get()
+        await self.lanes.acquire(lane)
+        self.pool_stats["in_use"] += 1
         connection = None
+        reusable = False
+        calls: List[concurrent.futures.Future] = []
+        calls_token = _connection_calls.set(calls)
         try:
-            loop = asyncio.get_event_loop()
-            connection = await loop.run_in_executor(None, self.get_connection)
-            yield connection
+            connection = self._checkout()
+            if connection is None:
+                connection = await self.run_in_executor(self.get_connection)
+                self.pool_stats["created"] += 1
+            # 느린 쿼리 기록에 서비스 이름을 남기기 위해 연결에 표시
+            connection._service = service
+            timeout = self.statement_timeout(service)
+            if getattr(connection, "_statement_timeout", None) != timeout:
+                await self.run_in_executor(self._apply_statement_timeout, connection, timeout)
+            try:
+                yield connection
+            except asyncio.CancelledError:
+                # 요청 취소(클라이언트 연결 종료 등) 시 스레드에서 실행 중인 쿼리를 서버에서 중단
+                # (DB 전용 스레드 풀이 가득 차 있어도 바로 실행되도록 기본 executor 사용)
+                self.pool_stats["killed_queries"] += 1
+                try:
+                    await asyncio.get_event_loop().run_in_executor(None, self._kill_query, connection.thread_id())
+                    logger.warning(f"⚠️ 요청 취소로 쿼리 중단 (service={service}, thread_id={connection.thread_id()})")
+                except Exception as e:
+                    logger.error(f"KILL QUERY 실패: {str(e)}")
+                raise
+            except Exception as e:
+                if e.args and e.args[0] == ER_STATEMENT_TIMEOUT:
+                    self.pool_stats["statement_timeouts"] += 1
+                    logger.warning(f"⚠️ 문장 실행 시간 초과 (service={service}, 상한 {timeout}초)")
+                raise
+            reusable = True
         finally:
-            if connection:
-                connection.close()
+            try:
+                if connection:
+                    if reusable:
+                        await self.run_in_executor(self._checkin, connection)
+                    else:
+                        # 오류가 발생했거나 취소된 연결은 상태를 알 수 없으므로 폐기
+                        # 취소된 경우 스레드에서 아직 실행 중인 작업(KILL QUERY 로 곧 끝남)이 끝난 뒤 스레드에서 닫음
+                        # (다시 취소되어도 닫기는 끝까지 진행되도록 shield, DB 전용 스레드 풀 대기열과 무관하게 기본 executor 사용)
+                        self.pool_stats["discarded"] += 1
+                        pending = [call for call in calls if not call.done()]
+                        await asyncio.shield(
+                            asyncio.get_event_loop().run_in_executor(None, self._close_after, connection, pending)
+                        )
+            finally:
+                _connection_calls.reset(calls_token)
+                self.pool_stats["in_use"] -= 1
+                self.lanes.release(lane)
+
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """연결 풀 상태 조회"""
+        return {
+            **self.pool_stats,
+            "pool_size": self.pool_size,
+            "idle": len(self._idle),
+            "lock_connections": self.lock_connections,
+            "lock_lanes": self.lock_lanes.get_stats(),
+            "workers": settings.WEB_CONCURRENCY,
+            "connection_budget": settings.DB_CONNECTION_BUDGET,
+            "lanes": self.lanes.get_stats(),
+        }
+
+    @asynccontextmanager
+    async def aggregation_locks(self, services: List[str], start_date: str, end_date: Optional[str] = None):
+        """
+        (서비스, 날짜) 단위 프로세스 간 집계 락 (MariaDB GET_LOCK)
+
+        락은 전용 연결에 걸리며 컨텍스트 종료 시 연결을 닫아 해제됨.
+        서비스별로 범위 내 모든 날짜를 획득한 경우에만 획득으로 간주.
+
+        Args:
+            services: 서비스 이름 목록
+            start_date: 시작 날짜 (YYYY-MM-DD)
+            end_date: 종료 날짜 (YYYY-MM-DD, 포함, None 이면 start_date 하루)
+
+        Yields:
+            List[str]: 락을 획득한 서비스 목록 (나머지는 다른 프로세스에서 집계 중)
+        """
+        if not settings.AGGREGATION_LOCK_ENABLED:
+            yield list(services)
+            return
+
+        dates = _date_range(start_date, end_date or start_date)
+        wait = settings.AGGREGATION_LOCK_WAIT_SECONDS
+
+        # 락 연결은 집계가 끝날 때까지 유지되므로 레인별 예산에서 배정 (백필 청크가 API 집계 앞에 줄 서지 않도록)
+        lane = current_lane.get()
+        await self.lock_lanes.acquire(lane)
+        connection = None
+        try:
+            def _acquire():
+                acquired = []
+                cursor = connection.cursor()
+                try:
+                    for service in services:
+                        names = [f"{settings.AGGREGATION_LOCK_PREFIX}:{service}:{d}" for d in dates]
+                        held = []
+                        complete = True
+                        # 긴 범위는 SELECT 목록이 과도하게 길어지지 않도록 나누어 획득
+                        for offset in range(0, len(names), 200):
+                            chunk = names[offset:offset + 200]
+                            cursor.execute(
+                                "SELECT " + ", ".join(["GET_LOCK(%s, %s)"] * len(chunk)),
+                                [value for name in chunk for value in (name, wait)]
+                            )
+                            results = cursor.fetchone()
+                            held.extend(name for name, result in zip(chunk, results) if result == 1)
+                            if not all(result == 1 for result in results):
+                                complete = False
+                                break
+                        if complete:
+                            acquired.append(service)
+                            continue
+                        # 일부만 획득한 경우 획득한 날짜 락 반환
+                        for offset in range(0, len(held), 200):
+                            chunk = held[offset:offset + 200]
+                            cursor.execute("SELECT " + ", ".join(["RELEASE_LOCK(%s)"] * len(chunk)), chunk)
+                            cursor.fetchone()
+                        logger.warning(f"⚠️ [{service}] {dates[0]} ~ {dates[-1]} 다른 프로세스에서 집계 중")
+                    return acquired
+                finally:
+                    cursor.close()
+
+            # 락 연결 생성과 획득 실패만 회로 차단기에 기록 (집계 본문은 각자의 연결에서 기록)
+            with self.breaker.guard():
+                connection = await self.run_in_executor(self.get_connection)
+                acquired = await self.run_in_executor(_acquire)
+            yield acquired
+        finally:
+            # 연결 종료 시 해당 연결의 모든 GET_LOCK 이 해제됨
+            try:
+                if connection is not None:
+                    connection.close()
+            finally:
+                self.lock_lanes.release(lane)
+
+    def add_write_listener(self, listener: Callable[[str, Optional[str], Optional[str]], None]):
+        """
+        쓰기 완료 리스너 등록 (캐시 무효화 등)
+
+        Args:
+            listener: (target_table, start_date, end_date) 를 인자로 받는 함수
+                      (날짜가 None 이면 범위를 알 수 없는 쓰기)
+        """
+        self._write_listeners.append(listener)
+
+    async def execute_write(self, target_table: str, func: Callable[[Any], T],
+                            target_date: Optional[str] = None, service: Optional[str] = None,
+                            end_date: Optional[str] = None) -> T:
+        """
+        대상 테이블 쓰기 작업 실행 (테이블별 직렬화 + 데드락 재시도)
+
+        Args:
+            target_table: 쓰기 대상 테이블명
+            func: connection 을 인자로 받아 쓰기 및 commit 을 수행하는 동기 함수
+            target_date: 쓰기 대상 날짜 (YYYY-MM-DD, 범위 쓰기면 시작 날짜, 리스너에 전달)
+            service: 서비스 이름 (문장 실행 시간 상한 적용)
+            end_date: 범위 쓰기의 종료 날짜 (None 이면 target_date 하루)
+        """
+        result = await self.write_scheduler.run(target_table, func, service)
+
+        for listener in self._write_listeners:
+            try:
+                listener(target_table, target_date, end_date or target_date)
+            except Exception as e:
+                logger.error(f"쓰기 리스너 실행 실패 ({target_table}): {str(e)}")
+
+        return result
 
     async def test_connection(self) -> bool:
         """데이터베이스 연결 테스트"""
@@ -0,0 +1,67 @@
+"""
+클라이언트 연결 종료 감지 미들웨어
+요청 본문을 먼저 모두 읽은 뒤 핸들러를 별도 태스크로 실행하고,
+응답 전에 클라이언트가 연결을 끊으면 핸들러 태스크를 취소
+
+취소는 DatabaseManager.get_async_connection 까지 전파되어 실행 중인 쿼리에 KILL QUERY 를 보냄
+"""
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class CancelOnDisconnectMiddleware:
+    """클라이언트 연결 종료 시 요청 처리 태스크 취소 (ASGI 미들웨어)"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # 요청 본문 수신 (본문 수신 중 연결이 끊기면 처리하지 않음)
+        messages = []
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+            messages.append(message)
+            if not message.get("more_body", False):
+                break
+
+        disconnected = asyncio.Event()
+
+        async def replay_receive():
+            # 버퍼링한 본문을 돌려준 뒤에는 연결 종료 시점까지 대기
+            if messages:
+                return messages.pop(0)
+            await disconnected.wait()
+            return {"type": "http.disconnect"}
+
+        handler = asyncio.create_task(self.app(scope, replay_receive, send))
+        watcher = asyncio.create_task(receive())
+        try:
+            done, _ = await asyncio.wait({handler, watcher}, return_when=asyncio.FIRST_COMPLETED)
+            if handler in done:
+                handler.result()
+                return
+
+            if watcher.result()["type"] == "http.disconnect":
+                disconnected.set()
+                handler.cancel()
+                logger.warning(f"⚠️ 클라이언트 연결 종료로 요청 취소: {scope.get('method')} {scope.get('path')}")
+                try:
+                    await handler
+                except asyncio.CancelledError:
+                    pass
+                return
+
+            await handler
+        finally:
+            if not watcher.done():
+                watcher.cancel()
+            if not handler.done():
+                handler.cancel()
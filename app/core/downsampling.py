@@ -0,0 +1,212 @@
+"""
+장기 범위 차트 조회용 서버 측 다운샘플링
+행을 한 번에 하나씩 받아(커서 스트리밍) 기준 컬럼(y)의 모양을 유지하는 대표 행만 남김
+전체 행을 메모리에 올리지 않고 버킷 2개 분량 + 결과(max_points 이하)만 유지
+
+- lttb: Largest-Triangle-Three-Buckets. 처음/마지막 행은 항상 유지하고, 중간은 시간 버킷마다
+        (직전 선택 행, 다음 버킷 평균)과 이루는 삼각형 면적이 가장 큰 행 1개 선택
+- minmax: 시간 버킷마다 y 최솟값 행과 최댓값 행을 시간 순으로 유지 (피크 보존 우선)
+
+버킷은 요청 범위(x_start ~ x_end)를 같은 폭으로 나눈 시간 구간이라 전체 행 수를 미리 알 필요가 없고,
+빈 버킷은 건너뛰므로 결과 행 수는 max_points 이하
+y 가 NULL 인 행은 대표 행 후보에서 제외 (skipped 로 집계)
+"""
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, Iterable, List, Sequence
+
+DOWNSAMPLE_METHODS = ("lttb", "minmax")
+
+Row = Sequence[Any]
+
+
+class Downsampler(ABC):
+    """스트리밍 다운샘플러 공통 부분 (add 로 행을 넣고 finish 로 결과 행 목록을 받음)"""
+
+    method = ""
+
+    def __init__(self, x_start: float, x_end: float, max_points: int, y_index: int,
+                 x_of: Callable[[Row], float]):
+        """
+        Args:
+            x_start: 범위 시작 x (예: 시작 날짜 ordinal)
+            x_end: 범위 종료 x (포함)
+            max_points: 결과 행 수 상한
+            y_index: 기준 컬럼 위치
+            x_of: 행 → x 값 (행은 x 오름차순으로 들어와야 함)
+        """
+        self.x_start = x_start
+        self.x_end = x_end
+        self.max_points = max_points
+        self.y_index = y_index
+        self.x_of = x_of
+        self.source_count = 0
+        self.skipped = 0
+        self.output: List[Row] = []
+
+    def _bucket_of(self, x: float, buckets: int) -> int:
+        span = self.x_end - self.x_start + 1
+        return min(buckets - 1, max(0, int((x - self.x_start) * buckets / span)))
+
+    def _point(self, row: Row):
+        """행 → (x, y, row), y 가 NULL 이면 None"""
+        self.source_count += 1
+        y = row[self.y_index]
+        if y is None:
+            self.skipped += 1
+            return None
+        return self.x_of(row), float(y), row
+
+    def add_all(self, rows: Iterable[Row]):
+        for row in rows:
+            self.add(row)
+
+    @abstractmethod
+    def add(self, row: Row):
+        """행 하나 반영 (x 오름차순)"""
+
+    @abstractmethod
+    def finish(self) -> List[Row]:
+        """남은 버킷을 마무리하고 결과 행 목록 반환"""
+
+    def get_info(self) -> Dict[str, Any]:
+        return {
+            "method": self.method,
+            "max_points": self.max_points,
+            "source_count": self.source_count,
+            "skipped_null": self.skipped,
+            "count": len(self.output),
+        }
+
+
+class LTTBDownsampler(Downsampler):
+    """Largest-Triangle-Three-Buckets (스트리밍)"""
+
+    method = "lttb"
+
+    def __init__(self, x_start: float, x_end: float, max_points: int, y_index: int,
+                 x_of: Callable[[Row], float]):
+        super().__init__(x_start, x_end, max_points, y_index, x_of)
+        # 처음/마지막 행을 뺀 중간 버킷 수
+        self.buckets = max(1, max_points - 2)
+        self.anchor = None
+        # 마지막 행은 끝까지 알 수 없으므로 한 행씩 늦게 버킷에 넣음
+        self.held = None
+        self.current: List[Any] = []
+        self.current_index = -1
+        self.next: List[Any] = []
+        self.next_index = -1
+
+    def _select(self, bucket: List[Any], next_x: float, next_y: float):
+        ax, ay, _ = self.anchor
+        best, best_area = bucket[0], -1.0
+        for point in bucket:
+            bx, by, _ = point
+            area = abs((ax - next_x) * (by - ay) - (ax - bx) * (next_y - ay))
+            if area > best_area:
+                best, best_area = point, area
+        self.output.append(best[2])
+        self.anchor = best
+
+    def _select_with_average(self, bucket: List[Any], following: List[Any]):
+        count = len(following)
+        self._select(bucket, sum(p[0] for p in following) / count, sum(p[1] for p in following) / count)
+
+    def _push(self, point):
+        index = self._bucket_of(point[0], self.buckets)
+        if not self.current:
+            self.current, self.current_index = [point], index
+        elif index == self.current_index and not self.next:
+            self.current.append(point)
+        elif not self.next or index == self.next_index:
+            self.next.append(point)
+            self.next_index = index
+        else:
+            # 다음 버킷이 완성됨 → 현재 버킷에서 대표 행 선택
+            self._select_with_average(self.current, self.next)
+            self.current, self.current_index = self.next, self.next_index
+            self.next, self.next_index = [point], index
+
+    def add(self, row: Row):
+        point = self._point(row)
+        if point is None:
+            return
+        if self.anchor is None:
+            self.anchor = point
+            self.output.append(row)
+            return
+        if self.held is not None:
+            self._push(self.held)
+        self.held = point
+
+    def finish(self) -> List[Row]:
+        if self.held is not None:
+            last_x, last_y, last_row = self.held
+            if self.current:
+                if self.next:
+                    self._select_with_average(self.current, self.next)
+                    self.current = self.next
+                self._select(self.current, last_x, last_y)
+            self.output.append(last_row)
+            self.held = None
+        self.current, self.next = [], []
+        return self.output
+
+
+class MinMaxDownsampler(Downsampler):
+    """버킷별 최솟값/최댓값 행 유지 (스트리밍)"""
+
+    method = "minmax"
+
+    def __init__(self, x_start: float, x_end: float, max_points: int, y_index: int,
+                 x_of: Callable[[Row], float]):
+        super().__init__(x_start, x_end, max_points, y_index, x_of)
+        self.buckets = max(1, max_points // 2)
+        self.index = -1
+        self.low = None
+        self.high = None
+
+    def _flush(self):
+        if self.low is None:
+            return
+        if self.low is self.high:
+            self.output.append(self.low[2])
+        else:
+            first, second = sorted((self.low, self.high), key=lambda point: point[0])
+            self.output.extend((first[2], second[2]))
+        self.low = self.high = None
+
+    def add(self, row: Row):
+        point = self._point(row)
+        if point is None:
+            return
+        index = self._bucket_of(point[0], self.buckets)
+        if index != self.index:
+            self._flush()
+            self.index = index
+        if self.low is None or point[1] < self.low[1]:
+            self.low = point
+        if self.high is None or point[1] > self.high[1]:
+            self.high = point
+
+    def finish(self) -> List[Row]:
+        self._flush()
+        return self.output
+
+
+def create_downsampler(method: str, x_start: float, x_end: float, max_points: int, y_index: int,
+                       x_of: Callable[[Row], float]) -> Downsampler:
+    """method 이름으로 다운샘플러 생성 (lttb / minmax)"""
+    if method == "lttb":
+        return LTTBDownsampler(x_start, x_end, max_points, y_index, x_of)
+    if method == "minmax":
+        return MinMaxDownsampler(x_start, x_end, max_points, y_index, x_of)
+    raise ValueError(f"지원하지 않는 다운샘플링 방식: {method} (지원: {', '.join(DOWNSAMPLE_METHODS)})")
+
+
+def downsample(rows: Iterable[Row], method: str, x_start: float, x_end: float, max_points: int,
+               y_index: int, x_of: Callable[[Row], float]) -> Downsampler:
+    """이미 메모리에 있는 행 목록 다운샘플링 (결과는 반환된 다운샘플러의 output / get_info)"""
+    sampler = create_downsampler(method, x_start, x_end, max_points, y_index, x_of)
+    sampler.add_all(rows)
+    sampler.finish()
+    return sampler
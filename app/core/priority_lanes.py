@@ -0,0 +1,136 @@
+"""
+DB 작업 우선순위 레인
+연결 풀 슬롯과 DB 스레드를 레인(interactive / scheduled / bulk)별 예산으로 나누어,
+백필 같은 대량 작업이 연결과 스레드를 모두 차지해도 대시보드 조회/당일 집계가 뒤에 줄 서지 않도록 함
+
+- interactive: API 요청 (기본값), 항상 먼저 배정되며 DB_LANE_INTERACTIVE_RESERVED 개 연결은 다른 레인이 쓰지 못함
+- scheduled: 주기 작업 (실시간 집계 적재, 파티션 관리, 피처 스냅샷 갱신, 적재 버퍼/실행 이력 플러시)
+- bulk: 분산 백필 워커, CLI 재계산/스냅샷 내보내기
+
+현재 레인은 컨텍스트 변수로 전달되므로 백그라운드 태스크는 시작 시 current_lane.set(...) 한 번으로
+그 태스크(와 태스크가 만드는 하위 태스크)의 모든 DB 작업이 해당 레인으로 처리됨
+
+같은 배정 규칙(LaneScheduler)을 연결 풀 슬롯, 집계 락 전용 연결, 대상 테이블별 쓰기 슬롯에 각각 사용
+"""
+import asyncio
+import logging
+from collections import deque
+from contextvars import ContextVar
+from typing import Any, Deque, Dict, List, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+INTERACTIVE = "interactive"
+SCHEDULED = "scheduled"
+BULK = "bulk"
+
+# 우선순위 순서 (앞쪽 레인의 대기 요청부터 배정)
+LANES = (INTERACTIVE, SCHEDULED, BULK)
+
+current_lane: ContextVar[str] = ContextVar("db_lane", default=INTERACTIVE)
+
+# 현재 태스크가 프로세스 내부 슬롯(연결/락/쓰기) 대기에 쓴 시간 누계 [초]
+# (설정한 태스크에서만 기록 - 예: 백필 청크 처리 시간에서 로컬 대기 시간을 빼기 위해 사용)
+local_wait: ContextVar[Optional[List[float]]] = ContextVar("db_local_wait", default=None)
+
+
+class LaneScheduler:
+    """레인별 상한과 interactive 예약분을 지키며 연결 풀 슬롯을 우선순위대로 배정"""
+
+    def __init__(self, total: int, caps: Optional[Dict[str, int]] = None, reserved: Optional[int] = None):
+        """
+        Args:
+            total: 전체 슬롯 수
+            caps: 레인별 최대 슬롯 수 (None 이면 DB_LANE_SHARES 비율)
+            reserved: interactive 전용 예약 슬롯 수 (None 이면 DB_LANE_INTERACTIVE_RESERVED)
+        """
+        self.total = max(1, total)
+        # 레인별 최대 동시 슬롯 수 (최소 1)
+        if caps is None:
+            caps = {lane: int(self.total * settings.DB_LANE_SHARES.get(lane, 1.0)) for lane in LANES}
+        self.caps: Dict[str, int] = {
+            lane: max(1, min(self.total, caps.get(lane, self.total))) for lane in LANES
+        }
+        if reserved is None:
+            reserved = settings.DB_LANE_INTERACTIVE_RESERVED
+        self.reserved = max(0, min(reserved, self.total - 1))
+        self.in_use: Dict[str, int] = {lane: 0 for lane in LANES}
+        self._waiters: Dict[str, Deque[asyncio.Future]] = {lane: deque() for lane in LANES}
+        self.stats: Dict[str, Dict[str, Any]] = {
+            lane: {"acquired": 0, "waited": 0, "wait_seconds": 0.0} for lane in LANES
+        }
+
+    def _grantable(self, lane: str) -> bool:
+        used = sum(self.in_use.values())
+        if used >= self.total or self.in_use[lane] >= self.caps[lane]:
+            return False
+        # 마지막 reserved 개 슬롯은 interactive 전용
+        return lane == INTERACTIVE or self.total - used > self.reserved
+
+    def _wake(self):
+        """빈 슬롯을 우선순위 순서로 대기 요청에 배정"""
+        for lane in LANES:
+            waiters = self._waiters[lane]
+            while waiters and self._grantable(lane):
+                waiter = waiters.popleft()
+                if waiter.done():
+                    continue
+                self.in_use[lane] += 1
+                waiter.set_result(None)
+
+    async def acquire(self, lane: str):
+        """레인 슬롯 획득 (같은 레인 안에서는 요청 순서대로)"""
+        if lane not in self.in_use:
+            raise ValueError(f"알 수 없는 레인: {lane} (가능: {list(LANES)})")
+
+        self.stats[lane]["acquired"] += 1
+        if not self._waiters[lane] and self._grantable(lane):
+            self.in_use[lane] += 1
+            return
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        waiter = loop.create_future()
+        self._waiters[lane].append(waiter)
+        self.stats[lane]["waited"] += 1
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # 배정 직후 취소되었으면 슬롯을 돌려줌
+                self.release(lane)
+            else:
+                try:
+                    self._waiters[lane].remove(waiter)
+                except ValueError:
+                    pass
+            raise
+        finally:
+            waited = loop.time() - started
+            self.stats[lane]["wait_seconds"] += waited
+            meter = local_wait.get()
+            if meter is not None:
+                meter[0] += waited
+
+    def release(self, lane: str):
+        """레인 슬롯 반납 후 대기 요청 배정"""
+        self.in_use[lane] -= 1
+        self._wake()
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """레인별 사용/대기 상태 조회"""
+        return {
+            lane: {
+                "cap": self.caps[lane],
+                "reserved": self.reserved if lane == INTERACTIVE else 0,
+                "in_use": self.in_use[lane],
+                "waiting": len(self._waiters[lane]),
+                "acquired": self.stats[lane]["acquired"],
+                "waited": self.stats[lane]["waited"],
+                "avg_wait_seconds": round(self.stats[lane]["wait_seconds"] / self.stats[lane]["waited"], 4)
+                if self.stats[lane]["waited"] else 0.0,
+            }
+            for lane in LANES
+        }
@@ -0,0 +1,153 @@
+"""
+요청 단위 CPU 프로파일링 미들웨어
+PROFILING_ENABLED 일 때만 등록되며, 요청 헤더(PROFILING_HEADER)가 있는 요청만 프로파일링
+(비활성 시에는 미들웨어 자체가 등록되지 않으므로 추가 비용 없음)
+
+- sampling: 이벤트 루프 스레드의 스택을 주기적으로 샘플링하여 flamegraph 용 collapsed stack(.folded) 저장
+- cprofile: cProfile 결정적 프로파일 결과(.prof, pstats / snakeviz 로 확인) 저장
+
+DB 쿼리는 DB 전용 스레드 풀에서 실행되므로 결과에는 직렬화/검증/로깅 등 이벤트 루프 처리 시간만 나타남
+이벤트 루프 전체를 관찰하므로 동시에 처리 중인 다른 요청도 섞일 수 있어, 한 번에 한 요청만 프로파일링
+"""
+import asyncio
+import cProfile
+import logging
+import os
+import re
+import sys
+import threading
+from collections import Counter
+from datetime import datetime
+from typing import Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+PROFILING_MODES = ("sampling", "cprofile")
+
+
+class StackSampler(threading.Thread):
+    """대상 스레드의 호출 스택을 주기적으로 수집하는 샘플러 (collapsed stack 집계)"""
+
+    def __init__(self, thread_id: int, interval: float):
+        super().__init__(name="request-profiler", daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self.idle_samples = 0
+        self._stopped = threading.Event()
+
+    def run(self):
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            # 이벤트 루프가 I/O 대기(selector) 중인 샘플은 CPU 사용이 아니므로 제외
+            if frame.f_code.co_name == "select" and frame.f_code.co_filename.endswith("selectors.py"):
+                self.idle_samples += 1
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            self.samples[";".join(reversed(stack))] += 1
+
+    def stop(self):
+        self._stopped.set()
+        self.join()
+
+    def collapsed(self) -> str:
+        """flamegraph.pl / speedscope 에서 읽을 수 있는 collapsed stack 형식"""
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+
+class ProfilingMiddleware:
+    """요청 헤더로 지정한 요청만 CPU 프로파일링 (ASGI 미들웨어)"""
+
+    def __init__(self, app):
+        self.app = app
+        self.header = settings.PROFILING_HEADER.lower().encode("latin-1")
+        self.directory = settings.PROFILING_DIR
+        self.interval = settings.PROFILING_SAMPLE_INTERVAL_SECONDS
+        self._active = False
+
+    def _requested_mode(self, scope) -> Optional[str]:
+        for name, value in scope.get("headers", []):
+            if name == self.header:
+                value = value.decode("latin-1").strip().lower()
+                if value in PROFILING_MODES:
+                    return value
+                if value in ("1", "true", "yes"):
+                    return settings.PROFILING_MODE
+                return None
+        return None
+
+    def _output_path(self, scope, mode: str) -> str:
+        path = re.sub(r"[^A-Za-z0-9_-]+", "_", scope.get("path", "")).strip("_") or "root"
+        suffix = "folded" if mode == "sampling" else "prof"
+        filename = f"{datetime.now():%Y%m%d_%H%M%S_%f}_{scope.get('method', 'GET')}_{path}.{suffix}"
+        return os.path.join(self.directory, filename)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        mode = self._requested_mode(scope)
+        if mode is None:
+            await self.app(scope, receive, send)
+            return
+
+        # 이벤트 루프 전체를 관찰하므로 동시에 하나의 요청만 프로파일링
+        if self._active:
+            logger.warning(f"⚠️ [Profiling] 다른 요청을 프로파일링 중이어서 건너뜀: {scope.get('path')}")
+            await self.app(scope, receive, send)
+            return
+
+        output_path = self._output_path(scope, mode)
+
+        async def send_with_header(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"x-profile-file", os.path.basename(output_path).encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        self._active = True
+        sampler = None
+        profiler = None
+        started = datetime.now()
+        try:
+            if mode == "sampling":
+                sampler = StackSampler(threading.get_ident(), self.interval)
+                sampler.start()
+            else:
+                profiler = cProfile.Profile()
+                profiler.enable()
+            await self.app(scope, receive, send_with_header)
+        finally:
+            if sampler is not None:
+                sampler.stop()
+            if profiler is not None:
+                profiler.disable()
+            self._active = False
+
+        elapsed = (datetime.now() - started).total_seconds()
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, self._save, output_path, sampler, profiler)
+            samples = f", 샘플 {sum(sampler.samples.values())}개 (유휴 {sampler.idle_samples}개)" if sampler else ""
+            logger.info(f"🔬 [Profiling] {scope.get('method')} {scope.get('path')} "
+                        f"{elapsed:.3f}초{samples} → {output_path}")
+        except Exception as e:
+            logger.error(f"❌ [Profiling] 프로파일 저장 실패: {str(e)}")
+
+    @staticmethod
+    def _save(output_path: str, sampler: Optional[StackSampler], profiler: Optional[cProfile.Profile]):
+        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+        if sampler is not None:
+            with open(output_path, "w", encoding="utf-8") as f:
+                f.write(sampler.collapsed())
+        else:
+            profiler.dump_stats(output_path)
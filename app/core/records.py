@@ -0,0 +1,26 @@
+"""
+커서 결과 변환 유틸리티
+(웹 프레임워크를 import 하지 않으므로 CLI 등 서버 밖에서 서비스를 쓸 때도 가볍게 로드됨)
+"""
+from typing import Any, Dict, Sequence
+
+
+def rows_to_columnar(description: Sequence[Sequence[Any]], rows: Sequence[Sequence[Any]]) -> Dict[str, Any]:
+    """
+    튜플 커서 결과를 컬럼 목록 + 행 행렬로 변환 (피처 조회와 같은 columns / rows / count 형식)
+    행마다 dict 를 만들지 않고 커서의 튜플을 그대로 두어 orjson 이 배열로 직렬화
+
+    Args:
+        description: cursor.description
+        rows: cursor.fetchall() 결과
+    """
+    return {
+        "columns": [column[0] for column in description],
+        "rows": rows,
+        "count": len(rows),
+    }
+
+
+def empty_columnar() -> Dict[str, Any]:
+    """조회 실패 시 응답 (rows_to_columnar 와 같은 형식)"""
+    return {"columns": [], "rows": [], "count": 0}
@@ -0,0 +1,38 @@
+"""
+응답 직렬화 유틸리티
+orjson 기반 응답 클래스 (튜플 커서 결과 → columns / rows 변환은 app.core.records)
+"""
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from fastapi.responses import ORJSONResponse
+
+# 기존 import 경로 호환 (서비스 모듈은 fastapi 를 불러오지 않도록 app.core.records 에서 직접 import)
+from app.core.records import empty_columnar, rows_to_columnar  # noqa: F401
+
+
+def _default(value: Any) -> Any:
+    """orjson 이 기본 지원하지 않는 타입 처리 (SUM 집계 결과의 Decimal 등)"""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (bytes, bytearray)):
+        return value.decode('utf-8', errors='replace')
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+class FastJSONResponse(ORJSONResponse):
+    """
+    orjson 기반 JSON 응답
+
+    datetime/date 는 orjson 이 C 레벨에서 ISO 형식으로, Decimal 은 float 로 직렬화.
+    엔드포인트에서 이 응답을 직접 반환하면 response_model 재검증과 jsonable_encoder 를 건너뜀.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(
+            content,
+            default=_default,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        )
+
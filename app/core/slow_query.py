@@ -0,0 +1,196 @@
+"""
+느린 쿼리 기록
+SLOW_QUERY_THRESHOLD_SECONDS 를 넘긴 문장을 메모리 링 버퍼(최근 N건)에 기록하고,
+문장 지문(fingerprint)별 첫 발생 시 같은 연결에서 EXPLAIN 결과를 수집
+
+DatabaseManager 가 만드는 모든 연결의 기본 커서(TimedCursor)에서 측정하므로 서비스 코드 변경 없이 적용됨
+"""
+import hashlib
+import logging
+import re
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import pymysql.cursors
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_STRING_LITERAL = re.compile(r"'(?:[^'\\]|\\.)*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_WHITESPACE = re.compile(r"\s+")
+_UPDATE_TABLE = re.compile(r"^\s*(UPDATE)\s+`?(\w+)`?", re.IGNORECASE)
+_STATEMENT_TABLE = re.compile(r"^\s*(INSERT|REPLACE|DELETE|SELECT|WITH)\b.*?\b(?:INTO|FROM)\s+`?(\w+)`?",
+                              re.IGNORECASE | re.DOTALL)
+_EXPLAINABLE = ("SELECT", "INSERT", "REPLACE", "UPDATE", "DELETE", "WITH")
+
+
+def normalize_sql(query: str) -> str:
+    """리터럴과 공백을 정규화한 SQL (지문 계산용)"""
+    query = _STRING_LITERAL.sub("?", query)
+    query = _NUMBER_LITERAL.sub("?", query)
+    return _WHITESPACE.sub(" ", query).strip()
+
+
+def statement_name(query: str) -> str:
+    """문장 이름 (예: INSERT tb_ai_ess_charge_amt, SELECT tb_solar_day)"""
+    match = _UPDATE_TABLE.match(query) or _STATEMENT_TABLE.match(query)
+    if match:
+        return f"{match.group(1).upper()} {match.group(2)}"
+    return query.split(None, 1)[0].upper() if query.strip() else ""
+
+
+def _digest(value: str) -> str:
+    return hashlib.sha1(value.encode("utf-8", "surrogateescape")).hexdigest()[:12]
+
+
+class SlowQueryLog:
+    """느린 쿼리 링 버퍼와 지문별 EXPLAIN 저장소 (DB 스레드에서 기록하므로 락으로 보호)"""
+
+    def __init__(self):
+        self.threshold = settings.SLOW_QUERY_THRESHOLD_SECONDS
+        self.explain_enabled = settings.SLOW_QUERY_EXPLAIN
+        self.max_fingerprints = settings.SLOW_QUERY_MAX_FINGERPRINTS
+        self.entries: deque = deque(maxlen=max(1, settings.SLOW_QUERY_BUFFER_SIZE))
+        self.fingerprints: Dict[str, Dict[str, Any]] = {}
+        self.recorded = 0
+        self._lock = threading.Lock()
+
+    def record(self, cursor, query: str, args: Any, elapsed: float,
+               rows: Optional[int], batch: Optional[int], error: Optional[Exception]):
+        """
+        임계값을 넘긴 문장 기록 (해당 지문의 첫 발생이면 EXPLAIN 수집)
+
+        Args:
+            cursor: 문장을 실행한 커서 (EXPLAIN 은 같은 연결에서 실행)
+            query: 파라미터 치환 전 SQL
+            args: 파라미터 (executemany 는 첫 행)
+            elapsed: 실행 시간 (초)
+            rows: 영향받은/조회된 행 수
+            batch: executemany 행 수 (execute 는 None)
+            error: 실행 중 발생한 예외
+        """
+        normalized = normalize_sql(query)
+        fingerprint = _digest(normalized)
+        connection = cursor.connection
+        entry = {
+            "at": datetime.now().isoformat(timespec="milliseconds"),
+            "name": statement_name(query),
+            "service": getattr(connection, "_service", None),
+            "fingerprint": fingerprint,
+            "params_fingerprint": _digest(repr(args)) if args is not None else None,
+            "duration_ms": round(elapsed * 1000, 1),
+            "rows": rows,
+            "batch": batch,
+            "error": str(error) if error else None,
+        }
+
+        with self._lock:
+            self.recorded += 1
+            self.entries.append(entry)
+            summary = self.fingerprints.get(fingerprint)
+            first = summary is None and len(self.fingerprints) < self.max_fingerprints
+            if first:
+                summary = {
+                    "name": entry["name"],
+                    "sql": normalized,
+                    "count": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                    "first_seen": entry["at"],
+                    "explain": None,
+                }
+                self.fingerprints[fingerprint] = summary
+            if summary is not None:
+                summary["count"] += 1
+                summary["total_ms"] = round(summary["total_ms"] + entry["duration_ms"], 1)
+                summary["max_ms"] = max(summary["max_ms"], entry["duration_ms"])
+                summary["last_seen"] = entry["at"]
+
+        logger.warning(f"🐢 [SlowQuery] {entry['name']} ({entry['service']}) {entry['duration_ms']}ms, "
+                       f"rows={rows}, fingerprint={fingerprint}")
+
+        # 실패한 문장은 연결 상태를 알 수 없으므로 EXPLAIN 하지 않음
+        if first and self.explain_enabled and error is None:
+            summary["explain"] = self._explain(connection, query, args)
+
+    @staticmethod
+    def _explain(connection, query: str, args: Any) -> Dict[str, Any]:
+        if not query.lstrip().upper().startswith(_EXPLAINABLE):
+            return {"error": "EXPLAIN 대상 문장이 아닙니다"}
+        # 기록 대상이 되지 않도록 기본 커서 사용
+        cursor = connection.cursor(pymysql.cursors.Cursor)
+        try:
+            cursor.execute(f"EXPLAIN {query}", args)
+            columns = [column[0] for column in cursor.description]
+            return {"rows": [dict(zip(columns, row)) for row in cursor.fetchall()]}
+        except Exception as e:
+            return {"error": str(e)}
+        finally:
+            cursor.close()
+
+    def get_stats(self, limit: int = 50) -> Dict[str, Any]:
+        """최근 느린 쿼리(최신순)와 지문별 집계/EXPLAIN 조회"""
+        with self._lock:
+            entries = list(self.entries)[-limit:][::-1] if limit > 0 else []
+            fingerprints = sorted(
+                ({"fingerprint": key, **value} for key, value in self.fingerprints.items()),
+                key=lambda item: item["total_ms"], reverse=True
+            )
+            return {
+                "threshold_seconds": self.threshold,
+                "buffer_size": self.entries.maxlen,
+                "recorded": self.recorded,
+                "entries": entries,
+                "fingerprints": fingerprints,
+            }
+
+    def clear(self):
+        """기록 초기화 (지문별 EXPLAIN 포함)"""
+        with self._lock:
+            self.entries.clear()
+            self.fingerprints.clear()
+            self.recorded = 0
+
+# 전역 느린 쿼리 기록
+slow_query_log = SlowQueryLog()
+
+
+class TimedCursor(pymysql.cursors.Cursor):
+    """실행 시간을 측정하여 임계값을 넘긴 문장을 slow_query_log 에 기록하는 커서"""
+
+    _timing = False
+
+    def execute(self, query, args=None):
+        # executemany 내부의 다중 행 INSERT 실행은 executemany 단위로 한 번만 기록
+        if self._timing or not slow_query_log.threshold:
+            return super().execute(query, args)
+        return self._timed(super().execute, query, args, args, None)
+
+    def executemany(self, query, args):
+        if self._timing or not slow_query_log.threshold or not args:
+            return super().executemany(query, args)
+        return self._timed(super().executemany, query, args, args[0], len(args))
+
+    def _timed(self, func, query, args, sample_args, batch):
+        self._timing = True
+        error = None
+        started = time.perf_counter()
+        try:
+            return func(query, args)
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            self._timing = False
+            if elapsed >= slow_query_log.threshold:
+                try:
+                    slow_query_log.record(self, query, sample_args, elapsed,
+                                          None if error else self.rowcount, batch, error)
+                except Exception as e:
+                    logger.error(f"느린 쿼리 기록 실패: {str(e)}")
@@ -0,0 +1,130 @@
+"""
+대상 테이블별 쓰기 스케줄러
+동일한 tb_ai_* 테이블에 대한 INSERT ... ON DUPLICATE KEY UPDATE 를 직렬화하고
+(대기 중인 쓰기는 레인 우선순위대로 - 백필 쓰기가 줄을 서 있어도 API 집계 쓰기가 먼저 배정됨)
+데드락(1213) / 락 대기 타임아웃(1205) 발생 시 지터 백오프로 자동 재시도
+"""
+import asyncio
+import logging
+import random
+from collections import defaultdict
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+import pymysql
+
+from app.core.config import settings
+from app.core.priority_lanes import LANES, LaneScheduler, current_lane
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# 재시도 대상 MariaDB 오류 코드
+ER_LOCK_DEADLOCK = 1213
+ER_LOCK_WAIT_TIMEOUT = 1205
+RETRYABLE_ERROR_CODES = (ER_LOCK_DEADLOCK, ER_LOCK_WAIT_TIMEOUT)
+
+
+def get_retryable_error_code(error: Exception) -> int:
+    """재시도 가능한 락 충돌 오류이면 오류 코드를, 아니면 0을 반환"""
+    if isinstance(error, (pymysql.err.OperationalError, pymysql.err.InternalError)):
+        code = error.args[0] if error.args else 0
+        if code in RETRYABLE_ERROR_CODES:
+            return code
+    return 0
+
+
+class WriteScheduler:
+    """대상 테이블별 쓰기 직렬화 및 데드락 재시도 관리 클래스"""
+
+    def __init__(self, db_manager):
+        """
+        Args:
+            db_manager: DatabaseManager 인스턴스
+        """
+        self.db = db_manager
+        self.concurrency = max(1, settings.WRITE_CONCURRENCY_PER_TABLE)
+        self.max_attempts = max(1, settings.WRITE_RETRY_MAX_ATTEMPTS)
+        self.base_delay = settings.WRITE_RETRY_BASE_DELAY
+        self.max_delay = settings.WRITE_RETRY_MAX_DELAY
+        self._slots: Dict[str, LaneScheduler] = {}
+        self._stats: Dict[str, Dict[str, int]] = defaultdict(lambda: {
+            "writes": 0,
+            "retries": 0,
+            "deadlocks": 0,
+            "lock_wait_timeouts": 0,
+            "failures": 0,
+            "waiting": 0,
+        })
+
+    def _get_slots(self, target_table: str) -> LaneScheduler:
+        slots = self._slots.get(target_table)
+        if slots is None:
+            # 레인별 상한 없이 테이블 동시 쓰기 수만 제한하고, 빈 슬롯은 우선순위 레인부터 배정
+            slots = LaneScheduler(self.concurrency, caps={lane: self.concurrency for lane in LANES}, reserved=0)
+            self._slots[target_table] = slots
+        return slots
+
+    def _backoff_delay(self, attempt: int) -> float:
+        """지수 백오프 + full jitter"""
+        ceiling = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return random.uniform(0, ceiling)
+
+    async def run(self, target_table: str, func: Callable[[Any], T], service: Optional[str] = None) -> T:
+        """
+        target_table 에 대한 쓰기 작업을 스케줄링하여 실행
+
+        Args:
+            target_table: 쓰기 대상 테이블명 (직렬화 키)
+            func: connection 을 인자로 받아 쓰기 및 commit 을 수행하는 동기 함수
+            service: 서비스 이름 (문장 실행 시간 상한 적용)
+
+        Returns:
+            func 의 반환값
+        """
+        stats = self._stats[target_table]
+        slots = self._get_slots(target_table)
+        lane = current_lane.get()
+
+        stats["waiting"] += 1
+        try:
+            await slots.acquire(lane)
+        finally:
+            stats["waiting"] -= 1
+
+        try:
+            async with self.db.get_async_connection(service) as connection:
+                attempt = 1
+                while True:
+                    try:
+                        result = await self.db.run_in_executor(func, connection)
+                        stats["writes"] += 1
+                        return result
+                    except Exception as e:
+                        code = get_retryable_error_code(e)
+                        if not code or attempt >= self.max_attempts:
+                            stats["failures"] += 1
+                            raise
+
+                        try:
+                            await self.db.run_in_executor(connection.rollback)
+                        except Exception:
+                            pass
+
+                        if code == ER_LOCK_DEADLOCK:
+                            stats["deadlocks"] += 1
+                        else:
+                            stats["lock_wait_timeouts"] += 1
+                        stats["retries"] += 1
+
+                        delay = self._backoff_delay(attempt)
+                        logger.warning(f"⚠️ [{target_table}] 락 충돌({code}) - {delay:.3f}초 후 재시도 "
+                                       f"({attempt}/{self.max_attempts - 1})")
+                        await asyncio.sleep(delay)
+                        attempt += 1
+        finally:
+            slots.release(lane)
+
+    def get_stats(self) -> Dict[str, Dict[str, int]]:
+        """테이블별 쓰기/재시도 카운터 조회"""
+        return {table: dict(stats) for table, stats in self._stats.items()}
@@ -1,11 +1,32 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from contextlib import asynccontextmanager
 import logging
 
 from app.core.config import settings
-from app.core.database import init_db
+from app.core.circuit_breaker import CircuitOpenError
+from app.core.database import db_manager, init_db
+from app.core.disconnect import CancelOnDisconnectMiddleware
+from app.core.profiling import ProfilingMiddleware
+from app.core.serialization import FastJSONResponse
 from app.api.aggregate_endpoints import router as aggregate_router
+from app.api.metrics_endpoints import router as metrics_router
+from app.api.feature_endpoints import router as feature_router
+from app.api.ingest_endpoints import router as ingest_router
+from app.api.live_endpoints import router as live_router
+from app.api.backfill_endpoints import router as backfill_router
+from app.api.partition_endpoints import router as partition_router
+from app.api.coverage_endpoints import router as coverage_router
+from app.api.feature_store_endpoints import router as feature_store_router
+from app.api.run_history_endpoints import router as run_history_router
+from app.api.ess_whatif_endpoints import router as ess_whatif_router
+from app.services.ingest_service import get_ingest_service_instance
+from app.services.live_aggregate_service import get_live_aggregate_service_instance
+from app.services.backfill_service import get_backfill_service_instance
+from app.services.partition_service import get_partition_service_instance
+from app.services.feature_store import get_feature_store_instance
+from app.services.run_history_service import get_run_history_service_instance
 
 # 로깅 설정
 logging.basicConfig(
@@ -26,9 +47,39 @@ async def lifespan(app: FastAPI):
         logger.error(f"❌ 데이터베이스 초기화 실패: {str(e)}")
         raise
 
+    # 집계 실행 이력 기록 (다른 백그라운드 작업의 실행도 기록하도록 먼저 시작하고 마지막에 종료)
+    run_history_service = get_run_history_service_instance()
+    if settings.RUN_HISTORY_ENABLED:
+        await run_history_service.start()
+
+    ingest_service = get_ingest_service_instance()
+    await ingest_service.start()
+
+    live_service = get_live_aggregate_service_instance()
+    if settings.LIVE_AGGREGATES_ENABLED:
+        await live_service.start()
+
+    backfill_service = get_backfill_service_instance()
+    if settings.BACKFILL_WORKER_ENABLED:
+        await backfill_service.start()
+
+    partition_service = get_partition_service_instance()
+    if settings.PARTITION_MAINTENANCE_ENABLED:
+        await partition_service.start()
+
+    feature_store = get_feature_store_instance()
+    if settings.FEATURE_STORE_ENABLED:
+        await feature_store.start()
+
     yield
 
     # 종료 이벤트
+    await feature_store.stop()
+    await partition_service.stop()
+    await backfill_service.stop()
+    await live_service.stop()
+    await ingest_service.stop()
+    await run_history_service.stop()
     logger.info("👋 애플리케이션 종료")
 
 # FastAPI 앱 생성
@@ -36,7 +87,8 @@ app = FastAPI(
     title=settings.API_TITLE,
     version=settings.API_VERSION,
     description=settings.API_DESCRIPTION,
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse
 )
 
 # CORS 설정
@@ -48,8 +100,29 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 응답 압축 설정 (대용량 조회 응답)
+app.add_middleware(GZipMiddleware, minimum_size=settings.GZIP_MINIMUM_SIZE)
+
+# 요청 단위 CPU 프로파일링 (비활성 시 미들웨어를 등록하지 않음)
+if settings.PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware)
+
+# 클라이언트 연결 종료 시 요청 취소 (가장 바깥쪽 미들웨어, 실행 중인 쿼리는 KILL QUERY)
+if settings.CANCEL_ON_DISCONNECT:
+    app.add_middleware(CancelOnDisconnectMiddleware)
+
 # 라우터 등록
 app.include_router(aggregate_router, prefix="/api/v1")  # 통합 엔드포인트
+app.include_router(metrics_router, prefix="/api/v1")  # 운영 지표
+app.include_router(feature_router, prefix="/api/v1")  # 피처 조회
+app.include_router(ingest_router, prefix="/api/v1")  # 원천 데이터 적재
+app.include_router(live_router, prefix="/api/v1")  # 당일 실시간 집계
+app.include_router(backfill_router, prefix="/api/v1")  # 분산 백필
+app.include_router(partition_router, prefix="/api/v1")  # 파티션 관리
+app.include_router(coverage_router, prefix="/api/v1")  # 적재 현황
+app.include_router(feature_store_router, prefix="/api/v1")  # 로컬 피처 스냅샷
+app.include_router(run_history_router, prefix="/api/v1")  # 집계 실행 이력
+app.include_router(ess_whatif_router, prefix="/api/v1")  # ESS 예측 규칙 what-if
 
 @app.get("/")
 async def root():
@@ -60,18 +133,48 @@ async def root():
         "description": "태양광, 전력 사용량, ESS 예측 데이터 통합 집계 API",
         "docs_url": "/docs",
         "endpoints": {
-            "aggregate_all": "/api/v1/aggregate/all - Solar Power, Power Usage, ESS Predict 통합 집계"
+            "aggregate_all": "/api/v1/aggregate/all - Solar Power, Power Usage, ESS Predict 통합 집계",
+            "aggregate_range": "/api/v1/aggregate/range - 날짜 범위 통합 집계 (소스 테이블별 1회 스캔)",
+            "features": "/api/v1/features?start=&end=[&max_points=&method=&y=] - AI 테이블 조인 피처 행렬 조회 (장기 범위 다운샘플링)",
+            "feature_store": "/api/v1/feature-store - 피처 행렬의 컬럼별 메모리 매핑 스냅샷 파일/오프셋",
+            "ingest": "/api/v1/ingest/{source} - 원천 측정값 배치 적재 (solar_day, weather_info, smarteye_day)",
+            "live_today": "/api/v1/live/today - 오늘 날짜 실시간 누적 집계 (메모리)",
+            "backfill_jobs": "/api/v1/backfill/jobs - 날짜 청크 단위 분산 백필 작업 등록/조회",
+            "partitions": "/api/v1/partitions - 월 단위 파티션 상태/사전 생성/프루닝(EXPLAIN) 보고",
+            "coverage": "/api/v1/coverage?start=&end= - 날짜별 소스 유무와 대상 누락/지연 현황 (재적재 등록: /coverage/enqueue)",
+            "run_history": "/api/v1/run-history/stats?hours=&bucket_hours= - 서비스별 집계 소요 시간 백분위수와 추세",
+            "ess_what_if": "/api/v1/ess-predict/what-if - ESS 용량 격자별 예측 규칙 평가 (적재 없음)",
+            "write_scheduler_metrics": "/api/v1/metrics/write-scheduler - 테이블별 쓰기/재시도 카운터",
+            "db_breaker_metrics": "/api/v1/metrics/db-breaker - DB 회로 차단기 상태 (closed / open / half_open)",
+            "admission_metrics": "/api/v1/metrics/admission - 엔드포인트 그룹별 실행/대기/거절 수",
+            "slow_queries": "/api/v1/metrics/slow-queries - 임계값 초과 문장 기록과 지문별 EXPLAIN"
         }
     }
 
 @app.get("/health")
 async def health_check():
-    """헬스 체크 엔드포인트"""
+    """헬스 체크 엔드포인트 (DB 회로 차단기가 열려 있으면 degraded)"""
+    breaker = db_manager.breaker.get_state()
     return {
-        "status": "healthy",
-        "message": "TB AI Data Aggregation API is running"
+        "status": "healthy" if breaker["state"] == "closed" else "degraded",
+        "message": "TB AI Data Aggregation API is running",
+        "database": {
+            "circuit": breaker["state"],
+            "consecutive_failures": breaker["consecutive_failures"],
+            "retry_after": breaker["retry_after"],
+            "last_error": breaker["last_error"],
+        }
     }
 
+@app.exception_handler(CircuitOpenError)
+async def circuit_open_handler(request: Request, exc: CircuitOpenError):
+    """처리되지 않은 회로 차단 거절은 503 + Retry-After 로 응답"""
+    return FastJSONResponse(
+        status_code=503,
+        content={"detail": f"{exc}. 잠시 후 다시 시도하세요"},
+        headers={"Retry-After": str(exc.retry_after)}
+    )
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8080)
@@ -1,6 +1,6 @@
 from pydantic import BaseModel, Field
 from datetime import datetime
-from typing import Optional
+from typing import Any, Dict, List, Optional
 
 # ============================================================
 # 공통 스키마
@@ -10,6 +10,11 @@ class AggregationRequest(BaseModel):
     """데이터 집계 요청 스키마"""
     target_date: str = Field(..., description="대상 날짜 (YYYY-MM-DD)", example="2024-01-15")
 
+class AggregationRangeRequest(BaseModel):
+    """날짜 범위 데이터 집계 요청 스키마"""
+    start_date: str = Field(..., description="시작 날짜 (YYYY-MM-DD)", example="2025-01-01")
+    end_date: str = Field(..., description="종료 날짜 (YYYY-MM-DD, 포함)", example="2025-01-31")
+
 class AggregationResponse(BaseModel):
     """데이터 집계 응답 스키마"""
     success: bool = Field(..., description="성공 여부")
@@ -18,6 +23,28 @@ class AggregationResponse(BaseModel):
     message: str = Field(..., description="응답 메시지")
     source_count: Optional[int] = Field(None, description="소스 데이터 건수 (있는 경우)")
 
+class BackfillJobRequest(BaseModel):
+    """분산 백필 작업 등록 요청 스키마"""
+    start_date: str = Field(..., description="시작 날짜 (YYYY-MM-DD)", example="2022-01-01")
+    end_date: str = Field(..., description="종료 날짜 (YYYY-MM-DD, 포함)", example="2024-12-31")
+    chunk_days: Optional[int] = Field(None, ge=1, description="청크 일수 (미지정 시 BACKFILL_CHUNK_DAYS)")
+    job_id: Optional[str] = Field(None, max_length=32, pattern=r"^[A-Za-z0-9_-]+$",
+                                  description="작업 ID (기존 작업 재등록 시 지정, 미지정 시 자동 생성)")
+
+# ============================================================
+# 원천 데이터 적재 스키마
+# ============================================================
+
+class IngestRequest(BaseModel):
+    """원천 측정값 배치 적재 요청 스키마"""
+    readings: List[Dict[str, Any]] = Field(..., min_length=1, description="측정값 리스트 (컬럼명 → 값)")
+
+class IngestResponse(BaseModel):
+    """원천 측정값 배치 적재 응답 스키마"""
+    source: str = Field(..., description="소스 이름")
+    accepted: int = Field(..., description="이번 요청에서 버퍼에 추가된 건수")
+    buffered: int = Field(..., description="현재 버퍼에 대기 중인 건수")
+
 # ============================================================
 # Solar Power 스키마
 # ============================================================
@@ -85,3 +112,17 @@ class AIPowerUsageResponse(AIPowerUsageBase):
 
     class Config:
         from_attributes = True
+
+# ============================================================
+# ESS Predict what-if 스키마
+# ============================================================
+
+class ESSWhatIfRequest(BaseModel):
+    """ESS 예측 규칙 what-if 평가 요청 스키마"""
+    start_date: str = Field(..., description="시작 날짜 (YYYY-MM-DD)", example="2024-01-01")
+    end_date: str = Field(..., description="종료 날짜 (YYYY-MM-DD, 포함)", example="2024-12-31")
+    capacities: List[float] = Field(..., min_length=1, description="평가할 ESS 용량 목록",
+                                    example=[2000, 3120, 4000])
+    solar_scales: List[float] = Field([1.0], min_length=1,
+                                      description="태양광 예측 SUM 보정 배율 목록 (1.0 이 현재 규칙)")
+    include_series: bool = Field(True, description="시나리오별 일별 예측값 포함 여부")
@@ -1,8 +1,71 @@
 # Services modules
-from app.services.solar_power_service import SolarPowerService, get_solar_power_service
-from app.services.power_usage_service import PowerUsageService, get_power_usage_service
-from app.services.ess_predict_service import ESSPredictService, get_ess_predict_service
-from app.services.ess_charge_service import ESSChargeService, get_ess_charge_service
+# 서비스 모듈은 처음 접근할 때 import (CLI 처럼 서비스 하나만 쓰는 경우 나머지 모듈과 fastapi 로드를 피함)
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from app.services.solar_power_service import SolarPowerService, get_solar_power_service
+    from app.services.power_usage_service import PowerUsageService, get_power_usage_service
+    from app.services.ess_predict_service import ESSPredictService, get_ess_predict_service
+    from app.services.ess_charge_service import ESSChargeService, get_ess_charge_service
+    from app.services.feature_service import FeatureService, get_feature_service
+    from app.services.aggregation_planner import AggregationPlanner, get_aggregation_planner
+    from app.services.ingest_service import IngestService, get_ingest_service
+    from app.services.live_aggregate_service import LiveAggregateService, get_live_aggregate_service
+    from app.services.pipeline_service import AggregationPipeline, get_aggregation_pipeline
+    from app.services.backfill_service import BackfillService, get_backfill_service
+    from app.services.partition_service import PartitionService, get_partition_service
+    from app.services.coverage_service import CoverageService, get_coverage_service
+    from app.services.feature_store import FeatureStore, FeatureStoreReader, get_feature_store
+    from app.services.scan_backends import MariaDBScanBackend, SQLiteScanBackend, get_scan_backend
+    from app.services.run_history_service import RunHistoryService, get_run_history_service
+    from app.services.ess_whatif_service import ESSWhatIfService, get_ess_whatif_service
+
+_EXPORTS = {
+    'SolarPowerService': 'solar_power_service',
+    'get_solar_power_service': 'solar_power_service',
+    'PowerUsageService': 'power_usage_service',
+    'get_power_usage_service': 'power_usage_service',
+    'ESSPredictService': 'ess_predict_service',
+    'get_ess_predict_service': 'ess_predict_service',
+    'ESSChargeService': 'ess_charge_service',
+    'get_ess_charge_service': 'ess_charge_service',
+    'FeatureService': 'feature_service',
+    'get_feature_service': 'feature_service',
+    'AggregationPlanner': 'aggregation_planner',
+    'get_aggregation_planner': 'aggregation_planner',
+    'IngestService': 'ingest_service',
+    'get_ingest_service': 'ingest_service',
+    'LiveAggregateService': 'live_aggregate_service',
+    'get_live_aggregate_service': 'live_aggregate_service',
+    'AggregationPipeline': 'pipeline_service',
+    'get_aggregation_pipeline': 'pipeline_service',
+    'BackfillService': 'backfill_service',
+    'get_backfill_service': 'backfill_service',
+    'PartitionService': 'partition_service',
+    'get_partition_service': 'partition_service',
+    'CoverageService': 'coverage_service',
+    'get_coverage_service': 'coverage_service',
+    'FeatureStore': 'feature_store',
+    'FeatureStoreReader': 'feature_store',
+    'get_feature_store': 'feature_store',
+    'MariaDBScanBackend': 'scan_backends',
+    'SQLiteScanBackend': 'scan_backends',
+    'get_scan_backend': 'scan_backends',
+    'RunHistoryService': 'run_history_service',
+    'get_run_history_service': 'run_history_service',
+    'ESSWhatIfService': 'ess_whatif_service',
+    'get_ess_whatif_service': 'ess_whatif_service',
+}
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f"{__name__}.{module}"), name)
+    globals()[name] = value
+    return value
 
 __all__ = [
     'SolarPowerService',
@@ -13,4 +76,30 @@ __all__ = [
     'get_ess_predict_service',
     'ESSChargeService',
     'get_ess_charge_service',
+    'FeatureService',
+    'get_feature_service',
+    'AggregationPlanner',
+    'get_aggregation_planner',
+    'IngestService',
+    'get_ingest_service',
+    'LiveAggregateService',
+    'get_live_aggregate_service',
+    'AggregationPipeline',
+    'get_aggregation_pipeline',
+    'BackfillService',
+    'get_backfill_service',
+    'PartitionService',
+    'get_partition_service',
+    'CoverageService',
+    'get_coverage_service',
+    'FeatureStore',
+    'FeatureStoreReader',
+    'get_feature_store',
+    'MariaDBScanBackend',
+    'SQLiteScanBackend',
+    'get_scan_backend',
+    'RunHistoryService',
+    'get_run_history_service',
+    'ESSWhatIfService',
+    'get_ess_whatif_service',
 ]
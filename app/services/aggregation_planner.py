@@ -0,0 +1,295 @@
+"""
+공유 스캔 집계 플래너
+aggregation_specs 의 대상 명세로부터 소스 테이블별 단일 융합 스캔(GROUP BY 날짜)을 만들고,
+스캔 결과 하나로 해당 소스를 필요로 하는 모든 대상 테이블을 채움
+"""
+import logging
+import time
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.core.config import settings
+from app.services.aggregation_specs import SOURCE_SPECS, TARGET_SPECS, Measure, SourceSpec, TargetSpec
+from app.services.run_history_service import get_run_history_service_instance
+from app.services.scan_backends import get_scan_backend
+
+logger = logging.getLogger(__name__)
+
+
+class ScanPlan:
+    """소스 테이블 하나에 대한 융합 스캔 (여러 대상의 측정식을 중복 없이 한 번에 계산)"""
+
+    def __init__(self, source: SourceSpec):
+        self.source = source
+        self.measures: List[Measure] = []
+        self.targets: List[str] = []
+
+    def add(self, target: TargetSpec):
+        self.targets.append(target.name)
+        for measure in target.measures.values():
+            if measure.source == self.source.name and measure not in self.measures:
+                self.measures.append(measure)
+
+    def alias(self, measure: Measure) -> str:
+        return f"m{self.measures.index(measure)}"
+
+    def build_query(self, dialect: str = "mysql") -> str:
+        """
+        융합 스캔 쿼리 생성
+
+        Args:
+            dialect: mysql (MariaDB, %s 파라미터) 또는 sqlite (로컬 스냅샷, ? 파라미터)
+        """
+        time_column = self.source.time_column
+        select_measures = ",\n            ".join(
+            f"{measure.expr} AS {self.alias(measure)}" for measure in self.measures
+        )
+        if dialect == "sqlite":
+            upper_bound = "DATE(?, '+1 day')"
+            lower_bound = "?"
+        else:
+            upper_bound = "DATE_ADD(%s, INTERVAL 1 DAY)"
+            lower_bound = "%s"
+        # 인덱스 활용을 위해 DATE() 함수 대신 범위 조건 사용
+        return f"""
+        SELECT
+            DATE({time_column}) AS dt,
+            COUNT(*) AS cnt,
+            {select_measures}
+        FROM {self.source.table}
+        WHERE {time_column} >= {lower_bound} AND {time_column} < {upper_bound}
+        GROUP BY DATE({time_column})
+        """
+
+
+def build_plan(target_names: Iterable[str]) -> Dict[str, ScanPlan]:
+    """
+    대상 목록으로부터 소스 테이블별 스캔 계획 생성
+
+    Args:
+        target_names: TARGET_SPECS 의 키 목록
+
+    Returns:
+        Dict: 소스 이름 → ScanPlan
+    """
+    plans: Dict[str, ScanPlan] = {}
+    for name in target_names:
+        target = TARGET_SPECS[name]
+        for source_name in sorted(target.sources):
+            plan = plans.get(source_name)
+            if plan is None:
+                plan = ScanPlan(SOURCE_SPECS[source_name])
+                plans[source_name] = plan
+            plan.add(target)
+    return plans
+
+
+class AggregationPlanner:
+    """공유 스캔 기반 집계 및 적재 클래스"""
+
+    def __init__(self, db_manager, backend=None):
+        """
+        Args:
+            db_manager: DatabaseManager 인스턴스 (적재용)
+            backend: 소스 스캔 백엔드 (None 이면 SCAN_BACKEND 설정)
+        """
+        self.db = db_manager
+        self.backend = backend or get_scan_backend(db_manager=db_manager)
+        self.batch_size = max(1, settings.PLAN_WRITE_BATCH_SIZE)
+        self.run_history = get_run_history_service_instance()
+
+    def _build_rows(self, target: TargetSpec, plans: Dict[str, ScanPlan],
+                    scanned: Dict[str, Dict[date, Tuple[Any, ...]]]) -> Tuple[List[Tuple[Any, ...]], int]:
+        """스캔 결과로부터 대상 테이블 행 생성"""
+        per_source = [scanned[source_name] for source_name in sorted(target.sources)]
+        if target.require_all_sources:
+            days = set.intersection(*(set(rows) for rows in per_source))
+        else:
+            days = set.union(*(set(rows) for rows in per_source))
+
+        rows = []
+        source_count = 0
+        for day in sorted(days):
+            values = {}
+            for name, measure in target.measures.items():
+                row = scanned[measure.source].get(day)
+                values[name] = row[2 + plans[measure.source].measures.index(measure)] if row else None
+            source_count += sum(scanned[source_name][day][1]
+                                for source_name in target.sources if day in scanned[source_name])
+
+            rows.append(target.build_row(day, values))
+
+        return rows, source_count
+
+    def _upsert_query(self, target: TargetSpec) -> str:
+        columns = [target.key_column] + list(target.columns)
+        placeholders = ", ".join(["%s"] * len(columns))
+        updates = ",\n            ".join(f"{column} = VALUES({column})" for column in target.columns)
+        # executemany 가 다중 행 INSERT 로 묶을 수 있도록 VALUES 형식 사용
+        return f"""
+        INSERT INTO {target.table}
+            ({", ".join(columns)})
+        VALUES ({placeholders})
+        ON DUPLICATE KEY UPDATE
+            {updates}
+        """
+
+    async def _write(self, target: TargetSpec, rows: List[Tuple[Any, ...]],
+                     start_date: Optional[str], end_date: Optional[str] = None) -> int:
+        query = self._upsert_query(target)
+
+        def _execute(connection):
+            cursor = connection.cursor()
+            try:
+                affected_rows = 0
+                for offset in range(0, len(rows), self.batch_size):
+                    cursor.executemany(query, rows[offset:offset + self.batch_size])
+                    affected_rows += cursor.rowcount
+                connection.commit()
+                return affected_rows
+            finally:
+                cursor.close()
+
+        # 대상 테이블별 직렬화 + 데드락/락 대기 시 재시도
+        return await self.db.execute_write(target.table, _execute, start_date, 'planner', end_date)
+
+    async def write_rows(self, target_name: str, rows: List[Tuple[Any, ...]],
+                         target_date: Optional[str] = None) -> int:
+        """
+        이미 계산된 행을 대상 테이블에 다중 행 UPSERT (TargetSpec.build_row 형식)
+
+        Args:
+            target_name: TARGET_SPECS 의 키
+            rows: UPSERT 할 행 리스트
+            target_date: 쓰기 리스너에 전달할 날짜 (YYYY-MM-DD)
+        """
+        if not rows:
+            return 0
+        return await self._write(TARGET_SPECS[target_name], rows, target_date)
+
+    async def run(self, start_date: str, end_date: str,
+                  targets: Optional[List[str]] = None, backend=None,
+                  dry_run: bool = False) -> Dict[str, Dict[str, Any]]:
+        """
+        날짜 범위에 대해 대상 테이블들을 공유 스캔으로 집계 및 적재
+
+        Args:
+            start_date: 시작 날짜 (YYYY-MM-DD)
+            end_date: 종료 날짜 (YYYY-MM-DD, 포함)
+            targets: 대상 이름 목록 (None 이면 TARGET_SPECS 전체)
+            backend: 이번 실행에만 사용할 스캔 백엔드 (None 이면 기본 백엔드)
+            dry_run: True 면 행 계산까지만 수행하고 적재하지 않음 (락도 획득하지 않음)
+
+        Returns:
+            Dict: 대상 이름 → 결과 정보 (success, affected_rows, source_count, target_date, message)
+        """
+        target_names = list(targets) if targets is not None else list(TARGET_SPECS)
+        period = start_date if start_date == end_date else f"{start_date} ~ {end_date}"
+
+        if dry_run:
+            return await self._run_targets(start_date, end_date, target_names, backend, dry_run=True)
+
+        # 다른 워커/노드가 같은 (대상, 날짜)를 집계 중이면 해당 대상은 건너뜀
+        started = time.perf_counter()
+        async with self.db.aggregation_locks(target_names, start_date, end_date) as acquired:
+            results = {
+                name: {
+                    "success": False,
+                    "error_class": "AggregationLockBusy",
+                    "affected_rows": 0,
+                    "target_date": period,
+                    "message": f"{period} 날짜의 {TARGET_SPECS[name].label} 데이터는 다른 프로세스에서 집계 중입니다"
+                }
+                for name in target_names if name not in acquired
+            }
+            for name in results:
+                self.run_history.record(name, start_date, end_date, time.perf_counter() - started, results[name])
+            if acquired:
+                results.update(await self._run_targets(start_date, end_date, acquired, backend))
+
+        return {name: results[name] for name in target_names}
+
+    async def _run_targets(self, start_date: str, end_date: str, target_names: List[str],
+                           backend=None, dry_run: bool = False) -> Dict[str, Dict[str, Any]]:
+        """락을 획득한 대상들에 대해 공유 스캔 및 적재 실행"""
+        period = start_date if start_date == end_date else f"{start_date} ~ {end_date}"
+        backend = backend or self.backend
+
+        plans = build_plan(target_names)
+        logger.info(f"📊 [Planner] {period} 집계 시작 - 대상 {len(target_names)}개, "
+                    f"소스 스캔 {len(plans)}회 ({backend.name})")
+
+        # 실행 이력에는 대상별로 공유 스캔 시간 + 자기 적재 시간을 기록 (dry_run 은 기록하지 않음)
+        def _record(name: str, elapsed: float):
+            if not dry_run:
+                self.run_history.record(name, start_date, end_date, elapsed, results[name])
+
+        scan_started = time.perf_counter()
+        try:
+            scanned = await backend.scan(plans, start_date, end_date)
+        except Exception as e:
+            logger.error(f"❌ [Planner] 소스 스캔 실패: {str(e)}")
+            results = {
+                name: {
+                    "success": False,
+                    "error_class": type(e).__name__,
+                    "affected_rows": 0,
+                    "target_date": period,
+                    "message": f"{TARGET_SPECS[name].label} 소스 스캔 중 오류 발생: {str(e)}"
+                }
+                for name in target_names
+            }
+            for name in target_names:
+                _record(name, time.perf_counter() - scan_started)
+            return results
+        scan_elapsed = time.perf_counter() - scan_started
+
+        results = {}
+        for name in target_names:
+            target = TARGET_SPECS[name]
+            target_started = time.perf_counter()
+            try:
+                rows, source_count = self._build_rows(target, plans, scanned)
+                if dry_run:
+                    results[name] = {
+                        "success": True,
+                        "affected_rows": 0,
+                        "source_count": source_count,
+                        "target_date": period,
+                        "message": f"{period} 날짜의 {target.label} 데이터 계산 완료 ({len(rows)}일, 적재 생략)"
+                    }
+                    continue
+                # 쓰기 리스너(캐시 무효화, 피처 스냅샷 갱신 등)에는 집계 범위를 전달
+                affected_rows = await self._write(target, rows, start_date, end_date) if rows else 0
+                logger.info(f"✅ [{target.label}] {len(rows)}일 적재 (영향받은 행: {affected_rows})")
+                results[name] = {
+                    "success": True,
+                    "affected_rows": affected_rows,
+                    "source_count": source_count,
+                    "target_date": period,
+                    "message": f"{period} 날짜의 {target.label} 데이터 UPSERT 완료 "
+                               f"({len(rows)}일, 영향받은 행: {affected_rows})"
+                }
+            except Exception as e:
+                logger.error(f"❌ [{target.label}] 적재 실패: {str(e)}")
+                results[name] = {
+                    "success": False,
+                    "error_class": type(e).__name__,
+                    "affected_rows": 0,
+                    "target_date": period,
+                    "message": f"{target.label} 데이터 적재 중 오류 발생: {str(e)}"
+                }
+            _record(name, scan_elapsed + time.perf_counter() - target_started)
+
+        return results
+
+# 전역 인스턴스
+_aggregation_planner = None
+
+async def get_aggregation_planner():
+    """Aggregation Planner 의존성 주입"""
+    global _aggregation_planner
+    if _aggregation_planner is None:
+        from app.core.database import db_manager
+        _aggregation_planner = AggregationPlanner(db_manager)
+    return _aggregation_planner
@@ -0,0 +1,181 @@
+"""
+집계 명세 (선언적 정의)
+소스 테이블 / 시간 컬럼 / 측정값 / 대상 테이블을 선언하면
+AggregationPlanner 가 소스 테이블별 단일 스캔으로 모든 대상 테이블을 채움
+
+새로운 tb_ai_* 대상은 TARGET_SPECS 에 항목을 추가하는 것만으로 추가 소스 스캔 없이 집계됨
+(동일 소스의 동일 측정식은 대상 간에 공유)
+"""
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional, Union
+
+from app.core.config import settings
+
+# ESS 용량 (ESSPredictService 의 SQL 과 동일한 값)
+ESS_CAPACITY = 3120
+
+
+@dataclass(frozen=True)
+class SourceSpec:
+    """소스 테이블 명세"""
+    name: str
+    table: str
+    time_column: str
+
+
+@dataclass(frozen=True)
+class Measure:
+    """
+    소스 테이블의 일 단위 집계 측정값
+
+    Attributes:
+        source: 소스 이름 (SOURCE_SPECS 키)
+        agg: 집계 함수 (SUM, MIN, MAX)
+        column: 소스 컬럼
+        positive_only: True 면 0 이하 값을 제외하고 집계
+    """
+    source: str
+    agg: str
+    column: str
+    positive_only: bool = False
+
+    @property
+    def expr(self) -> str:
+        """SQL 집계식"""
+        if self.positive_only:
+            return f"{self.agg}(CASE WHEN {self.column} > 0 THEN {self.column} ELSE NULL END)"
+        return f"{self.agg}({self.column})"
+
+
+@dataclass(frozen=True)
+class TargetSpec:
+    """
+    대상 테이블 명세
+
+    Attributes:
+        name: 대상 이름 (응답 키)
+        label: 로그/메시지용 표시 이름
+        table: 대상 테이블명
+        key_column: UPSERT 키 컬럼
+        key_format: key_measure 가 없을 때 날짜 → 키 변환 포맷 (strftime)
+        measures: 이름 → 측정값
+        columns: 대상 컬럼 → 측정값 이름 또는 측정값 dict 를 받는 계산 함수
+        key_measure: 키 값으로 사용할 측정값 이름 (소스 시각을 그대로 키로 쓰는 경우)
+        require_all_sources: True 면 모든 소스에 데이터가 있는 날짜만 적재 (INNER JOIN)
+    """
+    name: str
+    label: str
+    table: str
+    key_column: str
+    key_format: str
+    measures: Dict[str, Measure]
+    columns: Dict[str, Union[str, Callable[[Dict[str, Any]], Any]]]
+    key_measure: Optional[str] = None
+    require_all_sources: bool = False
+    sources: frozenset = field(init=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, 'sources', frozenset(m.source for m in self.measures.values()))
+
+    def build_row(self, day, values: Dict[str, Any]) -> tuple:
+        """
+        측정값으로부터 대상 테이블 UPSERT 행 생성 (key_column, *columns 순서)
+
+        Args:
+            day: 대상 날짜 (date)
+            values: 측정값 이름 → 값
+        """
+        key = values[self.key_measure] if self.key_measure else day.strftime(self.key_format)
+        row = [key]
+        for mapping in self.columns.values():
+            row.append(mapping(values) if callable(mapping) else values[mapping])
+        return tuple(row)
+
+
+def compute_pwr_ess(solar_forecast_sum, smarteye_forecast, capacity: float = ESS_CAPACITY):
+    """
+    ESS 예측값 계산 (ESSPredictService 의 CASE 식과 동일, NULL 이면 None)
+
+    - SUM(solar) + capacity < smarteye 이면 capacity
+    - 그렇지 않으면 max(0, smarteye - SUM(solar))
+    """
+    if solar_forecast_sum is None or smarteye_forecast is None:
+        return None
+    # SUM 결과(Decimal)와 DOUBLE 컬럼(float) 혼합 연산을 위해 float 로 통일
+    solar_forecast_sum = float(solar_forecast_sum)
+    smarteye_forecast = float(smarteye_forecast)
+    if solar_forecast_sum + capacity < smarteye_forecast:
+        return capacity
+    return max(0, smarteye_forecast - solar_forecast_sum)
+
+
+def _table(key: str, default: str) -> str:
+    return settings.table_names.get(key, default)
+
+
+SOURCE_SPECS: Dict[str, SourceSpec] = {
+    'solar_day': SourceSpec('solar_day', _table('solar_day', 'tb_solar_day'), 'ymdhms'),
+    'weather_info': SourceSpec('weather_info', _table('weather_info', 'tb_weather_info'), 'tm'),
+    'smarteye_day': SourceSpec('smarteye_day', _table('smarteye_day', 'tb_aggregate_smarteye_day'), 'use_time'),
+}
+
+TARGET_SPECS: Dict[str, TargetSpec] = {
+    # SolarPowerService 와 동일한 매핑 (tb_solar_day SUM, tb_weather_info MIN/MAX/SUM)
+    'solar_power': TargetSpec(
+        name='solar_power',
+        label='Solar Power',
+        table=_table('ai_solar_power', 'tb_ai_solar_power'),
+        key_column='ymdhms',
+        key_format='%Y-%m-%d',
+        measures={
+            'tmn': Measure('weather_info', 'MIN', 'tmn', positive_only=True),
+            'tmx': Measure('weather_info', 'MAX', 'tmx'),
+            'ics': Measure('weather_info', 'SUM', 'ics'),
+            'pre_pwr_generation': Measure('solar_day', 'SUM', 'forecast_quantity'),
+            'today_generation': Measure('solar_day', 'SUM', 'today_generation'),
+            'accum_generation': Measure('solar_day', 'SUM', 'accum_generation'),
+        },
+        columns={
+            'tmn': 'tmn',
+            'tmx': 'tmx',
+            'ics': 'ics',
+            'pre_pwr_generation': 'pre_pwr_generation',
+            'today_generation': 'today_generation',
+            'accum_generation': 'accum_generation',
+        },
+    ),
+    # PowerUsageService 와 동일한 매핑 (smarteye_day 는 하루 1건이므로 MAX 로 단일 값 사용)
+    'power_usage': TargetSpec(
+        name='power_usage',
+        label='Power Usage',
+        table=_table('ai_pwr_usage', 'tb_ai_pwr_usage'),
+        key_column='ymdhms',
+        key_format='%Y-%m-%d',
+        measures={
+            'use_time': Measure('smarteye_day', 'MIN', 'use_time'),
+            'pwr_usage': Measure('smarteye_day', 'MAX', 'pwr_kepco_usage_tot'),
+            'pwr_forecase': Measure('smarteye_day', 'MAX', 'forecast_quantity'),
+        },
+        columns={
+            'pwr_usage': 'pwr_usage',
+            'pwr_forecase': 'pwr_forecase',
+        },
+        key_measure='use_time',
+    ),
+    # ESSPredictService 와 동일한 계산 (solar_day SUM 과 smarteye_day 예측값이 모두 있는 날짜만)
+    'ess_predict': TargetSpec(
+        name='ess_predict',
+        label='ESS Predict',
+        table=_table('bms_daily_stat', 'tb_nrt_bms_daily_stat'),
+        key_column='V_TIME',
+        key_format='%Y%m%d',
+        measures={
+            'solar_forecast_sum': Measure('solar_day', 'SUM', 'forecast_quantity'),
+            'smarteye_forecast': Measure('smarteye_day', 'MAX', 'forecast_quantity'),
+        },
+        columns={
+            'forecast_quantity': lambda m: compute_pwr_ess(m['solar_forecast_sum'], m['smarteye_forecast']),
+        },
+        require_all_sources=True,
+    ),
+}
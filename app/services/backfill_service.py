@@ -0,0 +1,531 @@
+"""
+분산 백필 서비스
+다년치 tb_ai_* 재적재 작업을 날짜 청크로 나누어 MariaDB 클레임 테이블에 등록하고,
+여러 노드가 청크를 리스(만료 시각 포함)하여 처리
+
+- 처리 중에는 하트비트로 리스를 연장하고, 노드가 죽으면 리스 만료 후 다른 노드가 다시 리스
+- 완료된 청크는 done 으로 남으므로 재시작 시 이어서 처리 (완료 청크 재처리 없음)
+- 클레임 토큰으로 완료/실패 기록을 펜싱하여, 리스를 잃은 노드가 다른 노드의 상태를 덮어쓰지 않음
+- 노드 안에서는 여러 청크를 동시에 처리하며, 동시 처리 수는 일당 처리 시간과 락 충돌로 자동 조정 (AdaptiveConcurrency)
+  상한의 최댓값은 bulk 레인의 락 연결 예산과 연결 상한을 넘지 않음 (넘는 만큼은 프로세스 안에서 줄만 서므로)
+"""
+import asyncio
+import logging
+import os
+import socket
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.adaptive_concurrency import AdaptiveConcurrency
+from app.core.config import settings
+from app.core.priority_lanes import BULK, current_lane, local_wait
+from app.services.pipeline_service import get_aggregation_pipeline
+
+logger = logging.getLogger(__name__)
+
+
+def split_chunks(start_date: str, end_date: str, chunk_days: int) -> List[Tuple[str, str]]:
+    """start_date ~ end_date (포함) 를 chunk_days 일 단위 (시작, 종료) 목록으로 분할"""
+    current = datetime.strptime(start_date, '%Y-%m-%d')
+    end = datetime.strptime(end_date, '%Y-%m-%d')
+    chunks = []
+    while current <= end:
+        chunk_end = min(current + timedelta(days=chunk_days - 1), end)
+        chunks.append((current.strftime('%Y-%m-%d'), chunk_end.strftime('%Y-%m-%d')))
+        current = chunk_end + timedelta(days=1)
+    return chunks
+
+
+class BackfillService:
+    """분산 백필 청크 등록/리스/처리 클래스"""
+
+    def __init__(self, db_manager):
+        """
+        Args:
+            db_manager: DatabaseManager 인스턴스
+        """
+        self.db = db_manager
+        self.chunk_table = settings.table_names['backfill_chunk']
+        self.lease_seconds = settings.BACKFILL_LEASE_SECONDS
+        self.heartbeat_interval = settings.BACKFILL_HEARTBEAT_SECONDS
+        self.max_attempts = settings.BACKFILL_MAX_ATTEMPTS
+        self.poll_interval = settings.BACKFILL_POLL_INTERVAL_SECONDS
+        self.node_id = f"{socket.gethostname()}:{os.getpid()}"
+
+        self.running: Dict[int, Dict[str, Any]] = {}
+        # 청크마다 락 연결 1개와 풀 연결을 쓰므로 실제 병렬도는 bulk 레인 예산이 상한
+        self.parallel_bound = min(db_manager.lock_budgets[BULK], db_manager.lanes.caps[BULK])
+        self.concurrency = AdaptiveConcurrency("backfill", max_limit=self.parallel_bound)
+        self.local_wait_seconds = 0.0
+        self.stats = {"chunks_done": 0, "chunks_failed": 0, "leases_lost": 0}
+        self._table_ready = False
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    async def _execute(self, func):
+        """연결 하나에서 동기 함수 실행"""
+        async with self.db.get_async_connection('backfill') as connection:
+            return await self.db.run_in_executor(func, connection)
+
+    async def ensure_table(self):
+        """클레임 테이블 생성 (없는 경우)"""
+        if self._table_ready:
+            return
+
+        def _create(connection):
+            cursor = connection.cursor()
+            try:
+                cursor.execute(f"""
+                CREATE TABLE IF NOT EXISTS {self.chunk_table} (
+                    id BIGINT NOT NULL AUTO_INCREMENT PRIMARY KEY,
+                    job_id VARCHAR(32) NOT NULL,
+                    chunk_start DATE NOT NULL,
+                    chunk_end DATE NOT NULL,
+                    status VARCHAR(16) NOT NULL DEFAULT 'pending',
+                    owner VARCHAR(128) NULL,
+                    claim_token CHAR(32) NULL,
+                    lease_expires_at DATETIME NULL,
+                    attempts INT NOT NULL DEFAULT 0,
+                    message TEXT NULL,
+                    created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                    updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+                    UNIQUE KEY uk_job_chunk (job_id, chunk_start),
+                    KEY idx_status_lease (status, lease_expires_at),
+                    KEY idx_claim_token (claim_token)
+                )
+                """)
+                connection.commit()
+            finally:
+                cursor.close()
+
+        await self._execute(_create)
+        self._table_ready = True
+
+    async def create_job(self, start_date: str, end_date: str, chunk_days: Optional[int] = None,
+                         job_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        백필 작업을 날짜 청크로 나누어 등록 (같은 job_id 로 다시 등록하면 기존 청크는 유지)
+
+        Args:
+            start_date: 시작 날짜 (YYYY-MM-DD)
+            end_date: 종료 날짜 (YYYY-MM-DD, 포함)
+            chunk_days: 청크 일수 (None 이면 BACKFILL_CHUNK_DAYS)
+            job_id: 작업 ID (None 이면 새로 생성)
+
+        Returns:
+            Dict: 작업 상태 (get_job 과 동일 형식)
+        """
+        chunks = split_chunks(start_date, end_date, max(1, chunk_days or settings.BACKFILL_CHUNK_DAYS))
+        return await self.create_job_from_chunks(chunks, job_id)
+
+    async def create_job_from_chunks(self, chunks: List[Tuple[str, str]],
+                                     job_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        이미 나눈 (시작, 종료) 청크 목록으로 백필 작업 등록 (연속되지 않은 날짜만 재적재할 때 사용)
+
+        Args:
+            chunks: (시작 날짜, 종료 날짜) 목록 (YYYY-MM-DD, 포함)
+            job_id: 작업 ID (None 이면 새로 생성)
+
+        Returns:
+            Dict: 작업 상태 (get_job 과 동일 형식)
+        """
+        await self.ensure_table()
+        job_id = job_id or uuid.uuid4().hex[:12]
+
+        def _insert(connection):
+            cursor = connection.cursor()
+            try:
+                cursor.executemany(
+                    f"INSERT IGNORE INTO {self.chunk_table} (job_id, chunk_start, chunk_end) VALUES (%s, %s, %s)",
+                    [(job_id, chunk_start, chunk_end) for chunk_start, chunk_end in chunks]
+                )
+                connection.commit()
+                return cursor.rowcount
+            finally:
+                cursor.close()
+
+        inserted = await self._execute(_insert)
+        logger.info(f"🧱 [Backfill] 작업 {job_id} 등록 - {chunks[0][0]} ~ {chunks[-1][1]}, "
+                    f"청크 {len(chunks)}개 (신규 {inserted}개)")
+        self._wakeup.set()
+        return await self.get_job(job_id)
+
+    async def get_job(self, job_id: str) -> Dict[str, Any]:
+        """
+        작업 진행 상태 조회
+
+        Returns:
+            Dict: job_id, 상태별 청크 수, 범위, 처리 중인 청크(리스 보유 노드) 목록
+        """
+        await self.ensure_table()
+
+        def _fetch(connection):
+            cursor = connection.cursor()
+            try:
+                cursor.execute(f"""
+                SELECT status, COUNT(*), MIN(chunk_start), MAX(chunk_end)
+                FROM {self.chunk_table}
+                WHERE job_id = %s
+                GROUP BY status
+                """, [job_id])
+                by_status = cursor.fetchall()
+                cursor.execute(f"""
+                SELECT chunk_start, chunk_end, owner, attempts, lease_expires_at, lease_expires_at < NOW()
+                FROM {self.chunk_table}
+                WHERE job_id = %s AND status = 'running'
+                ORDER BY chunk_start
+                """, [job_id])
+                running = cursor.fetchall()
+                cursor.execute(f"""
+                SELECT chunk_start, chunk_end, attempts, message
+                FROM {self.chunk_table}
+                WHERE job_id = %s AND status = 'failed'
+                ORDER BY chunk_start
+                """, [job_id])
+                failed = cursor.fetchall()
+                return by_status, running, failed
+            finally:
+                cursor.close()
+
+        by_status, running, failed = await self._execute(_fetch)
+        counts = {"pending": 0, "running": 0, "done": 0, "failed": 0}
+        counts.update({status: count for status, count, _, _ in by_status})
+        total = sum(counts.values())
+        return {
+            "job_id": job_id,
+            "start_date": min(row[2] for row in by_status).isoformat() if by_status else None,
+            "end_date": max(row[3] for row in by_status).isoformat() if by_status else None,
+            "total_chunks": total,
+            "chunks": counts,
+            "progress": round(counts["done"] / total, 4) if total else 0.0,
+            "running": [
+                {
+                    "chunk": f"{row[0].isoformat()} ~ {row[1].isoformat()}",
+                    "owner": row[2],
+                    "attempts": row[3],
+                    "lease_expires_at": row[4],
+                    "expired": bool(row[5]),
+                }
+                for row in running
+            ],
+            "failed": [
+                {"chunk": f"{row[0].isoformat()} ~ {row[1].isoformat()}", "attempts": row[2], "message": row[3]}
+                for row in failed
+            ],
+        }
+
+    async def retry_failed(self, job_id: str) -> int:
+        """
+        실패(최대 시도 초과) 청크를 다시 대기 상태로 변경
+
+        Returns:
+            int: 대기 상태로 변경된 청크 수
+        """
+        await self.ensure_table()
+
+        def _update(connection):
+            cursor = connection.cursor()
+            try:
+                cursor.execute(f"""
+                UPDATE {self.chunk_table}
+                SET status = 'pending', attempts = 0, owner = NULL, claim_token = NULL, lease_expires_at = NULL
+                WHERE job_id = %s AND status = 'failed'
+                """, [job_id])
+                connection.commit()
+                return cursor.rowcount
+            finally:
+                cursor.close()
+
+        updated = await self._execute(_update)
+        self._wakeup.set()
+        return updated
+
+    async def claim(self, job_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        대기 중이거나 리스가 만료된 청크 하나를 이 노드로 리스
+
+        UPDATE ... ORDER BY ... LIMIT 1 은 행 잠금 후 조건을 다시 평가하므로
+        여러 노드가 동시에 리스해도 같은 청크를 두 노드가 가져가지 않음
+
+        Returns:
+            Dict: 리스한 청크 (id, job_id, start_date, end_date, attempts, token), 없으면 None
+        """
+        await self.ensure_table()
+        token = uuid.uuid4().hex
+        job_filter = "AND job_id = %s" if job_id else ""
+
+        def _claim(connection):
+            cursor = connection.cursor()
+            try:
+                # 최대 시도 횟수를 넘긴 채 리스가 만료된 청크는 실패 처리 (노드가 반복해서 죽는 청크)
+                cursor.execute(f"""
+                UPDATE {self.chunk_table}
+                SET status = 'failed', owner = NULL, claim_token = NULL, lease_expires_at = NULL,
+                    message = '리스 만료 (최대 시도 횟수 초과)'
+                WHERE status = 'running' AND lease_expires_at < NOW() AND attempts >= %s
+                """, [self.max_attempts])
+                cursor.execute(f"""
+                UPDATE {self.chunk_table}
+                SET status = 'running', owner = %s, claim_token = %s,
+                    lease_expires_at = DATE_ADD(NOW(), INTERVAL %s SECOND), attempts = attempts + 1
+                WHERE (status = 'pending' OR (status = 'running' AND lease_expires_at < NOW()))
+                  AND attempts < %s {job_filter}
+                ORDER BY id
+                LIMIT 1
+                """, [self.node_id, token, self.lease_seconds, self.max_attempts] + ([job_id] if job_id else []))
+                claimed = cursor.rowcount
+                connection.commit()
+                if not claimed:
+                    return None
+                cursor.execute(f"""
+                SELECT id, job_id, chunk_start, chunk_end, attempts
+                FROM {self.chunk_table}
+                WHERE claim_token = %s
+                """, [token])
+                return cursor.fetchone()
+            finally:
+                cursor.close()
+
+        row = await self._execute(_claim)
+        if row is None:
+            return None
+        return {
+            "id": row[0],
+            "job_id": row[1],
+            "start_date": row[2].isoformat(),
+            "end_date": row[3].isoformat(),
+            "attempts": row[4],
+            "token": token,
+        }
+
+    async def _update_claim(self, chunk: Dict[str, Any], assignments: str, params: List[Any]) -> bool:
+        """클레임 토큰이 일치하는 경우에만 청크 갱신 (리스를 잃었으면 False)"""
+        def _update(connection):
+            cursor = connection.cursor()
+            try:
+                cursor.execute(f"""
+                UPDATE {self.chunk_table}
+                SET {assignments}
+                WHERE id = %s AND claim_token = %s AND status = 'running'
+                """, params + [chunk["id"], chunk["token"]])
+                connection.commit()
+                return cursor.rowcount > 0
+            finally:
+                cursor.close()
+
+        return await self._execute(_update)
+
+    async def heartbeat(self, chunk: Dict[str, Any]) -> bool:
+        """리스 만료 시각 연장"""
+        return await self._update_claim(
+            chunk, "lease_expires_at = DATE_ADD(NOW(), INTERVAL %s SECOND)", [self.lease_seconds]
+        )
+
+    async def _heartbeat_loop(self, chunk: Dict[str, Any]):
+        # 하트비트는 청크 처리와 겹쳐 실행되므로 청크의 로컬 대기 시간에 넣지 않음
+        local_wait.set(None)
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            try:
+                if not await self.heartbeat(chunk):
+                    self.stats["leases_lost"] += 1
+                    logger.warning(f"⚠️ [Backfill] {chunk['start_date']} ~ {chunk['end_date']} 리스 상실 "
+                                   f"(다른 노드가 리스했거나 작업이 재설정됨)")
+                    return
+            except Exception as e:
+                logger.error(f"❌ [Backfill] 하트비트 실패: {str(e)}")
+
+    async def process(self, chunk: Dict[str, Any]) -> bool:
+        """
+        리스한 청크 집계 (처리 중 하트비트로 리스 연장)
+
+        Returns:
+            bool: 모든 서비스 집계 성공 여부
+        """
+        pipeline = await get_aggregation_pipeline()
+        period = f"{chunk['start_date']} ~ {chunk['end_date']}"
+        self.running[chunk["id"]] = {"job_id": chunk["job_id"], "chunk": period, "attempts": chunk["attempts"]}
+        heartbeat = asyncio.create_task(self._heartbeat_loop(chunk))
+        try:
+            logger.info(f"🧱 [Backfill] {chunk['job_id']} {period} 처리 시작 (시도 {chunk['attempts']}회)")
+            try:
+                results = await pipeline.run(chunk["start_date"], chunk["end_date"])
+                failed = {name: result["message"] for name, result in results.items() if not result["success"]}
+            except asyncio.CancelledError:
+                # 정상 종료 시에는 리스 만료를 기다리지 않도록 즉시 반납 (시도 횟수 미차감)
+                await self._update_claim(
+                    chunk, "status = 'pending', owner = NULL, lease_expires_at = NULL, attempts = attempts - 1", []
+                )
+                logger.warning(f"⚠️ [Backfill] {chunk['job_id']} {period} 처리 중단 - 청크 반납")
+                raise
+            except Exception as e:
+                failed = {"pipeline": str(e)}
+        finally:
+            heartbeat.cancel()
+            try:
+                await heartbeat
+            except asyncio.CancelledError:
+                pass
+            self.running.pop(chunk["id"], None)
+
+        if not failed:
+            recorded = await self._update_claim(
+                chunk, "status = 'done', lease_expires_at = NULL, message = NULL", []
+            )
+            self.stats["chunks_done"] += 1
+            logger.info(f"✅ [Backfill] {chunk['job_id']} {period} 완료")
+        else:
+            message = "; ".join(f"{name}: {reason}" for name, reason in failed.items())[:2000]
+            recorded = await self._update_claim(
+                chunk,
+                "status = IF(attempts >= %s, 'failed', 'pending'), owner = NULL, "
+                "lease_expires_at = NULL, message = %s",
+                [self.max_attempts, message]
+            )
+            self.stats["chunks_failed"] += 1
+            logger.error(f"❌ [Backfill] {chunk['job_id']} {period} 실패 - {message}")
+
+        if not recorded:
+            logger.warning(f"⚠️ [Backfill] {chunk['job_id']} {period} 결과 미기록 (리스 상실)")
+        return not failed
+
+    def _contention_count(self) -> int:
+        """지금까지의 락 충돌(데드락/락 대기 타임아웃) + 문장 실행 시간 초과 + 회로 차단 대상 실패(연결 오류) 누계"""
+        conflicts = sum(stats["deadlocks"] + stats["lock_wait_timeouts"]
+                        for stats in self.db.write_scheduler.get_stats().values())
+        return conflicts + self.db.pool_stats["statement_timeouts"] + self.db.breaker.stats["failures"]
+
+    async def _process_measured(self, chunk: Dict[str, Any]) -> bool:
+        """
+        청크 처리 후 일당 처리 시간과 처리 중 발생한 락 충돌을 동시 실행 제어기에 반영
+        처리 시간에서 프로세스 안의 슬롯(연결/락 연결/테이블 쓰기) 대기 시간은 빼고 DB 가 일한 시간만 반영
+        (로컬 대기는 동시 처리 수를 늘려도 줄지 않으므로 DB 혼잡 신호가 아님)
+        """
+        epoch = self.concurrency.begin()
+        contention = self._contention_count()
+        # 이 태스크(청크 하나)의 컨텍스트에서만 대기 시간 누계
+        meter = [0.0]
+        local_wait.set(meter)
+        started = time.monotonic()
+        success = await self.process(chunk)
+        elapsed = time.monotonic() - started
+        self.local_wait_seconds += meter[0]
+        days = (datetime.strptime(chunk["end_date"], '%Y-%m-%d')
+                - datetime.strptime(chunk["start_date"], '%Y-%m-%d')).days + 1
+        self.concurrency.on_sample(epoch, days, max(0.0, elapsed - meter[0]),
+                                   congested=self._contention_count() > contention)
+        return success
+
+    async def run_pending(self, job_id: Optional[str] = None) -> int:
+        """
+        리스할 청크가 없을 때까지 처리 (동시에 최대 concurrency.limit 개 청크)
+
+        Returns:
+            int: 처리한 청크 수
+        """
+        processed = 0
+        active = set()
+        exhausted = False
+        try:
+            while True:
+                # 상한이 줄었으면 새 청크를 리스하지 않고 처리 중인 청크가 끝나기를 기다림
+                while not exhausted and len(active) < self.concurrency.limit:
+                    chunk = await self.claim(job_id)
+                    if chunk is None:
+                        exhausted = True
+                        break
+                    active.add(asyncio.create_task(self._process_measured(chunk)))
+
+                if not active:
+                    return processed
+
+                done, active = await asyncio.wait(active, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    processed += 1
+                    try:
+                        task.result()
+                    except Exception as e:
+                        logger.error(f"❌ [Backfill] 청크 처리 오류: {str(e)}")
+                # 다른 노드의 리스가 만료되었거나 재시도로 돌아온 청크가 있을 수 있으므로 다시 확인
+                exhausted = exhausted and bool(active)
+        finally:
+            # 중지(취소) 시 처리 중인 청크는 각자 리스를 반납하고 종료
+            for task in active:
+                task.cancel()
+            if active:
+                await asyncio.gather(*active, return_exceptions=True)
+
+    async def _run(self):
+        # 백필 청크 처리는 bulk 레인 (연결/스레드 예산을 API 요청과 분리)
+        current_lane.set(BULK)
+        while True:
+            try:
+                await self.run_pending()
+            except Exception as e:
+                logger.error(f"❌ [Backfill] 워커 오류: {str(e)}")
+            # 새 작업이 등록되면 바로 깨어나고, 아니면 주기적으로 다른 노드의 만료 리스 확인
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def is_running(self) -> bool:
+        return self._task is not None
+
+    async def start(self):
+        """이 노드의 백필 워커 시작"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+            logger.info(f"🧱 [Backfill] 워커 시작 - 노드 {self.node_id}")
+            if settings.BACKFILL_CONCURRENCY_MAX > self.parallel_bound:
+                logger.warning(f"⚠️ [Backfill] 동시 처리 상한 {settings.BACKFILL_CONCURRENCY_MAX} → {self.parallel_bound} "
+                               f"(bulk 락 연결 {self.db.lock_budgets[BULK]}개 / 연결 상한 {self.db.lanes.caps[BULK]}개)")
+
+    async def stop(self):
+        """이 노드의 백필 워커 중지 (처리 중인 청크는 대기 상태로 반납)"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            logger.info(f"🧱 [Backfill] 워커 중지 - 노드 {self.node_id}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """이 노드의 워커 상태 조회"""
+        return {
+            "node_id": self.node_id,
+            "running": self.is_running(),
+            "current": list(self.running.values()),
+            "concurrency": self.concurrency.get_state(),
+            "parallelism": {
+                "limit": self.concurrency.limit,
+                "bound": self.parallel_bound,
+                "lock_budget": self.db.lock_budgets[BULK],
+                "lane_cap": self.db.lanes.caps[BULK],
+                "effective": min(self.concurrency.limit, self.parallel_bound),
+                "in_flight": len(self.running),
+                "local_wait_seconds": round(self.local_wait_seconds, 3),
+            },
+            **self.stats,
+        }
+
+# 전역 인스턴스
+_backfill_service = None
+
+def get_backfill_service_instance() -> BackfillService:
+    """Backfill Service 전역 인스턴스 (lifespan 에서 시작/종료)"""
+    global _backfill_service
+    if _backfill_service is None:
+        from app.core.database import db_manager
+        _backfill_service = BackfillService(db_manager)
+    return _backfill_service
+
+async def get_backfill_service():
+    """Backfill Service 의존성 주입"""
+    return get_backfill_service_instance()
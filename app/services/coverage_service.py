@@ -0,0 +1,260 @@
+"""
+적재 현황(coverage) 서비스
+날짜 축(달력) 기준으로 소스 테이블별 데이터 유무와 대상 테이블(tb_ai_*, tb_nrt_bms_daily_stat.forecast_quantity)의
+누락 / 지연(소스가 바뀐 뒤 재집계되지 않음) 여부를 조회하고, 해당 날짜만 재적재 작업으로 등록
+
+조회 기간에 관계없이 소스당 융합 스캔 1회 + 대상 테이블당 조회 1회로 처리 (날짜별 반복 쿼리 없음)
+- 지연 판정: 소스/대상 테이블에 갱신 시각 컬럼이 없으므로, 현재 소스로 계산한 값과 적재된 값이 다르면 지연으로 판정
+"""
+import logging
+import math
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.services.aggregation_planner import build_plan
+from app.services.aggregation_specs import SOURCE_SPECS, TARGET_SPECS, TargetSpec
+from app.services.backfill_service import get_backfill_service_instance, split_chunks
+from app.services.ess_charge_service import ESS_CHARGE_UPSTREAM
+from app.services.pipeline_service import PIPELINE_SERVICES, PLANNED_TARGETS
+
+logger = logging.getLogger(__name__)
+
+# 날짜별 대상 상태
+STATUS_OK = "ok"
+STATUS_MISSING = "missing"
+STATUS_STALE = "stale"
+STATUS_NO_SOURCE = "no_source"
+
+
+def _same(expected: Any, actual: Any) -> bool:
+    """적재값 비교 (Decimal / float 혼합 및 DOUBLE 반올림 오차 허용)"""
+    if expected is None or actual is None:
+        return expected is None and actual is None
+    try:
+        return math.isclose(float(expected), float(actual), rel_tol=1e-9, abs_tol=1e-6)
+    except (TypeError, ValueError):
+        return expected == actual
+
+
+def _to_ranges(days: List[date]) -> List[Tuple[str, str]]:
+    """정렬된 날짜 목록을 연속 구간 (시작, 종료) 목록으로 변환"""
+    ranges = []
+    for day in days:
+        if ranges and ranges[-1][1] + timedelta(days=1) == day:
+            ranges[-1][1] = day
+        else:
+            ranges.append([day, day])
+    return [(start.isoformat(), end.isoformat()) for start, end in ranges]
+
+
+class CoverageService:
+    """날짜별 소스/대상 적재 현황 조회 및 재적재 등록 클래스"""
+
+    def __init__(self, db_manager):
+        """
+        Args:
+            db_manager: DatabaseManager 인스턴스
+        """
+        self.db = db_manager
+        self.ess_charge_table = settings.table_names.get('ai_ess_charge_amt', 'tb_ai_ess_charge_amt')
+        self.plans = build_plan(PLANNED_TARGETS)
+
+        # 대상별 조회 컬럼 (대상 컬럼 + ESS Charge 가 가져가는 상위 컬럼)
+        self.read_columns: Dict[str, List[str]] = {}
+        for name in PLANNED_TARGETS:
+            columns = list(TARGET_SPECS[name].columns)
+            # ESS Charge 컬럼 → (상위 대상, 상위 컬럼) 은 ESS Charge 적재 매핑(ESS_CHARGE_SOURCES)에서 도출
+            for upstream, column in ESS_CHARGE_UPSTREAM.values():
+                if upstream == name and column not in columns:
+                    columns.append(column)
+            self.read_columns[name] = columns
+
+    def _target_query(self, target: TargetSpec, columns: List[str]) -> Tuple[str, bool]:
+        """
+        대상 테이블 날짜별 조회 쿼리
+
+        Returns:
+            Tuple: (쿼리, 키가 YYYYMMDD 문자열인지 여부)
+        """
+        select_columns = ", ".join(columns)
+        if target.key_format == '%Y%m%d':
+            return f"""
+            SELECT STR_TO_DATE({target.key_column}, '%%Y%%m%%d') AS dt, {select_columns}
+            FROM {target.table}
+            WHERE {target.key_column} >= %s AND {target.key_column} <= %s
+            """, True
+        return f"""
+        SELECT DATE({target.key_column}) AS dt, {select_columns}
+        FROM {target.table}
+        WHERE {target.key_column} >= %s AND {target.key_column} < DATE_ADD(%s, INTERVAL 1 DAY)
+        """, False
+
+    async def _fetch(self, start_date: str, end_date: str):
+        """소스 융합 스캔과 대상 테이블 조회를 하나의 연결에서 실행"""
+        compact = [start_date.replace('-', ''), end_date.replace('-', '')]
+        target_queries = {
+            name: self._target_query(TARGET_SPECS[name], self.read_columns[name])
+            for name in PLANNED_TARGETS
+        }
+        ess_columns = list(ESS_CHARGE_UPSTREAM)
+        ess_query = f"""
+        SELECT DATE(ymdhms) AS dt, {", ".join(ess_columns)}
+        FROM {self.ess_charge_table}
+        WHERE ymdhms >= %s AND ymdhms < DATE_ADD(%s, INTERVAL 1 DAY)
+        """
+
+        async with self.db.get_async_connection('coverage') as connection:
+            def _run():
+                cursor = connection.cursor()
+                try:
+                    scanned = {}
+                    for source_name, plan in self.plans.items():
+                        cursor.execute(plan.build_query(), [start_date, end_date])
+                        scanned[source_name] = {row[0]: row for row in cursor.fetchall()}
+
+                    actual = {}
+                    for name, (query, compact_key) in target_queries.items():
+                        cursor.execute(query, compact if compact_key else [start_date, end_date])
+                        columns = self.read_columns[name]
+                        actual[name] = {row[0]: dict(zip(columns, row[1:])) for row in cursor.fetchall()}
+
+                    cursor.execute(ess_query, [start_date, end_date])
+                    actual["ess_charge"] = {row[0]: dict(zip(ess_columns, row[1:])) for row in cursor.fetchall()}
+                    return scanned, actual
+                finally:
+                    cursor.close()
+
+            return await self.db.run_in_executor(_run)
+
+    def _expected(self, target: TargetSpec, day: date,
+                  scanned: Dict[str, Dict[date, Tuple[Any, ...]]]) -> Optional[Dict[str, Any]]:
+        """현재 소스로 계산한 대상 컬럼 값 (적재 대상 날짜가 아니면 None)"""
+        present = [day in scanned[source_name] for source_name in target.sources]
+        if not (all(present) if target.require_all_sources else any(present)):
+            return None
+        values = {}
+        for name, measure in target.measures.items():
+            row = scanned[measure.source].get(day)
+            values[name] = row[2 + self.plans[measure.source].measures.index(measure)] if row else None
+        return dict(zip(target.columns, target.build_row(day, values)[1:]))
+
+    @staticmethod
+    def _status(expected: Optional[Dict[str, Any]], actual: Optional[Dict[str, Any]]) -> str:
+        if expected is None:
+            return STATUS_NO_SOURCE
+        if actual is None or all(actual.get(column) is None for column in expected):
+            return STATUS_MISSING
+        if any(not _same(value, actual.get(column)) for column, value in expected.items()):
+            return STATUS_STALE
+        return STATUS_OK
+
+    async def get_coverage(self, start_date: str, end_date: str, only_gaps: bool = False) -> Dict[str, Any]:
+        """
+        날짜별 소스 데이터 유무와 대상 테이블 누락/지연 현황 조회
+
+        Args:
+            start_date: 시작 날짜 (YYYY-MM-DD)
+            end_date: 종료 날짜 (YYYY-MM-DD, 포함)
+            only_gaps: True 면 dates 에 누락/지연 대상이 있는 날짜만 포함
+
+        Returns:
+            Dict: 대상별 상태 요약, 재적재가 필요한 날짜/구간, 날짜별 현황
+        """
+        start = datetime.strptime(start_date, '%Y-%m-%d').date()
+        end = datetime.strptime(end_date, '%Y-%m-%d').date()
+        scanned, actual = await self._fetch(start_date, end_date)
+
+        summary = {name: {STATUS_OK: 0, STATUS_MISSING: 0, STATUS_STALE: 0, STATUS_NO_SOURCE: 0}
+                   for name in PIPELINE_SERVICES}
+        gap_days = []
+        dates = []
+
+        # 달력 (조회 기간의 모든 날짜) 기준으로 병합
+        day = start
+        while day <= end:
+            targets = {}
+            for name in PLANNED_TARGETS:
+                targets[name] = self._status(self._expected(TARGET_SPECS[name], day, scanned),
+                                             actual[name].get(day))
+
+            # ESS Charge 는 상위 대상 테이블에 행이 있는 컬럼만 복사하므로 해당 컬럼만 비교
+            ess_expected = None
+            for column, (upstream, upstream_column) in ESS_CHARGE_UPSTREAM.items():
+                row = actual[upstream].get(day)
+                if row is not None:
+                    ess_expected = ess_expected or {}
+                    ess_expected[column] = row[upstream_column]
+            targets["ess_charge"] = self._status(ess_expected, actual["ess_charge"].get(day))
+            # 상위 대상이 누락/지연이면 ESS Charge 도 재적재 후 바뀌므로 지연으로 표시
+            if targets["ess_charge"] == STATUS_OK and any(
+                    targets[name] in (STATUS_MISSING, STATUS_STALE) for name in PLANNED_TARGETS):
+                targets["ess_charge"] = STATUS_STALE
+
+            for name, status in targets.items():
+                summary[name][status] += 1
+            has_gap = any(status in (STATUS_MISSING, STATUS_STALE) for status in targets.values())
+            if has_gap:
+                gap_days.append(day)
+            if has_gap or not only_gaps:
+                dates.append({
+                    "date": day.isoformat(),
+                    "sources": {name: scanned[name][day][1] if day in scanned[name] else 0
+                                for name in SOURCE_SPECS if name in scanned},
+                    "targets": targets,
+                })
+            day += timedelta(days=1)
+
+        logger.info(f"🗂️ [Coverage] {start_date} ~ {end_date} 조회 - 재적재 필요 {len(gap_days)}일")
+        return {
+            "start_date": start_date,
+            "end_date": end_date,
+            "days": (end - start).days + 1,
+            "summary": summary,
+            "gap_days": len(gap_days),
+            "gap_ranges": [{"start_date": s, "end_date": e} for s, e in _to_ranges(gap_days)],
+            "dates": dates,
+        }
+
+    async def enqueue_gaps(self, start_date: str, end_date: str,
+                           chunk_days: Optional[int] = None) -> Dict[str, Any]:
+        """
+        누락/지연 날짜만 백필 작업으로 등록 (연속 구간별로 청크 분할, 정상 날짜는 재적재하지 않음)
+
+        Args:
+            start_date: 시작 날짜 (YYYY-MM-DD)
+            end_date: 종료 날짜 (YYYY-MM-DD, 포함)
+            chunk_days: 청크 일수 (None 이면 BACKFILL_CHUNK_DAYS)
+
+        Returns:
+            Dict: 재적재 구간과 등록된 백필 작업 상태 (재적재할 날짜가 없으면 job 은 None)
+        """
+        coverage = await self.get_coverage(start_date, end_date, only_gaps=True)
+        chunk_days = max(1, chunk_days or settings.BACKFILL_CHUNK_DAYS)
+        chunks = []
+        for gap in coverage["gap_ranges"]:
+            chunks.extend(split_chunks(gap["start_date"], gap["end_date"], chunk_days))
+
+        job = None
+        if chunks:
+            job = await get_backfill_service_instance().create_job_from_chunks(chunks)
+            logger.info(f"🗂️ [Coverage] 재적재 등록 - {coverage['gap_days']}일, 작업 {job['job_id']}")
+
+        return {
+            "start_date": start_date,
+            "end_date": end_date,
+            "gap_days": coverage["gap_days"],
+            "gap_ranges": coverage["gap_ranges"],
+            "job": job,
+        }
+
+# 전역 인스턴스
+_coverage_service = None
+
+async def get_coverage_service():
+    """Coverage Service 의존성 주입"""
+    global _coverage_service
+    if _coverage_service is None:
+        from app.core.database import db_manager
+        _coverage_service = CoverageService(db_manager)
+    return _coverage_service
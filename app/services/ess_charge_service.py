@@ -2,14 +2,118 @@
 ESS 충전량 데이터 집계 서비스
 여러 테이블에서 데이터를 수집하여 tb_ai_ess_charge_amt 테이블에 적재
 """
-import asyncio
 import logging
-import pymysql.cursors
-from typing import Dict, Any, List
+import math
+from dataclasses import dataclass
+from typing import Dict, Any, List, Sequence, Tuple
 from app.core.config import settings
+from app.core.records import empty_columnar, rows_to_columnar
+from app.services.run_history_service import track_run
 
 logger = logging.getLogger(__name__)
 
+
+@dataclass(frozen=True)
+class ChargeSource:
+    """
+    ESS Charge 적재 단계(소스) 명세
+
+    Attributes:
+        step: 단계 이름 (응답의 steps 키)
+        upstream: 상위 대상 이름 (TARGET_SPECS 키, 적재 현황 비교용)
+        alias: 조인 쿼리의 테이블 별칭
+        key_column: 소스 행 존재 여부를 판단할 컬럼
+        columns: (대상 컬럼, 소스 컬럼) 목록
+    """
+    step: str
+    upstream: str
+    alias: str
+    key_column: str
+    columns: Tuple[Tuple[str, str], ...]
+
+
+# 적재 단계 순서 = 조인 쿼리의 소스 컬럼 순서 (적재 현황 서비스도 이 매핑을 사용)
+ESS_CHARGE_SOURCES: List[ChargeSource] = [
+    ChargeSource("Solar Power", "solar_power", "sp", "ymdhms",
+                 (("pre_pwr_generation", "pre_pwr_generation"), ("today_generation", "today_generation"))),
+    ChargeSource("Power Usage", "power_usage", "pu", "ymdhms",
+                 (("pwr_usage", "pwr_usage"), ("AccruepowGap", "AccruepowGap"))),
+    ChargeSource("BMS Daily Stat", "ess_predict", "bms", "V_TIME",
+                 (("pre_charge", "forecast_quantity"), ("charge_amount", "CHARGE_AMOUNT"))),
+]
+ESS_CHARGE_STEPS: List[Tuple[str, Tuple[str, ...]]] = [
+    (source.step, tuple(column for column, _ in source.columns)) for source in ESS_CHARGE_SOURCES
+]
+ESS_CHARGE_VALUE_COLUMNS = [column for _, columns in ESS_CHARGE_STEPS for column in columns]
+# 대상 컬럼 → (상위 대상, 상위 컬럼)
+ESS_CHARGE_UPSTREAM: Dict[str, Tuple[str, str]] = {
+    column: (source.upstream, source_column)
+    for source in ESS_CHARGE_SOURCES for column, source_column in source.columns
+}
+
+
+def _same(old: Any, new: Any) -> bool:
+    if old is None or new is None:
+        return old is None and new is None
+    try:
+        return old == new or math.isclose(float(old), float(new), rel_tol=1e-9)
+    except (TypeError, ValueError):
+        return False
+
+
+def _changed(old: Sequence[Any], new: Sequence[Any]) -> bool:
+    return any(not _same(a, b) for a, b in zip(old, new))
+
+
+def assemble_rows(records: Sequence[Sequence[Any]]) -> Tuple[List[Tuple[Any, ...]], Dict[str, int]]:
+    """
+    조인 쿼리 결과로 ymdhms 별 완성된 행과 단계별 영향 행 수 계산
+
+    없는 소스의 컬럼은 기존 행 값을 유지하고, 기존 행과 같은 행은 UPSERT 대상에서 제외.
+    단계별 영향 행 수는 단계별로 따로 UPSERT 하던 때의 rowcount 와 같은 기준
+    (신규 삽입 1, 값 변경 2, 변경 없음 0)
+
+    Args:
+        records: (ymdhms, [소스 존재 여부, 소스 컬럼...] x 단계, 기존 행 존재 여부, 기존 컬럼...) 행 목록
+
+    Returns:
+        Tuple: (UPSERT 할 (ymdhms, 컬럼...) 행 목록, 단계 이름 → 영향 행 수)
+    """
+    # 같은 ymdhms 의 소스 행이 여러 개면 나중 행 값 사용 (단계별 UPSERT 와 같은 결과)
+    merged: Dict[Any, Dict[str, Any]] = {}
+    for record in records:
+        entry = merged.setdefault(record[0], {"existing": None, "sources": {}})
+        offset = 1
+        for step, columns in ESS_CHARGE_STEPS:
+            if record[offset]:
+                entry["sources"][step] = tuple(record[offset + 1:offset + 1 + len(columns)])
+            offset += 1 + len(columns)
+        if record[offset]:
+            entry["existing"] = tuple(record[offset + 1:offset + 1 + len(ESS_CHARGE_VALUE_COLUMNS)])
+
+    steps = {step: 0 for step, _ in ESS_CHARGE_STEPS}
+    rows = []
+    for ymdhms, entry in merged.items():
+        existing = entry["existing"]
+        row = list(existing) if existing is not None else [None] * len(ESS_CHARGE_VALUE_COLUMNS)
+        exists = existing is not None
+        offset = 0
+        for step, columns in ESS_CHARGE_STEPS:
+            values = entry["sources"].get(step)
+            if values is not None:
+                if not exists:
+                    steps[step] += 1
+                    exists = True
+                elif _changed(row[offset:offset + len(columns)], values):
+                    steps[step] += 2
+                row[offset:offset + len(columns)] = values
+            offset += len(columns)
+
+        if existing is None or _changed(existing, row):
+            rows.append((ymdhms, *row))
+
+    return rows, steps
+
 class ESSChargeService:
     """ESS 충전량 데이터 집계 및 적재 클래스"""
 
@@ -40,103 +144,138 @@ class ESSChargeService:
         Returns:
             Dict: 결과 정보 (success, inserted_count, target_date, message)
         """
+        return await self.aggregate_range(target_date, target_date)
+
+    async def aggregate_range(self, start_date: str, end_date: str) -> Dict[str, Any]:
+        """
+        날짜 범위(start_date ~ end_date, 포함)의 ESS 충전량 데이터를 한 번에 적재
+
+        Args:
+            start_date: 시작 날짜 (YYYY-MM-DD)
+            end_date: 종료 날짜 (YYYY-MM-DD, 포함)
+
+        Returns:
+            Dict: 결과 정보 (success, affected_rows, steps, target_date, message)
+        """
+        target_date = start_date if start_date == end_date else f"{start_date} ~ {end_date}"
+
+        # 실행 이력(소요 시간/영향받은 행 수) 기록
+        with track_run('ess_charge', start_date, end_date) as run:
+            # 다른 워커/노드가 같은 (서비스, 날짜)를 집계 중이면 중복 UPSERT 없이 건너뜀
+            async with self.db.aggregation_locks(['ess_charge'], start_date, end_date) as acquired:
+                if not acquired:
+                    run.result = {
+                        "success": False,
+                        "error_class": "AggregationLockBusy",
+                        "affected_rows": 0,
+                        "target_date": target_date,
+                        "message": f"{target_date} 날짜의 ESS Charge 데이터는 다른 프로세스에서 집계 중입니다"
+                    }
+                    return run.result
+                run.result = await self._aggregate_range(start_date, end_date)
+                return run.result
+
+    def _build_read_query(self, start_date: str, end_date: str) -> Tuple[str, List[Any]]:
+        """
+        세 소스와 기존 적재 행을 ymdhms 기준으로 한 번에 읽는 조인 쿼리 생성
+
+        일부 소스에만 있는 날짜도 누락되지 않도록 세 소스의 ymdhms 를 UNION 하여 기준 축으로 사용하고,
+        각 소스의 존재 여부를 함께 조회하여 없는 소스의 컬럼은 기존 값을 유지
+
+        Returns:
+            Tuple: (쿼리, 파라미터)
+        """
+        # 인덱스/파티션 프루닝 활용을 위해 DATE() 함수 대신 범위 조건 사용
+        params = [start_date, end_date]
+        bms_params = [start_date.replace('-', ''), end_date.replace('-', '')]
+
+        # 단계별 (존재 여부, 소스 컬럼...) 후 기존 행 (존재 여부, 대상 컬럼...) - assemble_rows 의 입력 순서
+        source_columns = ",\n            ".join(
+            ", ".join([f"{source.alias}.{source.key_column} IS NOT NULL"]
+                      + [f"{source.alias}.{source_column}" for _, source_column in source.columns])
+            for source in ESS_CHARGE_SOURCES
+        )
+        existing_columns = ", ".join(["t.ymdhms IS NOT NULL"] + [f"t.{column}" for column in ESS_CHARGE_VALUE_COLUMNS])
+
+        query = f"""
+        SELECT
+            k.ymdhms,
+            {source_columns},
+            {existing_columns}
+        FROM (
+            SELECT ymdhms FROM {self.ai_solar_power_table}
+            WHERE ymdhms >= %s AND ymdhms < DATE_ADD(%s, INTERVAL 1 DAY)
+            UNION
+            SELECT ymdhms FROM {self.ai_pwr_usage_table}
+            WHERE ymdhms >= %s AND ymdhms < DATE_ADD(%s, INTERVAL 1 DAY)
+            UNION
+            SELECT STR_TO_DATE(V_TIME, '%%Y%%m%%d') FROM {self.bms_daily_stat_table}
+            WHERE V_TIME >= %s AND V_TIME <= %s
+        ) k
+        LEFT JOIN {self.ai_solar_power_table} sp ON sp.ymdhms = k.ymdhms
+        LEFT JOIN {self.ai_pwr_usage_table} pu ON pu.ymdhms = k.ymdhms
+        LEFT JOIN {self.bms_daily_stat_table} bms
+            ON bms.V_TIME = DATE_FORMAT(k.ymdhms, '%%Y%%m%%d') AND TIME(k.ymdhms) = '00:00:00'
+        LEFT JOIN {self.ai_ess_charge_table} t ON t.ymdhms = k.ymdhms
+        ORDER BY k.ymdhms
+        """
+        return query, params + params + bms_params
+
+    def _upsert_query(self) -> str:
+        columns = ["ymdhms"] + ESS_CHARGE_VALUE_COLUMNS
+        placeholders = ", ".join(["%s"] * len(columns))
+        updates = ",\n            ".join(f"{column} = VALUES({column})" for column in ESS_CHARGE_VALUE_COLUMNS)
+        # executemany 가 다중 행 INSERT 로 묶을 수 있도록 VALUES 형식 사용
+        return f"""
+        INSERT INTO {self.ai_ess_charge_table}
+            ({", ".join(columns)})
+        VALUES ({placeholders})
+        ON DUPLICATE KEY UPDATE
+            {updates}
+        """
+
+    async def _aggregate_range(self, start_date: str, end_date: str) -> Dict[str, Any]:
+        """락 획득 후 집계 및 적재 실행"""
+        target_date = start_date if start_date == end_date else f"{start_date} ~ {end_date}"
         logger.info(f"📊 [ESS Charge] 데이터 집계 및 적재 시작 - {target_date}")
 
         try:
             logger.info(f"📅 [ESS Charge] 대상 날짜: {target_date}")
+            read_query, read_params = self._build_read_query(start_date, end_date)
+            upsert_query = self._upsert_query()
+            batch_size = max(1, settings.PLAN_WRITE_BATCH_SIZE)
+
+            def _execute(connection):
+                # 같은 연결/쓰기 슬롯 안에서 읽고 써서 기존 값 비교가 적재 시점과 어긋나지 않도록 함
+                cursor = connection.cursor()
+
+                try:
+                    cursor.execute(read_query, read_params)
+                    rows, steps = assemble_rows(cursor.fetchall())
+                    for step, affected in steps.items():
+                        logger.info(f"  ✅ {step}: {affected}건")
 
-            # 1단계: ai_solar_power 데이터 UPSERT
-            logger.info(f"🔄 [ESS Charge] Step 1: Solar Power 데이터 업데이트")
-            solar_query = f"""
-            INSERT INTO {self.ai_ess_charge_table}
-                (ymdhms, pre_pwr_generation, today_generation)
-            SELECT * FROM (
-                SELECT
-                    sp.ymdhms,
-                    sp.pre_pwr_generation,
-                    sp.today_generation
-                FROM {self.ai_solar_power_table} sp
-                WHERE DATE(sp.ymdhms) = %s
-            ) AS new_data
-            ON DUPLICATE KEY UPDATE
-                pre_pwr_generation = new_data.pre_pwr_generation,
-                today_generation = new_data.today_generation
-            """
-
-            # 2단계: ai_pwr_usage 데이터 UPSERT
-            # pwr_usage, AccruepowGap만 처리 (pre_pwr_generation은 1단계에서 이미 처리됨)
-            logger.info(f"🔄 [ESS Charge] Step 2: Power Usage 데이터 업데이트")
-            usage_query = f"""
-            INSERT INTO {self.ai_ess_charge_table}
-                (ymdhms, pwr_usage, AccruepowGap)
-            SELECT * FROM (
-                SELECT
-                    pu.ymdhms,
-                    pu.pwr_usage,
-                    pu.AccruepowGap
-                FROM {self.ai_pwr_usage_table} pu
-                WHERE DATE(pu.ymdhms) = %s
-            ) AS new_data
-            ON DUPLICATE KEY UPDATE
-                pwr_usage = new_data.pwr_usage,
-                AccruepowGap = new_data.AccruepowGap
-            """
-
-            # 3단계: bms_daily_stat 데이터 UPSERT
-            logger.info(f"🔄 [ESS Charge] Step 3: BMS Daily Stat 데이터 업데이트")
-            bms_query = f"""
-            INSERT INTO {self.ai_ess_charge_table}
-                (ymdhms, pre_charge, charge_amount)
-            SELECT * FROM (
-                SELECT
-                    STR_TO_DATE(bms.V_TIME, '%%Y%%m%%d') as ymdhms,
-                    bms.forecast_quantity as pre_charge,
-                    bms.CHARGE_AMOUNT as charge_amount
-                FROM {self.bms_daily_stat_table} bms
-                WHERE DATE(STR_TO_DATE(bms.V_TIME, '%%Y%%m%%d')) = %s
-            ) AS new_data
-            ON DUPLICATE KEY UPDATE
-                pre_charge = new_data.pre_charge,
-                charge_amount = new_data.charge_amount
-            """
-
-            async with self.db.get_async_connection() as connection:
-                def _execute():
-                    cursor = connection.cursor()
                     total_affected = 0
+                    for offset in range(0, len(rows), batch_size):
+                        cursor.executemany(upsert_query, rows[offset:offset + batch_size])
+                        total_affected += cursor.rowcount
 
-                    try:
-                        # Step 1: Solar Power
-                        cursor.execute(solar_query, [target_date])
-                        solar_affected = cursor.rowcount
-                        logger.info(f"  ✅ Solar Power: {solar_affected}건")
-                        total_affected += solar_affected
-
-                        # Step 2: Power Usage
-                        cursor.execute(usage_query, [target_date])
-                        usage_affected = cursor.rowcount
-                        logger.info(f"  ✅ Power Usage: {usage_affected}건")
-                        total_affected += usage_affected
-
-                        # Step 3: BMS Daily Stat
-                        cursor.execute(bms_query, [target_date])
-                        bms_affected = cursor.rowcount
-                        logger.info(f"  ✅ BMS Daily Stat: {bms_affected}건")
-                        total_affected += bms_affected
-
-                        connection.commit()
-                        logger.info(f"✅ [ESS Charge] 총 영향받은 행 수: {total_affected}건")
-                        return total_affected
-                    finally:
-                        cursor.close()
+                    connection.commit()
+                    logger.info(f"✅ [ESS Charge] 총 영향받은 행 수: {total_affected}건 (UPSERT {len(rows)}행)")
+                    return total_affected, steps
+                finally:
+                    cursor.close()
 
-                affected_rows = await asyncio.get_event_loop().run_in_executor(None, _execute)
+            # 대상 테이블별 직렬화 + 데드락/락 대기 시 재시도
+            affected_rows, steps = await self.db.execute_write(self.ai_ess_charge_table, _execute,
+                                                               start_date, 'ess_charge', end_date)
 
             logger.info(f"✅ [ESS Charge] 데이터 집계 및 적재 완료 (총 영향받은 행: {affected_rows})")
 
             return {
                 "success": True,
                 "affected_rows": affected_rows,
+                "steps": steps,
                 "target_date": target_date,
                 "message": f"{target_date} 날짜의 ESS Charge 데이터 UPSERT 완료 (총 영향받은 행: {affected_rows})"
             }
@@ -145,12 +284,13 @@ class ESSChargeService:
             logger.error(f"❌ [ESS Charge] 데이터 집계 및 적재 실패: {str(e)}")
             return {
                 "success": False,
+                "error_class": type(e).__name__,
                 "affected_rows": 0,
                 "target_date": target_date,
                 "message": f"ESS Charge 데이터 적재 중 오류 발생: {str(e)}"
             }
 
-    async def verify_data(self, limit: int = 10) -> List[Dict[str, Any]]:
+    async def verify_data(self, limit: int = 10) -> Dict[str, Any]:
         """
         적재된 데이터 확인
 
@@ -158,36 +298,36 @@ class ESSChargeService:
             limit: 조회할 레코드 수
 
         Returns:
-            List[Dict]: 적재된 데이터 리스트
+            Dict: columns, rows (columns 순서의 행 행렬), count
         """
         query = f"""
         SELECT
-            ymdhms, pre_pwr_generation, today_generation,
-            pwr_usage, AccruepowGap,
-            pre_charge, charge_amount
-        FROM {self.ai_ess_charge_table}
-        ORDER BY ymdhms DESC
+            DATE_FORMAT(t.ymdhms, '%%Y-%%m-%%d %%H:%%i:%%s') AS ymdhms, t.pre_pwr_generation, t.today_generation,
+            t.pwr_usage, t.AccruepowGap,
+            t.pre_charge, t.charge_amount
+        FROM {self.ai_ess_charge_table} t
+        ORDER BY t.ymdhms DESC
         LIMIT %s
         """
 
         try:
-            async with self.db.get_async_connection() as connection:
+            async with self.db.get_async_connection('verify') as connection:
                 def _fetch():
-                    cursor = connection.cursor(pymysql.cursors.DictCursor)
+                    # 튜플 커서 결과를 행 행렬 그대로 반환 (datetime 포맷은 SQL 에서 처리)
+                    cursor = connection.cursor()
                     try:
                         cursor.execute(query, (limit,))
-                        results = cursor.fetchall()
-                        return results
+                        return rows_to_columnar(cursor.description, cursor.fetchall())
                     finally:
                         cursor.close()
 
-                results = await asyncio.get_event_loop().run_in_executor(None, _fetch)
-                logger.info(f"📊 [ESS Charge] 최근 {len(results)}건의 데이터 조회 완료")
+                results = await self.db.run_in_executor(_fetch)
+                logger.info(f"📊 [ESS Charge] 최근 {results['count']}건의 데이터 조회 완료")
                 return results
 
         except Exception as e:
             logger.error(f"❌ [ESS Charge] 데이터 조회 실패: {str(e)}")
-            return []
+            return empty_columnar()
 
 # 전역 인스턴스
 _ess_charge_service = None
@@ -2,11 +2,12 @@
 ESS 예측 데이터 집계 서비스
 tb_ai_pwr_usage 테이블에 ESS 예측값 적재
 """
-import asyncio
 import logging
 import pymysql.cursors
-from typing import Dict, Any, List
+from typing import Dict, Any
 from app.core.config import settings
+from app.core.records import empty_columnar, rows_to_columnar
+from app.services.run_history_service import track_run
 
 logger = logging.getLogger(__name__)
 
@@ -47,6 +48,24 @@ class ESSPredictService:
         Returns:
             Dict: 결과 정보 (success, inserted_count, target_date, message)
         """
+        # 실행 이력(소요 시간/영향받은 행 수) 기록
+        with track_run('ess_predict', target_date) as run:
+            # 다른 워커/노드가 같은 (서비스, 날짜)를 집계 중이면 중복 UPSERT 없이 건너뜀
+            async with self.db.aggregation_locks(['ess_predict'], target_date) as acquired:
+                if not acquired:
+                    run.result = {
+                        "success": False,
+                        "error_class": "AggregationLockBusy",
+                        "affected_rows": 0,
+                        "target_date": target_date,
+                        "message": f"{target_date} 날짜의 ESS Predict 데이터는 다른 프로세스에서 집계 중입니다"
+                    }
+                    return run.result
+                run.result = await self._aggregate_and_insert(target_date)
+                return run.result
+
+    async def _aggregate_and_insert(self, target_date: str) -> Dict[str, Any]:
+        """락 획득 후 집계 및 적재 실행"""
         logger.info(f"📊 [ESS Predict] 데이터 집계 및 적재 시작 - {target_date}")
 
         try:
@@ -74,7 +93,7 @@ class ESSPredictService:
               AND se.use_time >= %s AND se.use_time <= %s
             """
 
-            async with self.db.get_async_connection() as connection:
+            async with self.db.get_async_connection('ess_predict') as connection:
                 def _select():
                     cursor = connection.cursor(pymysql.cursors.DictCursor)
                     try:
@@ -84,7 +103,7 @@ class ESSPredictService:
                     finally:
                         cursor.close()
 
-                matched_data = await asyncio.get_event_loop().run_in_executor(None, _select)
+                matched_data = await self.db.run_in_executor(_select)
 
             if matched_data and matched_data['match_count'] > 0:
                 logger.info(f"🔍 [ESS Predict] 매칭된 원본 데이터 건수: {matched_data['match_count']}건")
@@ -126,36 +145,36 @@ class ESSPredictService:
 
             params = [v_time_converted, start_datetime, end_datetime, start_datetime, end_datetime]
 
-            async with self.db.get_async_connection() as connection:
-                def _execute():
-                    cursor = connection.cursor()
-                    try:
-                        logger.info(f"🔍 [ESS Predict] 실행 쿼리 파라미터: {params}")
-                        cursor.execute(insert_query, params)
-                        connection.commit()
-                        affected_rows = cursor.rowcount
-                        # ON DUPLICATE KEY UPDATE의 rowcount:
-                        # 1 = 새로운 행 삽입
-                        # 2 = 기존 행 업데이트
-                        # 0 = 업데이트했지만 값 변화 없음
-                        logger.info(f"✅ [ESS Predict] rowcount: {affected_rows} (1=INSERT, 2=UPDATE, 0=변화없음)")
-
-                        # 적재 확인 쿼리
-                        cursor.execute(f"SELECT V_TIME, forecast_quantity FROM {self.ess_day_table} WHERE V_TIME = %s", [v_time_converted])
-                        result = cursor.fetchone()
-                        if result:
-                            logger.info(f"🔍 [ESS Predict] 적재 확인 - V_TIME: {result[0]}, forecast_quantity: {result[1]}")
-                        else:
-                            logger.warning(f"⚠️ [ESS Predict] V_TIME '{v_time_converted}' 행이 테이블에 없습니다")
-
-                        return affected_rows
-                    except Exception as e:
-                        logger.error(f"❌ [ESS Predict] 쿼리 실행 오류: {str(e)}")
-                        raise
-                    finally:
-                        cursor.close()
-
-                affected_rows = await asyncio.get_event_loop().run_in_executor(None, _execute)
+            def _execute(connection):
+                cursor = connection.cursor()
+                try:
+                    logger.info(f"🔍 [ESS Predict] 실행 쿼리 파라미터: {params}")
+                    cursor.execute(insert_query, params)
+                    connection.commit()
+                    affected_rows = cursor.rowcount
+                    # ON DUPLICATE KEY UPDATE의 rowcount:
+                    # 1 = 새로운 행 삽입
+                    # 2 = 기존 행 업데이트
+                    # 0 = 업데이트했지만 값 변화 없음
+                    logger.info(f"✅ [ESS Predict] rowcount: {affected_rows} (1=INSERT, 2=UPDATE, 0=변화없음)")
+
+                    # 적재 확인 쿼리
+                    cursor.execute(f"SELECT V_TIME, forecast_quantity FROM {self.ess_day_table} WHERE V_TIME = %s", [v_time_converted])
+                    result = cursor.fetchone()
+                    if result:
+                        logger.info(f"🔍 [ESS Predict] 적재 확인 - V_TIME: {result[0]}, forecast_quantity: {result[1]}")
+                    else:
+                        logger.warning(f"⚠️ [ESS Predict] V_TIME '{v_time_converted}' 행이 테이블에 없습니다")
+
+                    return affected_rows
+                except Exception as e:
+                    logger.error(f"❌ [ESS Predict] 쿼리 실행 오류: {str(e)}")
+                    raise
+                finally:
+                    cursor.close()
+
+            # 대상 테이블별 직렬화 + 데드락/락 대기 시 재시도
+            affected_rows = await self.db.execute_write(self.ess_day_table, _execute, target_date, 'ess_predict')
 
             # 적재 여부 확인
             if affected_rows == 0 and matched_data and matched_data['match_count'] > 0:
@@ -175,12 +194,13 @@ class ESSPredictService:
             logger.error(f"❌ [ESS Predict] 데이터 집계 및 적재 실패: {str(e)}")
             return {
                 "success": False,
+                "error_class": type(e).__name__,
                 "affected_rows": 0,
                 "target_date": target_date,
                 "message": f"ESS Predict 데이터 적재 중 오류 발생: {str(e)}"
             }
 
-    async def verify_data(self, limit: int = 10) -> List[Dict[str, Any]]:
+    async def verify_data(self, limit: int = 10) -> Dict[str, Any]:
         """
         적재된 데이터 확인
 
@@ -188,7 +208,7 @@ class ESSPredictService:
             limit: 조회할 레코드 수
 
         Returns:
-            List[Dict]: 적재된 데이터 리스트
+            Dict: columns, rows (columns 순서의 행 행렬), count
         """
         query = f"""
         SELECT
@@ -200,23 +220,23 @@ class ESSPredictService:
         """
 
         try:
-            async with self.db.get_async_connection() as connection:
+            async with self.db.get_async_connection('verify') as connection:
                 def _fetch():
-                    cursor = connection.cursor(pymysql.cursors.DictCursor)
+                    # 튜플 커서 결과를 행 행렬 그대로 반환 (datetime 포맷은 SQL 에서 처리)
+                    cursor = connection.cursor()
                     try:
                         cursor.execute(query, (limit,))
-                        results = cursor.fetchall()
-                        return results
+                        return rows_to_columnar(cursor.description, cursor.fetchall())
                     finally:
                         cursor.close()
 
-                results = await asyncio.get_event_loop().run_in_executor(None, _fetch)
-                logger.info(f"📊 [ESS Predict] 최근 {len(results)}건의 데이터 조회 완료")
+                results = await self.db.run_in_executor(_fetch)
+                logger.info(f"📊 [ESS Predict] 최근 {results['count']}건의 데이터 조회 완료")
                 return results
 
         except Exception as e:
             logger.error(f"❌ [ESS Predict] 데이터 조회 실패: {str(e)}")
-            return []
+            return empty_columnar()
 
 # 전역 인스턴스
 _ess_predict_service = None
@@ -0,0 +1,177 @@
+"""
+ESS 예측 규칙 what-if 평가 서비스
+날짜 범위의 일별 태양광 예측 SUM 과 스마트아이 예측값을 한 번만 읽고,
+ESS 용량(과 태양광 예측 보정 배율) 격자 전체에 대해 예측 규칙을 배열 연산으로 평가 (tb_nrt_bms_daily_stat 에 쓰지 않음)
+
+규칙 (ESSPredictService / compute_pwr_ess 와 동일):
+    SUM(solar) + capacity < smarteye 이면 capacity, 아니면 max(0, smarteye - SUM(solar))
+    = min(capacity, max(0, smarteye - SUM(solar)))
+
+따라서 배율별로 부족분 max(0, smarteye - solar * scale) 배열을 한 번 만들어 정렬해 두면
+용량별 합계/포화 일수는 누적합 + 이진 탐색으로 계산되어 용량 격자 크기와 거의 무관
+"""
+import logging
+from array import array
+from bisect import bisect_left
+from itertools import accumulate
+from typing import Any, Dict, List, Optional, Sequence
+
+from app.services.aggregation_planner import build_plan
+from app.services.aggregation_specs import ESS_CAPACITY, TARGET_SPECS
+from app.services.scan_backends import get_scan_backend
+
+logger = logging.getLogger(__name__)
+
+
+def _round(value: float) -> float:
+    return round(value, 3)
+
+
+class DeficitProfile:
+    """태양광 보정 배율 하나에 대한 일별 부족분 배열과 정렬/누적합 (용량별 요약 계산용)"""
+
+    def __init__(self, solar: Sequence[float], smarteye: Sequence[float], scale: float):
+        self.scale = scale
+        self.values = array('d', (max(0.0, e - s * scale) for s, e in zip(solar, smarteye)))
+        self.sorted = sorted(self.values)
+        # prefix[i] = 작은 값부터 i 개의 합
+        self.prefix = [0.0] + list(accumulate(self.sorted))
+        self.zero_days = bisect_left(self.sorted, 1e-12)
+
+    def summary(self, capacity: float) -> Dict[str, Any]:
+        """용량 capacity 의 예측값 요약 (일별 값 = min(capacity, 부족분))"""
+        days = len(self.sorted)
+        if not days:
+            return {"days": 0, "total": 0.0, "mean": None, "max": None, "saturated_days": 0, "zero_days": 0}
+        below = bisect_left(self.sorted, capacity)
+        saturated = days - below
+        total = self.prefix[below] + capacity * saturated
+        return {
+            "days": days,
+            "total": _round(total),
+            "mean": _round(total / days),
+            "max": _round(min(capacity, self.sorted[-1])),
+            # 용량에 걸려 잘린 날 (부족분 >= 용량)
+            "saturated_days": saturated,
+            "zero_days": self.zero_days,
+        }
+
+    def series(self, capacity: float) -> List[float]:
+        return [capacity if value >= capacity else value for value in self.values]
+
+
+def evaluate_grid(solar: Sequence[float], smarteye: Sequence[float], capacities: Sequence[float],
+                  solar_scales: Sequence[float], include_series: bool = True) -> List[Dict[str, Any]]:
+    """
+    용량 x 태양광 보정 배율 격자의 예측 규칙 평가
+
+    Args:
+        solar: 일별 태양광 예측 SUM
+        smarteye: 일별 스마트아이 예측값 (solar 와 같은 날짜 순서)
+        capacities: ESS 용량 목록
+        solar_scales: 태양광 예측 보정 배율 목록 (1.0 이 현재 규칙)
+        include_series: True 면 시나리오별 일별 예측값 포함
+
+    Returns:
+        List[Dict]: 시나리오별 capacity, solar_scale, summary (현재 규칙 대비 합계 차이 포함), series
+    """
+    profiles = {scale: DeficitProfile(solar, smarteye, scale) for scale in solar_scales}
+    baseline_profile = profiles.get(1.0) or DeficitProfile(solar, smarteye, 1.0)
+    baseline_total = baseline_profile.summary(ESS_CAPACITY)["total"]
+
+    scenarios = []
+    for scale, profile in profiles.items():
+        for capacity in capacities:
+            summary = profile.summary(capacity)
+            summary["total_delta_vs_current"] = _round(summary["total"] - baseline_total)
+            scenario = {"capacity": capacity, "solar_scale": scale, "summary": summary}
+            if include_series:
+                scenario["series"] = profile.series(capacity)
+            scenarios.append(scenario)
+    return scenarios
+
+
+class ESSWhatIfService:
+    """ESS 예측 규칙 what-if 평가 클래스 (읽기 전용)"""
+
+    def __init__(self, db_manager, backend=None):
+        """
+        Args:
+            db_manager: DatabaseManager 인스턴스
+            backend: 소스 스캔 백엔드 (None 이면 SCAN_BACKEND 설정)
+        """
+        self.db = db_manager
+        self.backend = backend or get_scan_backend(db_manager=db_manager)
+        self.target = TARGET_SPECS['ess_predict']
+
+    async def load(self, start_date: str, end_date: str) -> Dict[str, Any]:
+        """
+        ESS Predict 와 같은 측정값(일별 태양광 예측 SUM, 스마트아이 예측값)을 공유 스캔 쿼리로 한 번 읽기
+
+        Returns:
+            Dict: dates, solar, smarteye (두 소스 값이 모두 있는 날짜만, 날짜 순)
+        """
+        plans = build_plan([self.target.name])
+        scanned = await self.backend.scan(plans, start_date, end_date)
+
+        measures = {}
+        for name, measure in self.target.measures.items():
+            index = 2 + plans[measure.source].measures.index(measure)
+            measures[name] = {day: row[index] for day, row in scanned[measure.source].items()}
+
+        solar_by_day = measures['solar_forecast_sum']
+        smarteye_by_day = measures['smarteye_forecast']
+        dates, solar, smarteye = [], array('d'), array('d')
+        for day in sorted(set(solar_by_day) & set(smarteye_by_day)):
+            if solar_by_day[day] is None or smarteye_by_day[day] is None:
+                continue
+            dates.append(day.isoformat() if hasattr(day, "isoformat") else str(day))
+            solar.append(float(solar_by_day[day]))
+            smarteye.append(float(smarteye_by_day[day]))
+        return {"dates": dates, "solar": solar, "smarteye": smarteye}
+
+    async def what_if(self, start_date: str, end_date: str, capacities: List[float],
+                      solar_scales: Optional[List[float]] = None, include_series: bool = True) -> Dict[str, Any]:
+        """
+        날짜 범위에 대해 용량 x 태양광 보정 배율 격자 평가
+
+        Args:
+            start_date: 시작 날짜 (YYYY-MM-DD)
+            end_date: 종료 날짜 (YYYY-MM-DD, 포함)
+            capacities: ESS 용량 목록
+            solar_scales: 태양광 예측 보정 배율 목록 (None 이면 [1.0])
+            include_series: True 면 시나리오별 일별 예측값 포함
+
+        Returns:
+            Dict: 기간, 날짜 목록, 현재 규칙 용량, 시나리오 목록
+        """
+        solar_scales = list(dict.fromkeys(solar_scales or [1.0]))
+        capacities = list(dict.fromkeys(capacities))
+        data = await self.load(start_date, end_date)
+        scenarios = evaluate_grid(data["solar"], data["smarteye"], capacities, solar_scales, include_series)
+        logger.info(f"📊 [ESS What-If] {start_date} ~ {end_date} {len(data['dates'])}일, "
+                    f"시나리오 {len(scenarios)}개 평가 ({self.backend.name})")
+
+        result = {
+            "start_date": start_date,
+            "end_date": end_date,
+            "current_capacity": ESS_CAPACITY,
+            "days": len(data["dates"]),
+            "scenarios": scenarios,
+        }
+        if include_series:
+            result["dates"] = data["dates"]
+            result["solar_forecast_sum"] = list(data["solar"])
+            result["smarteye_forecast"] = list(data["smarteye"])
+        return result
+
+# 전역 인스턴스
+_ess_whatif_service = None
+
+async def get_ess_whatif_service():
+    """ESS What-If Service 의존성 주입"""
+    global _ess_whatif_service
+    if _ess_whatif_service is None:
+        from app.core.database import db_manager
+        _ess_whatif_service = ESSWhatIfService(db_manager)
+    return _ess_whatif_service
@@ -0,0 +1,224 @@
+"""
+AI 피처 벡터 조회 서비스
+tb_ai_solar_power, tb_ai_pwr_usage, tb_ai_ess_charge_amt, tb_nrt_bms_daily_stat 를
+날짜 기준으로 조인하여 예측 모델 입력용 피처 행렬을 제공
+"""
+import logging
+from datetime import date
+from typing import Dict, Any, List, Optional, Tuple
+
+import pymysql.cursors
+
+from app.core.cache import DateRangeCache
+from app.core.config import settings
+from app.core.downsampling import Downsampler, create_downsampler
+
+logger = logging.getLogger(__name__)
+
+# 피처 행렬 컬럼 순서 (SELECT 순서와 동일)
+FEATURE_COLUMNS = [
+    'date',
+    'tmn', 'tmx', 'ics',
+    'pre_pwr_generation', 'today_generation', 'accum_generation',
+    'pwr_usage', 'pwr_forecase', 'AccruepowGap',
+    'pre_charge', 'charge_amount',
+    'ess_forecast_quantity',
+]
+
+# 다운샘플링 기준(y)으로 쓸 수 있는 수치 컬럼
+NUMERIC_FEATURE_COLUMNS = FEATURE_COLUMNS[1:]
+
+
+def _day_ordinal(row) -> int:
+    return date.fromisoformat(row[0]).toordinal()
+
+class FeatureService:
+    """AI 테이블 조인 피처 조회 클래스"""
+
+    def __init__(self, db_manager):
+        """
+        Args:
+            db_manager: DatabaseManager 인스턴스
+        """
+        self.db = db_manager
+        self.ai_solar_power_table = settings.table_names.get('ai_solar_power', 'tb_ai_solar_power')
+        self.ai_pwr_usage_table = settings.table_names.get('ai_pwr_usage', 'tb_ai_pwr_usage')
+        self.ai_ess_charge_table = settings.table_names.get('ai_ess_charge_amt', 'tb_ai_ess_charge_amt')
+        self.bms_daily_stat_table = settings.table_names.get('bms_daily_stat', 'tb_nrt_bms_daily_stat')
+
+        self.source_tables = {
+            self.ai_solar_power_table,
+            self.ai_pwr_usage_table,
+            self.ai_ess_charge_table,
+            self.bms_daily_stat_table,
+        }
+        self.cache = DateRangeCache(
+            max_entries=settings.FEATURE_CACHE_MAX_ENTRIES,
+            ttl_seconds=settings.FEATURE_CACHE_TTL_SECONDS
+        )
+        # 피처 소스 테이블이 재집계되면 해당 날짜(범위)와 겹치는 캐시 항목 무효화
+        self.db.add_write_listener(self._on_write)
+
+    def _on_write(self, target_table: str, start_date: Optional[str], end_date: Optional[str]):
+        if target_table in self.source_tables:
+            removed = self.cache.invalidate(start_date, end_date)
+            if removed:
+                period = start_date if start_date == end_date else f"{start_date} ~ {end_date}"
+                logger.info(f"🧹 [Feature] {target_table} 재집계로 캐시 {removed}건 무효화 ({period})")
+
+    def _build_query(self, start: str, end: str) -> Tuple[str, List[Any]]:
+        """피처 조인 쿼리 및 파라미터 생성"""
+        # 각 테이블의 날짜 집합을 UNION 하여 날짜 축을 만들고, 테이블별로 LEFT JOIN
+        # (일부 테이블에만 존재하는 날짜도 누락 없이 반환)
+        # JOIN 에도 상수 범위 조건을 두어 파티션 프루닝이 조인 대상 테이블에도 적용되도록 함
+        query = f"""
+        SELECT
+            DATE_FORMAT(d.dt, '%%Y-%%m-%%d') AS dt,
+            sp.tmn, sp.tmx, sp.ics,
+            sp.pre_pwr_generation, sp.today_generation, sp.accum_generation,
+            pu.pwr_usage, pu.pwr_forecase, pu.AccruepowGap,
+            ec.pre_charge, ec.charge_amount,
+            bms.forecast_quantity AS ess_forecast_quantity
+        FROM (
+            SELECT DATE(ymdhms) AS dt FROM {self.ai_solar_power_table}
+            WHERE ymdhms >= %s AND ymdhms < DATE_ADD(%s, INTERVAL 1 DAY)
+            UNION
+            SELECT DATE(ymdhms) FROM {self.ai_pwr_usage_table}
+            WHERE ymdhms >= %s AND ymdhms < DATE_ADD(%s, INTERVAL 1 DAY)
+            UNION
+            SELECT DATE(ymdhms) FROM {self.ai_ess_charge_table}
+            WHERE ymdhms >= %s AND ymdhms < DATE_ADD(%s, INTERVAL 1 DAY)
+            UNION
+            SELECT STR_TO_DATE(V_TIME, '%%Y%%m%%d') FROM {self.bms_daily_stat_table}
+            WHERE V_TIME >= %s AND V_TIME <= %s AND forecast_quantity IS NOT NULL
+        ) d
+        LEFT JOIN {self.ai_solar_power_table} sp
+            ON sp.ymdhms >= d.dt AND sp.ymdhms < d.dt + INTERVAL 1 DAY
+            AND sp.ymdhms >= %s AND sp.ymdhms < DATE_ADD(%s, INTERVAL 1 DAY)
+        LEFT JOIN {self.ai_pwr_usage_table} pu
+            ON pu.ymdhms >= d.dt AND pu.ymdhms < d.dt + INTERVAL 1 DAY
+            AND pu.ymdhms >= %s AND pu.ymdhms < DATE_ADD(%s, INTERVAL 1 DAY)
+        LEFT JOIN {self.ai_ess_charge_table} ec
+            ON ec.ymdhms >= d.dt AND ec.ymdhms < d.dt + INTERVAL 1 DAY
+            AND ec.ymdhms >= %s AND ec.ymdhms < DATE_ADD(%s, INTERVAL 1 DAY)
+        LEFT JOIN {self.bms_daily_stat_table} bms
+            ON bms.V_TIME = DATE_FORMAT(d.dt, '%%Y%%m%%d')
+            AND bms.V_TIME >= %s AND bms.V_TIME <= %s
+        ORDER BY d.dt
+        """
+
+        v_start = start.replace('-', '')
+        v_end = end.replace('-', '')
+        params = [start, end, start, end, start, end, v_start, v_end,
+                  start, end, start, end, start, end, v_start, v_end]
+        return query, params
+
+    async def get_features(self, start: str, end: str, max_points: Optional[int] = None,
+                           method: str = "lttb", column: str = "today_generation") -> Dict[str, Any]:
+        """
+        날짜 범위의 조인 피처 행렬 조회 (캐시 우선)
+
+        Args:
+            start: 시작 날짜 (YYYY-MM-DD)
+            end: 종료 날짜 (YYYY-MM-DD, 포함)
+            max_points: 응답 행 수 상한 (범위 일수가 더 크면 column 기준으로 다운샘플링)
+            method: 다운샘플링 방식 (lttb / minmax)
+            column: 다운샘플링 기준 컬럼 (NUMERIC_FEATURE_COLUMNS 중 하나)
+
+        Returns:
+            Dict: columns, rows, count, cached (다운샘플링 시 downsampling 정보 추가)
+        """
+        cached = self.cache.get(start, end)
+
+        if max_points is not None:
+            first_day = date.fromisoformat(start).toordinal()
+            last_day = date.fromisoformat(end).toordinal()
+            if last_day - first_day + 1 > max_points:
+                sampler = create_downsampler(method, first_day, last_day, max_points,
+                                             FEATURE_COLUMNS.index(column), _day_ordinal)
+                if cached is not None:
+                    sampler.add_all(cached["rows"])
+                else:
+                    await self._stream_into(sampler, start, end)
+                return self._downsampled_result(start, end, sampler, column, cached is not None)
+
+        if cached is not None:
+            return {**cached, "cached": True}
+
+        query, params = self._build_query(start, end)
+
+        async with self.db.get_async_connection('feature') as connection:
+            def _fetch():
+                cursor = connection.cursor()
+                try:
+                    cursor.execute(query, params)
+                    return cursor.fetchall()
+                finally:
+                    cursor.close()
+
+            raw_rows = await self.db.run_in_executor(_fetch)
+
+        # 날짜 포맷은 SQL 에서, Decimal 은 응답 직렬화(orjson)에서 처리하므로 튜플 행을 그대로 사용
+        rows: List[Any] = list(raw_rows)
+
+        result = {
+            "start": start,
+            "end": end,
+            "columns": FEATURE_COLUMNS,
+            "rows": rows,
+            "count": len(rows),
+        }
+        self.cache.put(start, end, result)
+        logger.info(f"📊 [Feature] {start} ~ {end} 피처 {len(rows)}건 조회 완료")
+
+        return {**result, "cached": False}
+
+    async def _stream_into(self, sampler: Downsampler, start: str, end: str):
+        """
+        서버 측 커서(SSCursor)로 피처 조인 결과를 나누어 읽으면서 다운샘플러에 바로 전달
+        (다운샘플링 결과만 남기므로 전체 행은 캐시하지 않음)
+        """
+        query, params = self._build_query(start, end)
+        batch_rows = max(1, settings.DOWNSAMPLE_FETCH_ROWS)
+
+        async with self.db.get_async_connection('feature') as connection:
+            def _stream():
+                cursor = connection.cursor(pymysql.cursors.SSCursor)
+                try:
+                    cursor.execute(query, params)
+                    while True:
+                        rows = cursor.fetchmany(batch_rows)
+                        if not rows:
+                            break
+                        sampler.add_all(rows)
+                finally:
+                    cursor.close()
+
+            await self.db.run_in_executor(_stream)
+
+    def _downsampled_result(self, start: str, end: str, sampler: Downsampler, column: str,
+                            cached: bool) -> Dict[str, Any]:
+        rows = sampler.finish()
+        info = {**sampler.get_info(), "column": column}
+        logger.info(f"📊 [Feature] {start} ~ {end} 피처 {info['source_count']}건 → "
+                    f"{len(rows)}건 다운샘플링 ({sampler.method}, {column})")
+        return {
+            "start": start,
+            "end": end,
+            "columns": FEATURE_COLUMNS,
+            "rows": rows,
+            "count": len(rows),
+            "cached": cached,
+            "downsampling": info,
+        }
+
+# 전역 인스턴스
+_feature_service = None
+
+async def get_feature_service():
+    """Feature Service 의존성 주입"""
+    global _feature_service
+    if _feature_service is None:
+        from app.core.database import db_manager
+        _feature_service = FeatureService(db_manager)
+    return _feature_service
@@ -0,0 +1,410 @@
+"""
+로컬 피처 스냅샷 (열 단위 메모리 매핑 파일)
+FeatureService 의 조인 피처 행렬을 컬럼별 float64 파일로 보관하여,
+학습 작업이 다년치 피처를 DB 조회 없이 페이지 캐시에서 바로 읽도록 함
+
+파일 구성 (FEATURE_STORE_DIR):
+- meta.json: base_date(첫 날짜), days(일수), columns, dtype, generation(컬럼 파일 디렉터리)
+- {generation}/present.u8: 날짜별 1바이트 (피처가 하나라도 있으면 1) - 날짜 인덱스
+- {generation}/{column}.f64: 날짜별 float64 (네이티브 바이트 순서, NULL 은 NaN)
+날짜 d 의 위치는 (d - base_date).days 이므로 범위 조회는 파일 오프셋 계산만으로 처리
+
+첫 날짜 이전 데이터가 들어오면(base_date 변경) 모든 컬럼 파일을 새 세대 디렉터리에 만든 뒤
+meta.json 교체로 한 번에 전환 - 중간에 중단되어도 meta.json 은 이전 세대를 가리켜 날짜 정렬이 어긋나지 않음
+(generation 이 없는 이전 형식 meta.json 은 컬럼 파일이 FEATURE_STORE_DIR 바로 아래에 있음)
+
+tb_ai_* 쓰기 리스너로 재집계된 날짜 범위를 기록해 두었다가 백그라운드에서 해당 범위만 다시 읽어 갱신
+"""
+import asyncio
+import json
+import logging
+import mmap
+import os
+import shutil
+from array import array
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.priority_lanes import SCHEDULED, current_lane
+from app.services.feature_service import FEATURE_COLUMNS, get_feature_service
+
+logger = logging.getLogger(__name__)
+
+# 날짜 컬럼을 제외한 값 컬럼
+VALUE_COLUMNS = FEATURE_COLUMNS[1:]
+NAN = float("nan")
+GENERATION_PREFIX = "gen-"
+
+
+def _to_float(value: Any) -> float:
+    return NAN if value is None else float(value)
+
+
+class FeatureStoreReader:
+    """
+    스냅샷 읽기 전용 접근 (학습 작업 등 외부 소비자용 라이브러리 API)
+
+    사용 예:
+        reader = FeatureStoreReader("feature_store")
+        view = reader.view("2022-01-01", "2024-12-31")
+        view["columns"]["pwr_usage"]   # memoryview (float64, 복사 없음)
+        numpy.frombuffer(view["columns"]["pwr_usage"], dtype=numpy.float64)  # numpy 가 있으면 복사 없이 배열로
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = directory or settings.FEATURE_STORE_DIR
+        self._maps: Dict[str, Tuple[Tuple[int, int], mmap.mmap]] = {}
+        self._generation: Optional[str] = None
+
+    def read_meta(self) -> Dict[str, Any]:
+        path = os.path.join(self.directory, "meta.json")
+        if not os.path.exists(path):
+            return {"base_date": None, "days": 0, "columns": VALUE_COLUMNS, "dtype": "float64", "generation": None}
+        with open(path, encoding="utf-8") as f:
+            meta = json.load(f)
+        meta.setdefault("generation", None)
+        return meta
+
+    def file_path(self, meta: Dict[str, Any], filename: str) -> str:
+        """meta 가 가리키는 세대의 컬럼 파일 경로"""
+        return os.path.join(self.directory, meta["generation"] or "", filename)
+
+    def _map(self, path: str) -> Optional[mmap.mmap]:
+        """파일을 읽기 전용으로 매핑 (파일이 교체/확장되면 다시 매핑)"""
+        stat = os.stat(path)
+        cached = self._maps.get(path)
+        if cached and cached[0] == (stat.st_ino, stat.st_size):
+            return cached[1]
+        if stat.st_size == 0:
+            return None
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._maps[path] = ((stat.st_ino, stat.st_size), mapped)
+        return mapped
+
+    def view(self, start: str, end: str, columns: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        날짜 범위의 컬럼별 복사 없는 뷰
+
+        Args:
+            start: 시작 날짜 (YYYY-MM-DD)
+            end: 종료 날짜 (YYYY-MM-DD, 포함)
+            columns: 컬럼 목록 (None 이면 전체)
+
+        Returns:
+            Dict: start, end(스냅샷 범위로 잘린 실제 범위), days, present(memoryview uint8), columns(memoryview float64)
+        """
+        try:
+            return self._view(self.read_meta(), start, end, columns)
+        except FileNotFoundError:
+            # meta.json 을 읽은 직후 새 세대로 전환되어 이전 세대가 삭제된 경우 - 새 meta 로 한 번 더 시도
+            return self._view(self.read_meta(), start, end, columns)
+
+    def _view(self, meta: Dict[str, Any], start: str, end: str, columns: Optional[List[str]]) -> Dict[str, Any]:
+        if meta["generation"] != self._generation:
+            # 이전 세대 매핑은 소비자가 뷰를 놓으면 해제되도록 참조만 버림
+            self._maps = {}
+            self._generation = meta["generation"]
+        columns = columns or meta["columns"]
+        empty = {"start": start, "end": end, "days": 0, "present": memoryview(b""),
+                 "columns": {column: memoryview(b"").cast("d") for column in columns}}
+        if not meta["base_date"] or not meta["days"]:
+            return empty
+
+        base = date.fromisoformat(meta["base_date"])
+        first = max(0, (date.fromisoformat(start) - base).days)
+        last = min(meta["days"], (date.fromisoformat(end) - base).days + 1)
+        if first >= last:
+            return empty
+
+        present = self._map(self.file_path(meta, "present.u8"))
+        return {
+            "start": (base + timedelta(days=first)).isoformat(),
+            "end": (base + timedelta(days=last - 1)).isoformat(),
+            "days": last - first,
+            "present": memoryview(present)[first:last],
+            "columns": {
+                column: memoryview(self._map(self.file_path(meta, f"{column}.f64"))).cast("d")[first:last]
+                for column in columns
+            },
+        }
+
+
+class FeatureStore:
+    """피처 스냅샷 갱신 (쓰기 리스너로 재집계 범위 수집 → 백그라운드 동기화)"""
+
+    def __init__(self, db_manager):
+        """
+        Args:
+            db_manager: DatabaseManager 인스턴스
+        """
+        self.db = db_manager
+        self.directory = settings.FEATURE_STORE_DIR
+        self.chunk_days = max(1, settings.FEATURE_STORE_SYNC_CHUNK_DAYS)
+        self.reader = FeatureStoreReader(self.directory)
+
+        self._pending: List[Tuple[Optional[str], Optional[str]]] = []
+        self._wakeup = asyncio.Event()
+        self._sync_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self.stats = {"synced_days": 0, "syncs": 0, "failures": 0, "last_synced_at": None}
+
+        self.source_tables = {
+            settings.table_names.get('ai_solar_power', 'tb_ai_solar_power'),
+            settings.table_names.get('ai_pwr_usage', 'tb_ai_pwr_usage'),
+            settings.table_names.get('ai_ess_charge_amt', 'tb_ai_ess_charge_amt'),
+            settings.table_names.get('bms_daily_stat', 'tb_nrt_bms_daily_stat'),
+        }
+        self.db.add_write_listener(self._on_write)
+
+    def _on_write(self, target_table: str, start_date: Optional[str], end_date: Optional[str]):
+        # 동기화 작업이 실행 중일 때만 기록 (비활성 시 대기 목록이 쌓이지 않도록)
+        if self._task is not None and target_table in self.source_tables:
+            self._pending.append((start_date, end_date))
+            self._wakeup.set()
+
+    def _merge_pending(self) -> List[Tuple[str, str]]:
+        """대기 중인 재집계 범위를 겹치거나 인접한 범위끼리 병합"""
+        pending, self._pending = self._pending, []
+        meta = self.reader.read_meta()
+        ranges = []
+        for start_date, end_date in pending:
+            if start_date is None:
+                # 범위를 알 수 없는 쓰기는 스냅샷 전체를 다시 읽음
+                if not meta["base_date"]:
+                    continue
+                start_date = meta["base_date"]
+                end_date = (date.fromisoformat(start_date) + timedelta(days=meta["days"] - 1)).isoformat()
+            ranges.append((date.fromisoformat(start_date), date.fromisoformat(end_date)))
+
+        merged: List[List[date]] = []
+        for start, end in sorted(ranges):
+            if merged and start <= merged[-1][1] + timedelta(days=1):
+                merged[-1][1] = max(merged[-1][1], end)
+            else:
+                merged.append([start, end])
+        return [(start.isoformat(), end.isoformat()) for start, end in merged]
+
+    def _write_rows(self, rows: List[Tuple[Any, ...]]):
+        """
+        피처 행을 컬럼 파일에 기록
+
+        - 기존 범위 안 / 뒤쪽 확장: 현재 세대 파일을 늘리고 제자리 갱신 후 meta.json 의 days 갱신
+        - 첫 날짜 이전 데이터(또는 첫 기록): 새 세대 디렉터리에 전체 파일을 만든 뒤 meta.json 교체로 전환
+        """
+        if not rows:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        meta = self.reader.read_meta()
+        first = date.fromisoformat(rows[0][0])
+        last = date.fromisoformat(rows[-1][0])
+
+        if meta["base_date"]:
+            base = date.fromisoformat(meta["base_date"])
+            days = meta["days"]
+        else:
+            base, days = first, 0
+
+        shift = max(0, (base - first).days)
+        new_days = max(days + shift, (last - base).days + 1 + shift)
+        files = [("present.u8", "B", 0)] + [(f"{column}.f64", "d", NAN) for column in VALUE_COLUMNS]
+
+        generation = meta["generation"]
+        if shift or not meta["base_date"]:
+            generation = self._build_generation(meta, files, shift)
+        directory = os.path.join(self.directory, generation or "")
+
+        for filename, typecode, fill in files:
+            path = os.path.join(directory, filename)
+            current = os.path.getsize(path) // array(typecode).itemsize if os.path.exists(path) else 0
+            if current < new_days:
+                with open(path, "ab") as out:
+                    out.write(array(typecode, [fill] * (new_days - current)).tobytes())
+
+        base = base - timedelta(days=shift)
+        self._write_values(directory, files, base, rows)
+
+        tmp_meta = os.path.join(self.directory, "meta.json.tmp")
+        with open(tmp_meta, "w", encoding="utf-8") as f:
+            json.dump({"base_date": base.isoformat(), "days": new_days, "columns": VALUE_COLUMNS,
+                       "dtype": "float64", "generation": generation}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_meta, os.path.join(self.directory, "meta.json"))
+
+        if generation != meta["generation"]:
+            self._remove_stale_generations(meta, generation)
+
+    def _build_generation(self, meta: Dict[str, Any], files: List[Tuple[str, str, Any]], shift: int) -> str:
+        """앞쪽에 빈 구간(shift 일)을 붙인 기존 데이터로 새 세대 디렉터리 생성 (meta.json 은 아직 이전 세대)"""
+        number = int(meta["generation"][len(GENERATION_PREFIX):]) + 1 if meta["generation"] else 1
+        generation = f"{GENERATION_PREFIX}{number:06d}"
+        directory = os.path.join(self.directory, generation)
+        # 이전에 중단된 같은 번호의 세대가 남아 있으면 처음부터 다시 만듦
+        shutil.rmtree(directory, ignore_errors=True)
+        os.makedirs(directory)
+        for filename, typecode, fill in files:
+            source = self.reader.file_path(meta, filename)
+            with open(os.path.join(directory, filename), "wb") as out:
+                out.write(array(typecode, [fill] * shift).tobytes())
+                if meta["base_date"] and os.path.exists(source):
+                    with open(source, "rb") as src:
+                        shutil.copyfileobj(src, out)
+                out.flush()
+                os.fsync(out.fileno())
+        return generation
+
+    def _write_values(self, directory: str, files: List[Tuple[str, str, Any]], base: date,
+                      rows: List[Tuple[Any, ...]]):
+        for index, (filename, typecode, _) in enumerate(files):
+            with open(os.path.join(directory, filename), "r+b") as f:
+                mapped = mmap.mmap(f.fileno(), 0)
+                try:
+                    values = memoryview(mapped).cast(typecode)
+                    try:
+                        for row in rows:
+                            offset = (date.fromisoformat(row[0]) - base).days
+                            if index == 0:
+                                values[offset] = int(any(value is not None for value in row[1:]))
+                            else:
+                                values[offset] = _to_float(row[index])
+                    finally:
+                        values.release()
+                    mapped.flush()
+                finally:
+                    mapped.close()
+
+    def _remove_stale_generations(self, previous: Dict[str, Any], keep: str):
+        """전환 이후 이전 세대 / 중단된 세대 / 이전 형식 파일 정리 (이미 매핑한 소비자는 계속 읽을 수 있음)"""
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if name.startswith(GENERATION_PREFIX) and name != keep and os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
+        if previous["base_date"] and previous["generation"] is None:
+            for column in ["present.u8"] + [f"{column}.f64" for column in VALUE_COLUMNS]:
+                try:
+                    os.remove(os.path.join(self.directory, column))
+                except OSError:
+                    pass
+
+    async def sync(self, start_date: str, end_date: str) -> int:
+        """
+        날짜 범위의 피처를 DB 에서 다시 읽어 스냅샷 갱신 (FEATURE_STORE_SYNC_CHUNK_DAYS 단위로 나누어 조회)
+
+        Returns:
+            int: 기록한 날짜 수
+        """
+        feature_service = await get_feature_service()
+        written = 0
+        current = date.fromisoformat(start_date)
+        end = date.fromisoformat(end_date)
+        async with self._sync_lock:
+            while current <= end:
+                chunk_end = min(current + timedelta(days=self.chunk_days - 1), end)
+                query, params = feature_service._build_query(current.isoformat(), chunk_end.isoformat())
+
+                async with self.db.get_async_connection('feature') as connection:
+                    def _fetch():
+                        cursor = connection.cursor()
+                        try:
+                            cursor.execute(query, params)
+                            return cursor.fetchall()
+                        finally:
+                            cursor.close()
+
+                    rows = await self.db.run_in_executor(_fetch)
+
+                await asyncio.get_running_loop().run_in_executor(None, self._write_rows, list(rows))
+                written += len(rows)
+                current = chunk_end + timedelta(days=1)
+
+        self.stats["syncs"] += 1
+        self.stats["synced_days"] += written
+        self.stats["last_synced_at"] = datetime.now().isoformat(timespec="seconds")
+        logger.info(f"🗄️ [FeatureStore] {start_date} ~ {end_date} 스냅샷 갱신 - {written}일")
+        return written
+
+    async def _run(self):
+        # 스냅샷 자동 갱신은 scheduled 레인에서 조회
+        current_lane.set(SCHEDULED)
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            for start_date, end_date in self._merge_pending():
+                try:
+                    await self.sync(start_date, end_date)
+                except Exception as e:
+                    self.stats["failures"] += 1
+                    logger.error(f"❌ [FeatureStore] {start_date} ~ {end_date} 갱신 실패: {str(e)}")
+
+    async def start(self):
+        """재집계 범위 자동 동기화 시작"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+            logger.info(f"🗄️ [FeatureStore] 자동 갱신 시작 - {self.directory}")
+
+    async def stop(self):
+        """자동 동기화 중지"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def describe(self, start: Optional[str] = None, end: Optional[str] = None) -> Dict[str, Any]:
+        """
+        스냅샷 파일 구성과 (지정 시) 날짜 범위의 파일 오프셋
+
+        같은 호스트의 소비자가 파일을 직접 메모리 매핑할 수 있도록 경로/형식/오프셋을 반환
+        """
+        meta = self.reader.read_meta()
+        directory = os.path.abspath(self.directory)
+        result = {
+            "directory": directory,
+            "base_date": meta["base_date"],
+            "days": meta["days"],
+            "dtype": meta["dtype"],
+            "byte_order": "little" if array("H", [1]).tobytes()[0] == 1 else "big",
+            "generation": meta["generation"],
+            "files": {
+                "present": os.path.abspath(self.reader.file_path(meta, "present.u8")),
+                **{column: os.path.abspath(self.reader.file_path(meta, f"{column}.f64"))
+                   for column in meta["columns"]},
+            },
+            "pending_ranges": len(self._pending),
+            "auto_sync": self._task is not None,
+            **self.stats,
+        }
+        if start and end and meta["base_date"]:
+            base = date.fromisoformat(meta["base_date"])
+            first = max(0, (date.fromisoformat(start) - base).days)
+            last = min(meta["days"], (date.fromisoformat(end) - base).days + 1)
+            count = max(0, last - first)
+            result["range"] = {
+                "start": start,
+                "end": end,
+                "offset": first,
+                "count": count,
+                "byte_offset": first * 8,
+                "byte_length": count * 8,
+                "present_days": sum(self.reader.view(start, end)["present"]) if count else 0,
+            }
+        return result
+
+# 전역 인스턴스
+_feature_store = None
+
+def get_feature_store_instance() -> FeatureStore:
+    """Feature Store 전역 인스턴스 (lifespan 에서 시작/종료)"""
+    global _feature_store
+    if _feature_store is None:
+        from app.core.database import db_manager
+        _feature_store = FeatureStore(db_manager)
+    return _feature_store
+
+async def get_feature_store():
+    """Feature Store 의존성 주입"""
+    return get_feature_store_instance()
@@ -0,0 +1,325 @@
+"""
+원천 데이터 마이크로 배치 적재 서비스
+tb_solar_day, tb_weather_info, tb_aggregate_smarteye_day 로 들어오는 측정값을 메모리에 버퍼링한 뒤
+크기/시간 임계치에 도달하면 다중 행 INSERT 로 한 번에 적재
+"""
+import asyncio
+import logging
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+import pymysql
+
+from app.core.circuit_breaker import CircuitOpenError, is_breaker_failure
+from app.core.config import settings
+from app.core.priority_lanes import SCHEDULED, current_lane
+from app.core.write_scheduler import get_retryable_error_code
+from app.services.aggregation_specs import SOURCE_SPECS, SourceSpec
+
+logger = logging.getLogger(__name__)
+
+# 소스별 적재 허용 컬럼 (시간 컬럼 포함, 컬럼명은 SQL 에 직접 들어가므로 화이트리스트로 제한)
+INGEST_COLUMNS: Dict[str, Tuple[str, ...]] = {
+    'solar_day': ('ymdhms', 'forecast_quantity', 'today_generation', 'accum_generation'),
+    'weather_info': ('tm', 'tmn', 'tmx', 'ics'),
+    'smarteye_day': ('use_time', 'pwr_kepco_usage_tot', 'forecast_quantity'),
+}
+
+
+class IngestBufferFull(Exception):
+    """버퍼 용량 초과 (클라이언트 재시도 필요)"""
+    pass
+
+
+def is_transient_write_error(error: BaseException) -> bool:
+    """다시 적재하면 성공할 수 있는 오류인지 판단 (DB 연결/회로 차단, 데드락, 락 대기 타임아웃)"""
+    return (isinstance(error, CircuitOpenError) or is_breaker_failure(error)
+            or bool(get_retryable_error_code(error)))
+
+
+def _parse_time(value: Any) -> datetime:
+    """시간 컬럼 값을 DATETIME 으로 파싱 (MariaDB 가 거부할 값은 버퍼에 넣기 전에 ValueError)"""
+    if isinstance(value, datetime):
+        parsed = value
+    elif isinstance(value, str):
+        parsed = datetime.fromisoformat(value.strip())
+    else:
+        raise ValueError(f"문자열(YYYY-MM-DD HH:MM:SS)이어야 합니다: {value!r}")
+    if parsed.tzinfo is not None:
+        raise ValueError(f"시간대가 없는 로컬 시각이어야 합니다: {value!r}")
+    if parsed.year < 1000:
+        raise ValueError(f"DATETIME 범위(1000-01-01 ~ 9999-12-31)를 벗어났습니다: {value!r}")
+    return parsed
+
+
+class IngestBuffer:
+    """소스 테이블 하나에 대한 적재 버퍼"""
+
+    def __init__(self, source: SourceSpec, columns: Tuple[str, ...]):
+        self.source = source
+        self.columns = columns
+        self.rows: List[Dict[str, Any]] = []
+        self.lock = asyncio.Lock()
+        self.last_flush = time.monotonic()
+        # rejected: 버퍼 용량 초과로 받지 않은 건수, write_rejected: DB 가 거부해 버린 건수
+        self.stats = {"accepted": 0, "flushed": 0, "flushes": 0, "rejected": 0, "failures": 0,
+                      "write_rejected": 0}
+        # DB 가 거부한 최근 측정값 (원인 확인용, 재적재하지 않음)
+        self.write_rejected: Deque[Dict[str, Any]] = deque(maxlen=max(1, settings.INGEST_REJECTED_KEEP_ROWS))
+
+    def validate(self, readings: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        측정값 컬럼 검증 (시간 컬럼 필수 + DATETIME 파싱, 허용되지 않은 컬럼 거부)
+
+        Returns:
+            List[Dict]: 시간 컬럼을 datetime 으로 바꾼 측정값 (원본은 수정하지 않음)
+        """
+        time_column = self.source.time_column
+        validated = []
+        for index, reading in enumerate(readings):
+            if reading.get(time_column) is None:
+                raise ValueError(f"{index}번째 측정값에 시간 컬럼 '{time_column}' 이 없습니다")
+            unknown = set(reading) - set(self.columns)
+            if unknown:
+                raise ValueError(f"{index}번째 측정값에 허용되지 않은 컬럼이 있습니다: {sorted(unknown)}")
+            try:
+                parsed = _parse_time(reading[time_column])
+            except ValueError as e:
+                raise ValueError(f"{index}번째 측정값의 시간 컬럼 '{time_column}' 이 올바르지 않습니다 - {str(e)}")
+            validated.append({**reading, time_column: parsed})
+        return validated
+
+
+class IngestService:
+    """원천 데이터 버퍼링 및 다중 행 적재 클래스"""
+
+    def __init__(self, db_manager):
+        """
+        Args:
+            db_manager: DatabaseManager 인스턴스
+        """
+        self.db = db_manager
+        self.flush_rows = max(1, settings.INGEST_FLUSH_ROWS)
+        self.max_buffer_rows = max(self.flush_rows, settings.INGEST_BUFFER_MAX_ROWS)
+        self.flush_interval = settings.INGEST_FLUSH_INTERVAL_SECONDS
+        self.buffers: Dict[str, IngestBuffer] = {
+            name: IngestBuffer(SOURCE_SPECS[name], columns)
+            for name, columns in INGEST_COLUMNS.items()
+        }
+        self._flusher: Optional[asyncio.Task] = None
+        self._pending: set = set()
+
+    async def start(self):
+        """주기적 플러시 태스크 시작"""
+        if self._flusher is None:
+            self._flusher = asyncio.create_task(self._flush_loop())
+            logger.info(f"📥 [Ingest] 플러셔 시작 (행 {self.flush_rows}건 / {self.flush_interval}초 주기)")
+
+    async def stop(self):
+        """플러시 태스크 중지 후 남은 버퍼 전부 적재"""
+        if self._flusher is not None:
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+            self._flusher = None
+
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+
+        for name in self.buffers:
+            try:
+                await self.flush(name)
+            except Exception as e:
+                logger.error(f"❌ [Ingest] {name} 종료 전 플러시 실패 - {len(self.buffers[name].rows)}건 유실: {str(e)}")
+        logger.info("📥 [Ingest] 종료 전 버퍼 플러시 완료")
+
+    async def _flush_loop(self):
+        # 주기 플러시는 scheduled 레인 (크기 임계치 플러시는 요청 레인에서 실행)
+        current_lane.set(SCHEDULED)
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            now = time.monotonic()
+            for name, buffer in self.buffers.items():
+                if buffer.rows and now - buffer.last_flush >= self.flush_interval:
+                    try:
+                        await self.flush(name)
+                    except Exception as e:
+                        logger.error(f"❌ [Ingest] {name} 주기 플러시 실패: {str(e)}")
+
+    async def add(self, source: str, readings: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        측정값을 버퍼에 추가 (크기 임계치 도달 시 백그라운드 플러시)
+
+        Args:
+            source: 소스 이름 (solar_day, weather_info, smarteye_day)
+            readings: 측정값 리스트
+
+        Raises:
+            KeyError: 알 수 없는 소스
+            ValueError: 컬럼 검증 실패
+            IngestBufferFull: 버퍼 용량 초과 (백프레셔)
+        """
+        buffer = self.buffers[source]
+        readings = buffer.validate(readings)
+
+        async with buffer.lock:
+            if len(buffer.rows) + len(readings) > self.max_buffer_rows:
+                buffer.stats["rejected"] += len(readings)
+                raise IngestBufferFull(
+                    f"{source} 버퍼가 가득 찼습니다 ({len(buffer.rows)}/{self.max_buffer_rows}건)"
+                )
+            buffer.rows.extend(readings)
+            buffer.stats["accepted"] += len(readings)
+            buffered = len(buffer.rows)
+
+        if buffered >= self.flush_rows:
+            task = asyncio.create_task(self._flush_in_background(source))
+            self._pending.add(task)
+            task.add_done_callback(self._pending.discard)
+
+        return {"source": source, "accepted": len(readings), "buffered": buffered}
+
+    async def _flush_in_background(self, source: str):
+        # 크기 임계치 플러시는 기다리는 호출자가 없으므로 여기서 실패를 기록 (행은 flush 에서 재적재 대기)
+        try:
+            await self.flush(source)
+        except Exception as e:
+            logger.error(f"❌ [Ingest] {source} 임계치 플러시 실패: {str(e)}")
+
+    def _build_insert(self, buffer: IngestBuffer, columns: Tuple[str, ...]) -> str:
+        time_column = buffer.source.time_column
+        updates = [column for column in columns if column != time_column]
+        query = f"""
+        INSERT INTO {buffer.source.table}
+            ({", ".join(columns)})
+        VALUES ({", ".join(["%s"] * len(columns))})
+        """
+        if updates:
+            return query + "ON DUPLICATE KEY UPDATE " + ", ".join(
+                f"{column} = VALUES({column})" for column in updates
+            )
+        # 시간 컬럼만 있는 측정값: 이미 있는 시각이면 아무것도 바꾸지 않음 (1062 방지)
+        return query + f"ON DUPLICATE KEY UPDATE {time_column} = {time_column}"
+
+    async def flush(self, source: str) -> int:
+        """
+        버퍼의 측정값을 다중 행 INSERT 로 적재
+
+        - 연결/회로 차단, 데드락, 락 대기 타임아웃: 버퍼 앞쪽에 되돌려 다음 플러시에서 재시도 후 예외 전파
+        - 그 밖의 DB 오류(값 범위, 파티션 없음 등): 행 단위로 다시 적재해 거부된 행만 write_rejected 로 버림
+
+        Returns:
+            int: 영향받은 행 수
+        """
+        buffer = self.buffers[source]
+        async with buffer.lock:
+            rows, buffer.rows = buffer.rows, []
+            buffer.last_flush = time.monotonic()
+
+        if not rows:
+            return 0
+
+        # 컬럼 조합별로 묶어서 executemany (pymysql 이 다중 행 VALUES 로 변환)
+        groups: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+        for row in rows:
+            columns = tuple(column for column in buffer.columns if column in row)
+            groups.setdefault(columns, []).append(row)
+
+        def _execute(connection):
+            cursor = connection.cursor()
+            try:
+                affected_rows = 0
+                for columns, readings in groups.items():
+                    query = self._build_insert(buffer, columns)
+                    values = [tuple(reading[column] for column in columns) for reading in readings]
+                    for offset in range(0, len(values), self.flush_rows):
+                        cursor.executemany(query, values[offset:offset + self.flush_rows])
+                        affected_rows += cursor.rowcount
+                connection.commit()
+                return affected_rows, []
+            finally:
+                cursor.close()
+
+        def _execute_each(connection):
+            # 실패한 문장만 롤백되므로 (문장 단위 원자성) 거부된 행을 건너뛰고 나머지는 한 번에 commit
+            cursor = connection.cursor()
+            try:
+                affected_rows, rejected = 0, []
+                for columns, readings in groups.items():
+                    query = self._build_insert(buffer, columns)
+                    for reading in readings:
+                        try:
+                            affected_rows += cursor.execute(query, tuple(reading[column] for column in columns))
+                        except pymysql.err.MySQLError as e:
+                            if is_transient_write_error(e):
+                                raise
+                            rejected.append((reading, e))
+                connection.commit()
+                return affected_rows, rejected
+            finally:
+                cursor.close()
+
+        table = buffer.source.table
+        try:
+            try:
+                affected_rows, rejected = await self.db.execute_write(table, _execute, service='ingest')
+            except Exception as e:
+                if is_transient_write_error(e):
+                    raise
+                logger.warning(f"⚠️ [Ingest] {table} 일괄 적재 실패 - 행 단위로 다시 적재: {str(e)}")
+                affected_rows, rejected = await self.db.execute_write(table, _execute_each, service='ingest')
+        except Exception as e:
+            buffer.stats["failures"] += 1
+            if not is_transient_write_error(e):
+                # 다시 적재해도 같은 결과이므로 버퍼를 막지 않도록 전부 버림
+                self._reject(buffer, [(row, e) for row in rows])
+                logger.error(f"❌ [Ingest] {table} 적재 실패 - {len(rows)}건 거부: {str(e)}")
+                return 0
+            # 실패한 행은 용량이 허용하는 범위에서 버퍼 앞쪽에 되돌려 다음 플러시에서 재시도
+            async with buffer.lock:
+                room = max(0, self.max_buffer_rows - len(buffer.rows))
+                buffer.rows[:0] = rows[:room]
+            logger.error(f"❌ [Ingest] {table} 적재 실패 ({len(rows)}건, "
+                         f"재적재 대기 {min(room, len(rows))}건): {str(e)}")
+            raise
+
+        if rejected:
+            self._reject(buffer, rejected)
+            logger.warning(f"⚠️ [Ingest] {table} {len(rejected)}건 거부 (예: {str(rejected[0][1])})")
+
+        buffer.stats["flushed"] += len(rows) - len(rejected)
+        buffer.stats["flushes"] += 1
+        logger.info(f"📥 [Ingest] {table} {len(rows) - len(rejected)}건 적재 (영향받은 행: {affected_rows})")
+        return affected_rows
+
+    def _reject(self, buffer: IngestBuffer, rejected: List[Tuple[Dict[str, Any], BaseException]]):
+        buffer.stats["write_rejected"] += len(rejected)
+        for reading, error in rejected:
+            buffer.write_rejected.append({"reading": reading, "error": str(error)})
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """소스별 버퍼 상태 조회"""
+        return {
+            name: {**buffer.stats, "buffered": len(buffer.rows), "capacity": self.max_buffer_rows,
+                   "recent_write_rejected": list(buffer.write_rejected)}
+            for name, buffer in self.buffers.items()
+        }
+
+# 전역 인스턴스
+_ingest_service = None
+
+def get_ingest_service_instance() -> IngestService:
+    """Ingest Service 전역 인스턴스 (lifespan 에서 시작/종료)"""
+    global _ingest_service
+    if _ingest_service is None:
+        from app.core.database import db_manager
+        _ingest_service = IngestService(db_manager)
+    return _ingest_service
+
+async def get_ingest_service():
+    """Ingest Service 의존성 주입"""
+    return get_ingest_service_instance()
@@ -0,0 +1,316 @@
+"""
+당일 실시간 집계 서비스
+오늘 날짜의 소스 측정값(SUM/MIN/MAX/COUNT)을 메모리에 유지하여 대시보드 조회에 즉시 응답
+
+- 시작 시 DB 에서 오늘 데이터로 초기화 (seed)
+- 시간 컬럼 워터마크 이후의 신규 행만 주기적으로 읽어 증분 반영 (tail)
+  워터마크 시각의 행도 다시 읽어(>=) 이미 반영한 행을 빼므로, 같은 시각에 늦게 커밋된 행도 반영됨
+  (워터마크보다 이전 시각으로 늦게 도착/수정된 행은 주기적 재초기화로만 보정)
+- 주기적으로 tb_ai_* 테이블에 UPSERT (flush)
+- 날짜가 바뀌면 전날 마지막 행까지 반영해 적재하고, 유예 시간 뒤 전날을 원천 재집계해 늦게 도착한 행 보정
+"""
+import asyncio
+import logging
+import time
+from collections import Counter
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.priority_lanes import SCHEDULED, current_lane
+from app.services.aggregation_planner import get_aggregation_planner
+from app.services.aggregation_specs import SOURCE_SPECS, TARGET_SPECS, Measure
+
+logger = logging.getLogger(__name__)
+
+_NUMBER_TYPES = (int, float, Decimal)
+
+
+class RunningStat:
+    """컬럼 하나의 누적 통계 (count, sum, min, max, 양수 min)"""
+
+    __slots__ = ("count", "sum", "min", "max", "min_positive")
+
+    def __init__(self):
+        self.count = 0
+        self.sum = None
+        self.min = None
+        self.max = None
+        self.min_positive = None
+
+    def update(self, value: Any):
+        if value is None:
+            return
+        self.count += 1
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+        if isinstance(value, _NUMBER_TYPES):
+            self.sum = value if self.sum is None else self.sum + value
+            if value > 0 and (self.min_positive is None or value < self.min_positive):
+                self.min_positive = value
+
+    def value(self, measure: Measure) -> Any:
+        """측정값 정의(agg, positive_only)에 해당하는 값"""
+        if measure.agg == 'SUM':
+            return self.sum
+        if measure.agg == 'MIN':
+            return self.min_positive if measure.positive_only else self.min
+        if measure.agg == 'MAX':
+            return self.max
+        raise ValueError(f"지원하지 않는 집계 함수입니다: {measure.agg}")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"count": self.count, "sum": self.sum, "min": self.min, "max": self.max}
+
+
+def _tracked_columns() -> Dict[str, Tuple[str, ...]]:
+    """TARGET_SPECS 측정값에서 소스별로 추적할 컬럼 목록 도출"""
+    columns: Dict[str, List[str]] = {name: [] for name in SOURCE_SPECS}
+    for target in TARGET_SPECS.values():
+        for measure in target.measures.values():
+            if measure.column not in columns[measure.source]:
+                columns[measure.source].append(measure.column)
+    return {name: tuple(cols) for name, cols in columns.items() if cols}
+
+
+class LiveAggregateService:
+    """당일 실시간 누적 집계 클래스"""
+
+    def __init__(self, db_manager):
+        """
+        Args:
+            db_manager: DatabaseManager 인스턴스
+        """
+        self.db = db_manager
+        self.poll_interval = settings.LIVE_POLL_INTERVAL_SECONDS
+        self.flush_interval = settings.LIVE_FLUSH_INTERVAL_SECONDS
+        self.reseed_interval = settings.LIVE_RESEED_INTERVAL_SECONDS
+        self.rollover_grace = settings.LIVE_ROLLOVER_GRACE_SECONDS
+        self.columns = _tracked_columns()
+
+        self.day: Optional[date] = None
+        self.stats: Dict[str, Dict[str, RunningStat]] = {}
+        self.watermarks: Dict[str, Optional[datetime]] = {}
+        # 소스별 워터마크 시각에 이미 반영한 행 (다음 조회에서 다시 나오므로 건너뛰기용)
+        self.watermark_rows: Dict[str, Counter] = {}
+        self.row_counts: Dict[str, int] = {}
+        # 날짜 변경 후 원천 재집계로 보정할 전날과 실행 시각 (monotonic)
+        self.pending_rollover: Optional[Tuple[date, float]] = None
+        self.last_seed = 0.0
+        self.last_flush = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    def _reset(self, day: date):
+        self.day = day
+        self.stats = {source: {column: RunningStat() for column in columns}
+                      for source, columns in self.columns.items()}
+        self.watermarks = {source: None for source in self.columns}
+        self.watermark_rows = {source: Counter() for source in self.columns}
+        self.row_counts = {source: 0 for source in self.columns}
+
+    async def _fetch_new_rows(self) -> Dict[str, List[Tuple[Any, ...]]]:
+        """소스별 워터마크 시각 이후 행 조회 (하나의 연결에서 소스당 1회, 워터마크 시각 포함)"""
+        day_start = datetime.combine(self.day, datetime.min.time())
+        day_end = day_start + timedelta(days=1)
+        watermarks = dict(self.watermarks)
+
+        async with self.db.get_async_connection('live') as connection:
+            def _fetch():
+                fetched = {}
+                cursor = connection.cursor()
+                try:
+                    for source_name, columns in self.columns.items():
+                        source = SOURCE_SPECS[source_name]
+                        query = f"""
+                        SELECT {source.time_column}, {", ".join(columns)}
+                        FROM {source.table}
+                        WHERE {source.time_column} >= %s AND {source.time_column} < %s
+                        ORDER BY {source.time_column}
+                        """
+                        cursor.execute(query, [watermarks[source_name] or day_start, day_end])
+                        fetched[source_name] = cursor.fetchall()
+                    return fetched
+                finally:
+                    cursor.close()
+
+            return await self.db.run_in_executor(_fetch)
+
+    def _apply(self, fetched: Dict[str, List[Tuple[Any, ...]]]) -> int:
+        """
+        조회한 행을 누적 통계에 반영
+
+        워터마크 시각의 행은 매번 다시 조회되므로 이미 반영한 행(시각과 컬럼 값이 같은 행)은 건너뜀
+        (값까지 같은 행끼리는 통계 기여가 같으므로 어느 행을 건너뛰어도 결과가 같음)
+
+        Returns:
+            int: 새로 반영한 행 수
+        """
+        applied = 0
+        for source_name, rows in fetched.items():
+            if not rows:
+                continue
+            stats = self.stats[source_name]
+            columns = self.columns[source_name]
+            watermark = self.watermarks[source_name]
+            seen = self.watermark_rows[source_name]
+            new_rows = 0
+            for row in rows:
+                if row[0] == watermark and seen[row] > 0:
+                    seen[row] -= 1
+                    continue
+                for column, value in zip(columns, row[1:]):
+                    stats[column].update(value)
+                new_rows += 1
+            last = rows[-1][0]
+            self.watermarks[source_name] = last
+            self.watermark_rows[source_name] = Counter(row for row in rows if row[0] == last)
+            self.row_counts[source_name] += new_rows
+            applied += new_rows
+        return applied
+
+    async def seed(self):
+        """오늘 데이터로 누적 통계 초기화"""
+        self._reset(date.today())
+        self._apply(await self._fetch_new_rows())
+        self.last_seed = time.monotonic()
+        logger.info(f"⚡ [Live] {self.day} 초기화 완료 - 소스 행 {self.row_counts}")
+
+    async def tail(self) -> int:
+        """워터마크 이후 신규 행 반영
+
+        Returns:
+            int: 반영된 행 수
+        """
+        return self._apply(await self._fetch_new_rows())
+
+    def _target_values(self) -> Dict[str, Dict[str, Any]]:
+        """대상별 측정값 계산 (해당 소스 데이터가 없으면 제외)"""
+        targets = {}
+        for name, target in TARGET_SPECS.items():
+            present = [self.row_counts.get(source, 0) > 0 for source in target.sources]
+            if not any(present) or (target.require_all_sources and not all(present)):
+                continue
+            targets[name] = {
+                measure_name: self.stats[measure.source][measure.column].value(measure)
+                for measure_name, measure in target.measures.items()
+            }
+        return targets
+
+    def snapshot(self) -> Dict[str, Any]:
+        """현재 누적 집계 조회 (메모리만 사용)"""
+        targets = {}
+        for name, values in self._target_values().items():
+            row = TARGET_SPECS[name].build_row(self.day, values)
+            targets[name] = dict(zip([TARGET_SPECS[name].key_column] + list(TARGET_SPECS[name].columns), row))
+        return {
+            "date": self.day.isoformat() if self.day else None,
+            "targets": targets,
+            "sources": {
+                source: {column: stat.to_dict() for column, stat in stats.items()}
+                for source, stats in self.stats.items()
+            },
+            "watermarks": self.watermarks,
+            "row_counts": self.row_counts,
+        }
+
+    async def flush(self) -> Dict[str, int]:
+        """누적 집계를 tb_ai_* 테이블에 UPSERT
+
+        Returns:
+            Dict: 대상 이름 → 영향받은 행 수
+        """
+        planner = await get_aggregation_planner()
+
+        target_date = self.day.isoformat()
+        target_values = self._target_values()
+        results = {}
+        # 워커마다 실시간 집계를 유지하므로, 같은 날짜를 이미 적재 중인 워커가 있으면 건너뜀
+        async with self.db.aggregation_locks(list(target_values), target_date) as acquired:
+            for name in acquired:
+                row = TARGET_SPECS[name].build_row(self.day, target_values[name])
+                results[name] = await planner.write_rows(name, [row], target_date)
+        self.last_flush = time.monotonic()
+        logger.info(f"⚡ [Live] {target_date} 누적 집계 적재 - {results}")
+        return results
+
+    async def _roll_over(self):
+        """날짜 변경 시 전날 마무리: 마지막 폴링 이후 자정까지의 행을 반영해 적재하고 재집계 보정 예약"""
+        previous_day = self.day
+        await self.tail()
+        await self.flush()
+        if self.rollover_grace:
+            self.pending_rollover = (previous_day, time.monotonic() + self.rollover_grace)
+
+    async def _reaggregate_previous_day(self):
+        """자정 이후 늦게 커밋된 전날 행까지 반영하도록 전날을 원천 재집계"""
+        previous_day, _ = self.pending_rollover
+        planner = await get_aggregation_planner()
+        results = await planner.run(previous_day.isoformat(), previous_day.isoformat())
+        self.pending_rollover = None
+        affected = {name: result.get("affected_rows") for name, result in results.items()}
+        logger.info(f"⚡ [Live] {previous_day} 전날 재집계 보정 - {affected}")
+
+    async def _run(self):
+        # 신규 행 반영/주기 적재는 scheduled 레인 (API 조회가 먼저 연결을 받음)
+        current_lane.set(SCHEDULED)
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                if self.day != date.today():
+                    # 날짜가 바뀌면 전날 최종값을 적재한 뒤 오늘 기준으로 재초기화
+                    # (실패하면 self.day 가 그대로라 다음 폴링에서 다시 마무리)
+                    if self.day is not None:
+                        await self._roll_over()
+                    await self.seed()
+                elif self.reseed_interval and time.monotonic() - self.last_seed >= self.reseed_interval:
+                    # 워터마크 이전 시각으로 늦게 도착/수정된 행 보정
+                    await self.seed()
+                else:
+                    await self.tail()
+
+                if time.monotonic() - self.last_flush >= self.flush_interval:
+                    await self.flush()
+
+                if self.pending_rollover and time.monotonic() >= self.pending_rollover[1]:
+                    await self._reaggregate_previous_day()
+            except Exception as e:
+                logger.error(f"❌ [Live] 실시간 집계 갱신 실패: {str(e)}")
+
+    async def start(self):
+        """초기화 후 주기 갱신 태스크 시작"""
+        try:
+            await self.seed()
+        except Exception as e:
+            logger.error(f"❌ [Live] 초기화 실패 (주기 갱신에서 재시도): {str(e)}")
+            self.day = None
+        self.last_flush = time.monotonic()
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """주기 갱신 태스크 중지"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+# 전역 인스턴스
+_live_aggregate_service = None
+
+def get_live_aggregate_service_instance() -> LiveAggregateService:
+    """Live Aggregate Service 전역 인스턴스 (lifespan 에서 시작/종료)"""
+    global _live_aggregate_service
+    if _live_aggregate_service is None:
+        from app.core.database import db_manager
+        _live_aggregate_service = LiveAggregateService(db_manager)
+    return _live_aggregate_service
+
+async def get_live_aggregate_service():
+    """Live Aggregate Service 의존성 주입"""
+    return get_live_aggregate_service_instance()
@@ -0,0 +1,390 @@
+"""
+파티션 관리 서비스
+시간 컬럼(ymdhms / tm / use_time / V_TIME) 기준 월 단위 RANGE COLUMNS 파티션을
+소스 테이블과 tb_ai_* 테이블에 구성하고, 다가올 월 파티션을 미리 생성하며,
+서비스 쿼리의 EXPLAIN PARTITIONS 결과로 파티션 프루닝 여부를 보고
+
+파티션 구성:
+    p_old  : 최초 데이터 월 이전 전체
+    pYYYYMM: 해당 월 (VALUES LESS THAN 다음 달 1일)
+    pmax   : 미리 생성한 마지막 월 이후 전체 (MAXVALUE)
+"""
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.priority_lanes import SCHEDULED, current_lane
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class PartitionSpec:
+    """
+    파티션 대상 테이블 정의
+
+    Attributes:
+        key: settings.table_names 의 키
+        column: 파티션 키(시간) 컬럼
+        value_format: 파티션 경계값 형식 (DATETIME 컬럼은 '%Y-%m-%d', V_TIME 문자열은 '%Y%m%d')
+    """
+    key: str
+    column: str
+    value_format: str = '%Y-%m-%d'
+
+    @property
+    def table(self) -> str:
+        return settings.table_names[self.key]
+
+
+PARTITION_SPECS: Dict[str, PartitionSpec] = {
+    spec.key: spec for spec in [
+        # 소스 테이블
+        PartitionSpec('solar_day', 'ymdhms'),
+        PartitionSpec('weather_info', 'tm'),
+        PartitionSpec('smarteye_day', 'use_time'),
+        PartitionSpec('bms_daily_stat', 'V_TIME', '%Y%m%d'),
+        # AI 테이블
+        PartitionSpec('ai_solar_power', 'ymdhms'),
+        PartitionSpec('ai_ess_charge_amt', 'ymdhms'),
+        PartitionSpec('ai_pwr_usage', 'ymdhms'),
+    ]
+}
+
+
+def _month_start(value: date) -> date:
+    return date(value.year, value.month, 1)
+
+
+def _next_month(value: date) -> date:
+    return date(value.year + value.month // 12, value.month % 12 + 1, 1)
+
+
+def _add_months(value: date, months: int) -> date:
+    for _ in range(months):
+        value = _next_month(value)
+    return value
+
+
+def _parse_bound(description: str, spec: PartitionSpec) -> Optional[date]:
+    """information_schema 의 PARTITION_DESCRIPTION ('2025-02-01' / MAXVALUE) 을 날짜로 변환"""
+    value = description.strip().strip("'")
+    if value.upper() == 'MAXVALUE':
+        return None
+    return datetime.strptime(value[:10] if spec.value_format == '%Y-%m-%d' else value[:8], spec.value_format).date()
+
+
+def _partition_clause(spec: PartitionSpec, month: date) -> str:
+    """month 한 달에 해당하는 파티션 정의"""
+    bound = _next_month(month).strftime(spec.value_format)
+    return f"PARTITION p{month.strftime('%Y%m')} VALUES LESS THAN ('{bound}')"
+
+
+class PartitionService:
+    """월 단위 파티션 구성/사전 생성/프루닝 보고 클래스"""
+
+    def __init__(self, db_manager):
+        """
+        Args:
+            db_manager: DatabaseManager 인스턴스
+        """
+        self.db = db_manager
+        self.months_ahead = settings.PARTITION_MONTHS_AHEAD
+        self.interval = settings.PARTITION_MAINTENANCE_INTERVAL_SECONDS
+        self._task: Optional[asyncio.Task] = None
+
+    async def _execute(self, func):
+        """연결 하나에서 동기 함수 실행"""
+        async with self.db.get_async_connection('partition') as connection:
+            return await self.db.run_in_executor(func, connection)
+
+    def _inspect(self, connection, spec: PartitionSpec) -> Dict[str, Any]:
+        """테이블 파티션 상태 조회 (동기)"""
+        cursor = connection.cursor()
+        try:
+            cursor.execute("""
+            SELECT PARTITION_NAME, PARTITION_METHOD, PARTITION_EXPRESSION, PARTITION_DESCRIPTION, TABLE_ROWS
+            FROM information_schema.PARTITIONS
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+            ORDER BY PARTITION_ORDINAL_POSITION
+            """, [spec.table])
+            rows = cursor.fetchall()
+            if not rows:
+                return {"table": spec.table, "column": spec.column, "exists": False}
+
+            # 파티션 키는 모든 PRIMARY/UNIQUE 키에 포함되어야 함
+            cursor.execute("""
+            SELECT INDEX_NAME, GROUP_CONCAT(COLUMN_NAME ORDER BY SEQ_IN_INDEX)
+            FROM information_schema.STATISTICS
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND NON_UNIQUE = 0
+            GROUP BY INDEX_NAME
+            """, [spec.table])
+            unique_keys = {name: columns.split(',') for name, columns in cursor.fetchall()}
+        finally:
+            cursor.close()
+
+        partitioned = rows[0][0] is not None
+        expression = (rows[0][2] or '').replace('`', '').strip() if partitioned else None
+        partitions = [
+            {"name": name, "bound": description, "rows": table_rows}
+            for name, _, _, description, table_rows in rows
+        ] if partitioned else []
+        incompatible = [name for name, columns in unique_keys.items() if spec.column not in columns]
+
+        return {
+            "table": spec.table,
+            "column": spec.column,
+            "exists": True,
+            "partitioned": partitioned,
+            "method": rows[0][1],
+            "expression": expression,
+            "managed": partitioned and rows[0][1] == 'RANGE COLUMNS' and expression == spec.column,
+            "partitions": partitions,
+            "incompatible_keys": incompatible,
+            "rows": sum(row[4] or 0 for row in rows),
+        }
+
+    async def status(self) -> List[Dict[str, Any]]:
+        """
+        대상 테이블별 파티션 상태 조회
+
+        Returns:
+            List[Dict]: table, partitioned, managed(월 단위 RANGE COLUMNS 여부), partitions, incompatible_keys
+        """
+        def _fetch(connection):
+            return [self._inspect(connection, spec) for spec in PARTITION_SPECS.values()]
+
+        return await self._execute(_fetch)
+
+    def _convert_sql(self, connection, spec: PartitionSpec, months_ahead: int) -> Tuple[Optional[str], str]:
+        """비파티션 테이블을 월 단위 파티션으로 전환하는 ALTER 문 생성 (동기)"""
+        info = self._inspect(connection, spec)
+        if not info["exists"]:
+            return None, "테이블이 존재하지 않습니다"
+        if info["partitioned"]:
+            return None, f"이미 파티션 구성됨 ({info['method']} {info['expression']})"
+        if info["incompatible_keys"]:
+            return None, f"파티션 키 {spec.column} 이(가) 고유 키 {info['incompatible_keys']} 에 포함되어 있지 않습니다"
+
+        cursor = connection.cursor()
+        try:
+            cursor.execute(f"SELECT MIN({spec.column}) FROM {spec.table}")
+            oldest = cursor.fetchone()[0]
+        finally:
+            cursor.close()
+
+        if oldest is None:
+            first = _month_start(date.today())
+        elif isinstance(oldest, str):
+            first = _month_start(datetime.strptime(oldest[:8] if spec.value_format == '%Y%m%d' else oldest[:10],
+                                                   spec.value_format).date())
+        else:
+            first = _month_start(oldest if isinstance(oldest, date) else oldest.date())
+
+        last = _add_months(_month_start(date.today()), months_ahead)
+        clauses = [f"PARTITION p_old VALUES LESS THAN ('{first.strftime(spec.value_format)}')"]
+        month = first
+        while month <= last:
+            clauses.append(_partition_clause(spec, month))
+            month = _next_month(month)
+        clauses.append("PARTITION pmax VALUES LESS THAN (MAXVALUE)")
+
+        sql = (f"ALTER TABLE {spec.table} PARTITION BY RANGE COLUMNS({spec.column}) (\n    "
+               + ",\n    ".join(clauses) + "\n)")
+        return sql, f"{first:%Y-%m} ~ {last:%Y-%m} 월 파티션 {len(clauses) - 2}개로 전환"
+
+    def _precreate_sql(self, connection, spec: PartitionSpec, months_ahead: int) -> Tuple[Optional[str], str]:
+        """파티션 테이블에 다가올 월 파티션을 추가하는 ALTER 문 생성 (동기)"""
+        info = self._inspect(connection, spec)
+        if not info["exists"] or not info["partitioned"]:
+            return None, "파티션 구성되지 않은 테이블입니다"
+        if not info["managed"]:
+            return None, f"관리 대상 형식이 아닙니다 ({info['method']} {info['expression']})"
+
+        bounds = [_parse_bound(p["bound"], spec) for p in info["partitions"]]
+        has_max = None in bounds
+        last_bound = max((bound for bound in bounds if bound is not None), default=None)
+        target = _next_month(_add_months(_month_start(date.today()), months_ahead))
+        if last_bound is not None and last_bound >= target:
+            return None, f"이미 {last_bound:%Y-%m-%d} 까지 파티션이 있습니다"
+
+        month = last_bound or _month_start(date.today())
+        clauses = []
+        while month < target:
+            clauses.append(_partition_clause(spec, month))
+            month = _next_month(month)
+
+        if has_max:
+            # MAXVALUE 파티션을 분할 (pmax 는 미래 구간이므로 보통 비어 있어 재구성 비용이 작음)
+            max_name = info["partitions"][bounds.index(None)]["name"]
+            clauses.append(f"PARTITION {max_name} VALUES LESS THAN (MAXVALUE)")
+            sql = (f"ALTER TABLE {spec.table} REORGANIZE PARTITION {max_name} INTO (\n    "
+                   + ",\n    ".join(clauses) + "\n)")
+        else:
+            sql = f"ALTER TABLE {spec.table} ADD PARTITION (\n    " + ",\n    ".join(clauses) + "\n)"
+        return sql, f"{target:%Y-%m-%d} 이전까지 월 파티션 {len(clauses) - int(has_max)}개 추가"
+
+    async def _apply(self, builder, table_keys: Optional[List[str]], months_ahead: Optional[int],
+                     dry_run: bool) -> List[Dict[str, Any]]:
+        specs = [PARTITION_SPECS[key] for key in (table_keys or PARTITION_SPECS)]
+        months_ahead = self.months_ahead if months_ahead is None else months_ahead
+
+        def _run(connection):
+            results = []
+            for spec in specs:
+                result = {"table": spec.table, "sql": None, "applied": False}
+                try:
+                    sql, message = builder(connection, spec, months_ahead)
+                    result.update({"sql": sql, "message": message})
+                    if sql and not dry_run:
+                        cursor = connection.cursor()
+                        try:
+                            cursor.execute(sql)
+                        finally:
+                            cursor.close()
+                        result["applied"] = True
+                        logger.info(f"🗂️ [Partition] {spec.table} - {message}")
+                except Exception as e:
+                    logger.error(f"❌ [Partition] {spec.table} 처리 실패: {str(e)}")
+                    result["message"] = f"처리 실패: {str(e)}"
+                results.append(result)
+            return results
+
+        return await self._execute(_run)
+
+    async def convert(self, table_keys: Optional[List[str]] = None, months_ahead: Optional[int] = None,
+                      dry_run: bool = True) -> List[Dict[str, Any]]:
+        """
+        비파티션 테이블을 월 단위 RANGE COLUMNS 파티션으로 전환
+        (테이블 전체를 재작성하므로 운영 중에는 dry_run 으로 SQL 을 확인한 뒤 점검 시간에 실행)
+
+        Args:
+            table_keys: PARTITION_SPECS 키 목록 (None 이면 전체)
+            months_ahead: 이번 달 이후 미리 만들 월 수 (None 이면 PARTITION_MONTHS_AHEAD)
+            dry_run: True 면 ALTER 문만 반환
+
+        Returns:
+            List[Dict]: table, sql, applied, message
+        """
+        return await self._apply(self._convert_sql, table_keys, months_ahead, dry_run)
+
+    async def precreate(self, table_keys: Optional[List[str]] = None, months_ahead: Optional[int] = None,
+                        dry_run: bool = False) -> List[Dict[str, Any]]:
+        """
+        파티션 테이블에 이번 달 + months_ahead 개월까지의 월 파티션을 미리 생성
+
+        Args:
+            table_keys: PARTITION_SPECS 키 목록 (None 이면 전체)
+            months_ahead: 이번 달 이후 미리 만들 월 수 (None 이면 PARTITION_MONTHS_AHEAD)
+            dry_run: True 면 ALTER 문만 반환
+
+        Returns:
+            List[Dict]: table, sql, applied, message
+        """
+        return await self._apply(self._precreate_sql, table_keys, months_ahead, dry_run)
+
+    async def _service_queries(self, start_date: str, end_date: str) -> List[Tuple[str, str, List[Any]]]:
+        """프루닝 보고 대상 서비스 쿼리 목록 (이름, 쿼리, 파라미터)"""
+        from app.services.aggregation_planner import build_plan
+        from app.services.aggregation_specs import TARGET_SPECS
+        from app.services.ess_charge_service import get_ess_charge_service
+        from app.services.feature_service import get_feature_service
+
+        ess_charge_service = await get_ess_charge_service()
+        feature_service = await get_feature_service()
+
+        queries = [
+            (f"planner:{source}", plan.build_query(), [start_date, end_date])
+            for source, plan in build_plan(TARGET_SPECS).items()
+        ]
+        queries.append(("ess_charge", *ess_charge_service._build_read_query(start_date, end_date)))
+        queries.append(("features", *feature_service._build_query(start_date, end_date)))
+        return queries
+
+    async def explain(self, start_date: str, end_date: str) -> List[Dict[str, Any]]:
+        """
+        서비스 쿼리별 EXPLAIN PARTITIONS 결과로 파티션 프루닝 여부 보고
+
+        Args:
+            start_date: 시작 날짜 (YYYY-MM-DD)
+            end_date: 종료 날짜 (YYYY-MM-DD, 포함)
+
+        Returns:
+            List[Dict]: query, plan(테이블별 접근 파티션/접근 방식/예상 행 수)
+        """
+        queries = await self._service_queries(start_date, end_date)
+
+        def _run(connection):
+            report = []
+            cursor = connection.cursor()
+            try:
+                for name, query, params in queries:
+                    try:
+                        cursor.execute("EXPLAIN PARTITIONS " + query, params)
+                        columns = [column[0] for column in cursor.description]
+                        plan = []
+                        for row in cursor.fetchall():
+                            record = dict(zip(columns, row))
+                            partitions = record.get("partitions")
+                            plan.append({
+                                "table": record.get("table"),
+                                "partitions": partitions.split(',') if partitions else None,
+                                "type": record.get("type"),
+                                "key": record.get("key"),
+                                "rows": record.get("rows"),
+                            })
+                        report.append({"query": name, "plan": plan})
+                    except Exception as e:
+                        report.append({"query": name, "error": str(e)})
+            finally:
+                cursor.close()
+            return report
+
+        return await self._execute(_run)
+
+    async def _run(self):
+        # 파티션 사전 생성 DDL 은 scheduled 레인
+        current_lane.set(SCHEDULED)
+        while True:
+            try:
+                # 여러 워커가 같은 DDL 을 동시에 실행하지 않도록 하루 단위 락으로 한 곳에서만 실행
+                async with self.db.aggregation_locks(['partition_maintenance'], date.today().isoformat()) as acquired:
+                    if acquired:
+                        await self.precreate()
+            except Exception as e:
+                logger.error(f"❌ [Partition] 파티션 사전 생성 실패: {str(e)}")
+            await asyncio.sleep(self.interval)
+
+    async def start(self):
+        """주기적 파티션 사전 생성 태스크 시작"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+            logger.info(f"🗂️ [Partition] 사전 생성 태스크 시작 ({self.months_ahead}개월 앞, {self.interval}초 주기)")
+
+    async def stop(self):
+        """주기적 파티션 사전 생성 태스크 중지"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+# 전역 인스턴스
+_partition_service = None
+
+def get_partition_service_instance() -> PartitionService:
+    """Partition Service 전역 인스턴스 (lifespan / CLI 에서 사용)"""
+    global _partition_service
+    if _partition_service is None:
+        from app.core.database import db_manager
+        _partition_service = PartitionService(db_manager)
+    return _partition_service
+
+async def get_partition_service():
+    """Partition Service 의존성 주입"""
+    return get_partition_service_instance()
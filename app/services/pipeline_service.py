@@ -0,0 +1,81 @@
+"""
+통합 집계 파이프라인
+Solar Power / Power Usage / ESS Predict 를 공유 스캔 플래너로 집계한 뒤
+그 결과(tb_ai_*)를 사용하는 ESS Charge 를 집계
+"""
+import logging
+from typing import Any, Dict
+
+from app.services.aggregation_planner import AggregationPlanner, get_aggregation_planner
+from app.services.ess_charge_service import ESSChargeService, get_ess_charge_service
+
+logger = logging.getLogger(__name__)
+
+# 공유 스캔 플래너로 처리하는 대상 (소스 테이블 직접 집계)
+PLANNED_TARGETS = ["solar_power", "power_usage", "ess_predict"]
+
+# 파이프라인 전체 서비스 (응답 순서)
+PIPELINE_SERVICES = PLANNED_TARGETS + ["ess_charge"]
+
+
+class AggregationPipeline:
+    """통합 집계 파이프라인 클래스"""
+
+    def __init__(self, planner: AggregationPlanner, ess_charge_service: ESSChargeService):
+        """
+        Args:
+            planner: AggregationPlanner 인스턴스
+            ess_charge_service: ESSChargeService 인스턴스
+        """
+        self.planner = planner
+        self.ess_charge_service = ess_charge_service
+
+    async def run(self, start_date: str, end_date: str) -> Dict[str, Dict[str, Any]]:
+        """
+        날짜 범위(하루면 start_date == end_date)의 모든 서비스 집계 및 적재
+
+        Args:
+            start_date: 시작 날짜 (YYYY-MM-DD)
+            end_date: 종료 날짜 (YYYY-MM-DD, 포함)
+
+        Returns:
+            Dict: 서비스 이름 → 결과 정보 (success, affected_rows, target_date, message)
+        """
+        period = start_date if start_date == end_date else f"{start_date} ~ {end_date}"
+
+        # Solar Power, Power Usage, ESS Predict 집계 (tb_solar_day / tb_weather_info / tb_aggregate_smarteye_day 각 1회 스캔)
+        results = await self.planner.run(start_date, end_date, targets=PLANNED_TARGETS)
+        for name in PLANNED_TARGETS:
+            if results[name]["success"]:
+                logger.info(f"✅ [{name}] {results[name]['message']}")
+            else:
+                logger.error(f"❌ [{name}] {results[name]['message']}")
+
+        # ESS Charge 집계 (위에서 적재된 tb_ai_solar_power, tb_ai_pwr_usage, tb_nrt_bms_daily_stat 사용)
+        try:
+            results["ess_charge"] = await self.ess_charge_service.aggregate_range(start_date, end_date)
+            logger.info(f"✅ [ESS Charge] 완료: 영향받은 행 {results['ess_charge'].get('affected_rows', 0)}")
+        except Exception as e:
+            logger.error(f"❌ [ESS Charge] 실패: {str(e)}")
+            results["ess_charge"] = {
+                "success": False,
+                "error_class": type(e).__name__,
+                "affected_rows": 0,
+                "target_date": period,
+                "message": f"ESS Charge 집계 실패: {str(e)}"
+            }
+
+        return results
+
+# 전역 인스턴스
+_aggregation_pipeline = None
+
+async def get_aggregation_pipeline():
+    """Aggregation Pipeline 의존성 주입"""
+    global _aggregation_pipeline
+    if _aggregation_pipeline is None:
+        _aggregation_pipeline = AggregationPipeline(
+            await get_aggregation_planner(),
+            await get_ess_charge_service()
+        )
+    return _aggregation_pipeline
@@ -2,11 +2,12 @@
 전력 사용량 데이터 집계 서비스
 tb_ai_pwr_usage 테이블에 데이터 적재
 """
-import asyncio
 import logging
 import pymysql.cursors
-from typing import Dict, Any, List
+from typing import Dict, Any
 from app.core.config import settings
+from app.core.records import empty_columnar, rows_to_columnar
+from app.services.run_history_service import track_run
 
 logger = logging.getLogger(__name__)
 
@@ -38,6 +39,24 @@ class PowerUsageService:
         Returns:
             Dict: 결과 정보 (success, inserted_count, target_date, message)
         """
+        # 실행 이력(소요 시간/영향받은 행 수) 기록
+        with track_run('power_usage', target_date) as run:
+            # 다른 워커/노드가 같은 (서비스, 날짜)를 집계 중이면 중복 UPSERT 없이 건너뜀
+            async with self.db.aggregation_locks(['power_usage'], target_date) as acquired:
+                if not acquired:
+                    run.result = {
+                        "success": False,
+                        "error_class": "AggregationLockBusy",
+                        "affected_rows": 0,
+                        "target_date": target_date,
+                        "message": f"{target_date} 날짜의 Power Usage 데이터는 다른 프로세스에서 집계 중입니다"
+                    }
+                    return run.result
+                run.result = await self._aggregate_and_insert(target_date)
+                return run.result
+
+    async def _aggregate_and_insert(self, target_date: str) -> Dict[str, Any]:
+        """락 획득 후 집계 및 적재 실행"""
         logger.info(f"📊 [Power Usage] 데이터 집계 및 적재 시작 - {target_date}")
 
         try:
@@ -55,7 +74,7 @@ class PowerUsageService:
             WHERE use_time >= %s AND use_time < DATE_ADD(%s, INTERVAL 1 DAY)
             """
 
-            async with self.db.get_async_connection() as connection:
+            async with self.db.get_async_connection('power_usage') as connection:
                 def _check():
                     cursor = connection.cursor(pymysql.cursors.DictCursor)
                     try:
@@ -65,7 +84,7 @@ class PowerUsageService:
                     finally:
                         cursor.close()
 
-                check_result = await asyncio.get_event_loop().run_in_executor(None, _check)
+                check_result = await self.db.run_in_executor(_check)
                 logger.info(f"🔍 [Power Usage] 소스 데이터 확인 - 건수: {check_result['cnt']}, "
                            f"최소시간: {check_result['min_time']}, 최대시간: {check_result['max_time']}")
 
@@ -94,23 +113,23 @@ class PowerUsageService:
 
             logger.info(f"🔍 [Power Usage] 파라미터: {params}")
 
-            async with self.db.get_async_connection() as connection:
-                def _execute():
-                    cursor = connection.cursor()
-                    try:
-                        cursor.execute(query, params)
-                        connection.commit()
-                        affected_rows = cursor.rowcount
-                        # ON DUPLICATE KEY UPDATE의 rowcount:
-                        # 1 = 새로운 행 삽입
-                        # 2 = 기존 행 업데이트
-                        # 0 = 업데이트했지만 값 변화 없음
-                        logger.info(f"✅ [Power Usage] rowcount: {affected_rows} (1=INSERT, 2=UPDATE, 0=변화없음)")
-                        return affected_rows
-                    finally:
-                        cursor.close()
-
-                affected_rows = await asyncio.get_event_loop().run_in_executor(None, _execute)
+            def _execute(connection):
+                cursor = connection.cursor()
+                try:
+                    cursor.execute(query, params)
+                    connection.commit()
+                    affected_rows = cursor.rowcount
+                    # ON DUPLICATE KEY UPDATE의 rowcount:
+                    # 1 = 새로운 행 삽입
+                    # 2 = 기존 행 업데이트
+                    # 0 = 업데이트했지만 값 변화 없음
+                    logger.info(f"✅ [Power Usage] rowcount: {affected_rows} (1=INSERT, 2=UPDATE, 0=변화없음)")
+                    return affected_rows
+                finally:
+                    cursor.close()
+
+            # 대상 테이블별 직렬화 + 데드락/락 대기 시 재시도
+            affected_rows = await self.db.execute_write(self.ai_pwr_usage_table, _execute, target_date, 'power_usage')
 
             if affected_rows == 0 and check_result['cnt'] > 0:
                 logger.warning(f"⚠️ [Power Usage] 소스 데이터({check_result['cnt']}건)는 있지만 값 변화 없음 - 동일한 데이터가 이미 존재")
@@ -129,12 +148,13 @@ class PowerUsageService:
             logger.error(f"❌ [Power Usage] 데이터 집계 및 적재 실패: {str(e)}")
             return {
                 "success": False,
+                "error_class": type(e).__name__,
                 "affected_rows": 0,
                 "target_date": target_date,
                 "message": f"Power Usage 데이터 적재 중 오류 발생: {str(e)}"
             }
 
-    async def verify_data(self, limit: int = 10) -> List[Dict[str, Any]]:
+    async def verify_data(self, limit: int = 10) -> Dict[str, Any]:
         """
         적재된 데이터 확인
 
@@ -142,34 +162,34 @@ class PowerUsageService:
             limit: 조회할 레코드 수
 
         Returns:
-            List[Dict]: 적재된 데이터 리스트
+            Dict: columns, rows (columns 순서의 행 행렬), count
         """
         query = f"""
         SELECT
-            ymdhms, pwr_usage, pwr_forecase
-        FROM {self.ai_pwr_usage_table}
-        ORDER BY ymdhms DESC
+            DATE_FORMAT(t.ymdhms, '%%Y-%%m-%%d %%H:%%i:%%s') AS ymdhms, t.pwr_usage, t.pwr_forecase
+        FROM {self.ai_pwr_usage_table} t
+        ORDER BY t.ymdhms DESC
         LIMIT %s
         """
 
         try:
-            async with self.db.get_async_connection() as connection:
+            async with self.db.get_async_connection('verify') as connection:
                 def _fetch():
-                    cursor = connection.cursor(pymysql.cursors.DictCursor)
+                    # 튜플 커서 결과를 행 행렬 그대로 반환 (datetime 포맷은 SQL 에서 처리)
+                    cursor = connection.cursor()
                     try:
                         cursor.execute(query, (limit,))
-                        results = cursor.fetchall()
-                        return results
+                        return rows_to_columnar(cursor.description, cursor.fetchall())
                     finally:
                         cursor.close()
 
-                results = await asyncio.get_event_loop().run_in_executor(None, _fetch)
-                logger.info(f"📊 [Power Usage] 최근 {len(results)}건의 데이터 조회 완료")
+                results = await self.db.run_in_executor(_fetch)
+                logger.info(f"📊 [Power Usage] 최근 {results['count']}건의 데이터 조회 완료")
                 return results
 
         except Exception as e:
             logger.error(f"❌ [Power Usage] 데이터 조회 실패: {str(e)}")
-            return []
+            return empty_columnar()
 
 # 전역 인스턴스
 _power_usage_service = None
@@ -0,0 +1,377 @@
+"""
+집계 실행 이력 서비스
+서비스별 집계 실행(대상 날짜, 소요 시간, 영향받은 행 수, 성공 여부, 오류 종류)을 메모리에 모았다가
+행 수/주기 임계치에서 tb_ai_run_history 에 다중 행 INSERT 로 비동기 적재하고,
+기간별 소요 시간 백분위수와 추세를 조회 (소스 테이블 증가에 따른 점진적 성능 저하 확인용)
+"""
+import asyncio
+import logging
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Any, Deque, Dict, List, Optional, Sequence, Tuple
+
+from app.core.config import settings
+from app.core.priority_lanes import SCHEDULED, current_lane
+
+logger = logging.getLogger(__name__)
+
+PERCENTILES = (50, 90, 95, 99)
+
+
+def percentile(values: Sequence[float], pct: float) -> Optional[float]:
+    """정렬된 값 목록의 백분위수 (선형 보간, 값이 없으면 None)"""
+    if not values:
+        return None
+    position = (len(values) - 1) * pct / 100
+    lower = int(position)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+
+def _slope(points: List[Tuple[float, float]]) -> Optional[float]:
+    """(x, y) 점들의 최소제곱 기울기 (점이 2개 미만이거나 x 가 모두 같으면 None)"""
+    if len(points) < 2:
+        return None
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    denominator = sum((x - mean_x) ** 2 for x, _ in points)
+    if denominator == 0:
+        return None
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / denominator
+
+
+def _round(value: Optional[float], digits: int = 1) -> Optional[float]:
+    return round(value, digits) if value is not None else None
+
+
+class track_run:
+    """
+    집계 실행 하나의 소요 시간을 재어 이력에 기록하는 컨텍스트 관리자
+
+    블록 안에서 `run.result` 에 결과 딕셔너리를 넣으면 success / affected_rows / error_class 를 기록하고,
+    예외로 빠져나가면 예외 클래스 이름을 오류 종류로 기록 (예외는 그대로 전파)
+    """
+
+    def __init__(self, service: str, start_date: str, end_date: Optional[str] = None):
+        self.service = service
+        self.start_date = start_date
+        self.end_date = end_date or start_date
+        self.result: Optional[Dict[str, Any]] = None
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        get_run_history_service_instance().record(
+            self.service, self.start_date, self.end_date, time.perf_counter() - self.started,
+            self.result, exc_type.__name__ if exc_type else None
+        )
+        return False
+
+
+class RunHistoryService:
+    """집계 실행 이력 버퍼링/적재 및 통계 조회 클래스"""
+
+    def __init__(self, db_manager):
+        """
+        Args:
+            db_manager: DatabaseManager 인스턴스
+        """
+        self.db = db_manager
+        self.table = settings.table_names['run_history']
+        self.flush_rows = max(1, settings.RUN_HISTORY_FLUSH_ROWS)
+        self.flush_interval = settings.RUN_HISTORY_FLUSH_INTERVAL_SECONDS
+        self.max_buffer_rows = max(self.flush_rows, settings.RUN_HISTORY_BUFFER_MAX_ROWS)
+
+        self.rows: Deque[Tuple[Any, ...]] = deque()
+        self.stats = {"recorded": 0, "flushed": 0, "flushes": 0, "dropped": 0, "failures": 0}
+        self._lock = asyncio.Lock()
+        self._table_ready = False
+        self._task: Optional[asyncio.Task] = None
+        self._pending: set = set()
+
+    async def _execute(self, func):
+        """연결 하나에서 동기 함수 실행"""
+        async with self.db.get_async_connection('run_history') as connection:
+            return await self.db.run_in_executor(func, connection)
+
+    async def ensure_table(self):
+        """이력 테이블 생성 (없는 경우)"""
+        if self._table_ready:
+            return
+
+        def _create(connection):
+            cursor = connection.cursor()
+            try:
+                cursor.execute(f"""
+                CREATE TABLE IF NOT EXISTS {self.table} (
+                    id BIGINT NOT NULL AUTO_INCREMENT PRIMARY KEY,
+                    service VARCHAR(32) NOT NULL,
+                    start_date DATE NOT NULL,
+                    end_date DATE NOT NULL,
+                    days INT NOT NULL,
+                    started_at DATETIME(3) NOT NULL,
+                    duration_ms INT NOT NULL,
+                    affected_rows INT NOT NULL DEFAULT 0,
+                    success TINYINT(1) NOT NULL,
+                    error_class VARCHAR(64) NULL,
+                    KEY idx_service_started (service, started_at),
+                    KEY idx_started (started_at)
+                )
+                """)
+                connection.commit()
+            finally:
+                cursor.close()
+
+        await self._execute(_create)
+        self._table_ready = True
+
+    def record(self, service: str, start_date: str, end_date: str, duration_seconds: float,
+               result: Optional[Dict[str, Any]] = None, error_class: Optional[str] = None):
+        """
+        실행 이력 한 건을 버퍼에 추가 (DB 접근 없음, 시작되지 않았거나 비활성이면 무시)
+
+        Args:
+            service: 서비스 이름 (solar_power, power_usage, ess_predict, ess_charge)
+            start_date: 시작 날짜 (YYYY-MM-DD)
+            end_date: 종료 날짜 (YYYY-MM-DD, 포함)
+            duration_seconds: 소요 시간 (초)
+            result: 서비스 결과 딕셔너리 (success, affected_rows, error_class)
+            error_class: 예외로 끝난 경우 예외 클래스 이름
+        """
+        if self._task is None or not settings.RUN_HISTORY_ENABLED:
+            return
+
+        result = result or {}
+        success = error_class is None and bool(result.get("success"))
+        if not success and error_class is None:
+            error_class = result.get("error_class") or "Failed"
+
+        try:
+            days = (datetime.strptime(end_date, '%Y-%m-%d') - datetime.strptime(start_date, '%Y-%m-%d')).days + 1
+        except ValueError:
+            return
+
+        if len(self.rows) >= self.max_buffer_rows:
+            self.rows.popleft()
+            self.stats["dropped"] += 1
+        self.rows.append((
+            service, start_date, end_date, days,
+            datetime.now() - timedelta(seconds=duration_seconds),
+            int(duration_seconds * 1000), int(result.get("affected_rows") or 0),
+            1 if success else 0, None if success else error_class[:64]
+        ))
+        self.stats["recorded"] += 1
+
+        if len(self.rows) >= self.flush_rows:
+            task = asyncio.create_task(self._safe_flush())
+            self._pending.add(task)
+            task.add_done_callback(self._pending.discard)
+
+    async def start(self):
+        """주기적 플러시 태스크 시작"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._flush_loop())
+            logger.info(f"🗂️ [RunHistory] 이력 기록 시작 (행 {self.flush_rows}건 / {self.flush_interval}초 주기)")
+
+    async def stop(self):
+        """플러시 태스크 중지 후 남은 이력 적재"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+        await self._safe_flush()
+        logger.info("🗂️ [RunHistory] 종료 전 이력 플러시 완료")
+
+    async def _flush_loop(self):
+        # 이력 적재는 scheduled 레인
+        current_lane.set(SCHEDULED)
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self._safe_flush()
+
+    async def _safe_flush(self):
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.error(f"❌ [RunHistory] 이력 적재 실패 (대기 {len(self.rows)}건): {str(e)}")
+
+    async def flush(self) -> int:
+        """
+        버퍼의 이력을 다중 행 INSERT 로 적재 (실패 시 버퍼 앞쪽에 되돌려 다음 플러시에서 재시도)
+
+        Returns:
+            int: 적재한 이력 수
+        """
+        async with self._lock:
+            if not self.rows:
+                return 0
+            rows = list(self.rows)
+            self.rows.clear()
+
+            query = f"""
+            INSERT INTO {self.table}
+                (service, start_date, end_date, days, started_at, duration_ms, affected_rows, success, error_class)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+            """
+
+            def _insert(connection):
+                cursor = connection.cursor()
+                try:
+                    for offset in range(0, len(rows), self.flush_rows):
+                        cursor.executemany(query, rows[offset:offset + self.flush_rows])
+                    connection.commit()
+                finally:
+                    cursor.close()
+
+            try:
+                await self.ensure_table()
+                await self._execute(_insert)
+            except Exception:
+                self.stats["failures"] += 1
+                room = max(0, self.max_buffer_rows - len(self.rows))
+                self.rows.extendleft(reversed(rows[-room:] if room else []))
+                self.stats["dropped"] += len(rows) - min(room, len(rows))
+                raise
+
+            self.stats["flushed"] += len(rows)
+            self.stats["flushes"] += 1
+            return len(rows)
+
+    async def get_stats(self, hours: int, bucket_hours: int,
+                        service: Optional[str] = None) -> Dict[str, Any]:
+        """
+        최근 hours 시간 동안의 서비스별 소요 시간 백분위수와 추세 조회
+
+        소요 시간 통계는 성공한 실행만 대상으로 하고, 추세는 실행 범위 길이의 영향을 없애기 위해
+        대상 1일당 소요 시간(ms_per_day)으로 계산
+
+        Args:
+            hours: 조회 기간 (현재 시각 기준 과거 시간 수)
+            bucket_hours: 추세 구간 크기 (시간)
+            service: 서비스 이름 (None 이면 전체)
+
+        Returns:
+            Dict: window, writer(버퍼 상태), services(서비스별 summary / trend)
+        """
+        # 아직 버퍼에 있는 최근 이력도 통계에 포함
+        await self._safe_flush()
+        await self.ensure_table()
+
+        since = datetime.now() - timedelta(hours=hours)
+        query = f"""
+        SELECT service, started_at, duration_ms, affected_rows, success, error_class, days
+        FROM {self.table}
+        WHERE started_at >= %s
+        """
+        params: List[Any] = [since]
+        if service:
+            query += " AND service = %s"
+            params.append(service)
+        query += " ORDER BY started_at"
+
+        def _fetch(connection):
+            cursor = connection.cursor()
+            try:
+                cursor.execute(query, params)
+                return cursor.fetchall()
+            finally:
+                cursor.close()
+
+        rows = await self._execute(_fetch)
+
+        grouped: Dict[str, List[Tuple[Any, ...]]] = {}
+        for row in rows:
+            grouped.setdefault(row[0], []).append(row)
+
+        bucket = timedelta(hours=bucket_hours)
+        return {
+            "window": {"since": since.isoformat(timespec='seconds'), "hours": hours, "bucket_hours": bucket_hours},
+            "writer": {**self.stats, "buffered": len(self.rows)},
+            "services": {
+                name: self._summarize(service_rows, since, bucket)
+                for name, service_rows in sorted(grouped.items())
+            },
+        }
+
+    def _summarize(self, rows: List[Tuple[Any, ...]], since: datetime, bucket: timedelta) -> Dict[str, Any]:
+        successes = [row for row in rows if row[4]]
+        durations = sorted(row[2] for row in successes)
+        errors: Dict[str, int] = {}
+        for row in rows:
+            if not row[4]:
+                errors[row[5] or "Failed"] = errors.get(row[5] or "Failed", 0) + 1
+
+        summary = {
+            "runs": len(rows),
+            "failures": len(rows) - len(successes),
+            "success_rate": round(len(successes) / len(rows), 4) if rows else None,
+            "duration_ms": {
+                **{f"p{pct}": _round(percentile(durations, pct)) for pct in PERCENTILES},
+                "max": durations[-1] if durations else None,
+                "avg": _round(sum(durations) / len(durations)) if durations else None,
+            },
+            "affected_rows": {
+                "total": sum(row[3] for row in successes),
+                "avg": _round(sum(row[3] for row in successes) / len(successes)) if successes else None,
+            },
+            "errors": errors,
+        }
+
+        # 구간별 백분위수 + 대상 1일당 소요 시간의 시간 대비 기울기
+        buckets: Dict[int, List[Tuple[Any, ...]]] = {}
+        for row in successes:
+            buckets.setdefault(int((row[1] - since) / bucket), []).append(row)
+
+        trend = []
+        for index in sorted(buckets):
+            bucket_rows = buckets[index]
+            bucket_durations = sorted(row[2] for row in bucket_rows)
+            per_day = sorted(row[2] / max(1, row[6]) for row in bucket_rows)
+            trend.append({
+                "start": (since + bucket * index).isoformat(timespec='seconds'),
+                "runs": len(bucket_rows),
+                "p50_ms": _round(percentile(bucket_durations, 50)),
+                "p95_ms": _round(percentile(bucket_durations, 95)),
+                "p50_ms_per_day": _round(percentile(per_day, 50)),
+            })
+
+        slope = _slope([
+            ((row[1] - since).total_seconds() / 86400, row[2] / max(1, row[6]))
+            for row in successes
+        ])
+        first, last = (trend[0]["p50_ms_per_day"], trend[-1]["p50_ms_per_day"]) if trend else (None, None)
+
+        return {
+            "summary": summary,
+            "trend": {
+                "buckets": trend,
+                # 달력 1일 경과당 대상 1일 처리 시간(ms) 변화량 (양수면 점점 느려짐)
+                "ms_per_day_slope_per_day": _round(slope, 3),
+                "change_pct": _round((last - first) / first * 100) if len(trend) > 1 and first else None,
+            },
+        }
+
+# 전역 인스턴스
+_run_history_service = None
+
+def get_run_history_service_instance() -> RunHistoryService:
+    """Run History Service 전역 인스턴스 (lifespan 에서 시작/종료)"""
+    global _run_history_service
+    if _run_history_service is None:
+        from app.core.database import db_manager
+        _run_history_service = RunHistoryService(db_manager)
+    return _run_history_service
+
+async def get_run_history_service():
+    """Run History Service 의존성 주입"""
+    return get_run_history_service_instance()
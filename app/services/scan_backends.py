@@ -0,0 +1,230 @@
+"""
+집계 스캔 백엔드
+AggregationPlanner 의 소스 융합 스캔을 실행하는 엔진 (적재는 항상 MariaDB)
+
+- mariadb: 운영 MariaDB 의 소스 테이블을 직접 스캔 (기본값)
+- sqlite: 소스 테이블의 로컬 스냅샷 파일(SQLite)을 스캔
+  다년치 재계산을 운영 DB 스캔 없이 수행하고 결과만 MariaDB 에 다중 행 UPSERT 하거나,
+  MariaDB 없이 개발/벤치마크용으로 집계 명세를 실행할 때 사용
+"""
+import asyncio
+import logging
+import os
+import sqlite3
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
+
+import pymysql.cursors
+
+from app.core.config import settings
+from app.services.aggregation_specs import SOURCE_SPECS, TARGET_SPECS
+
+logger = logging.getLogger(__name__)
+
+ScanResult = Dict[str, Dict[date, Tuple[Any, ...]]]
+
+
+def source_columns(source_name: str) -> List[str]:
+    """스냅샷에 담을 소스 컬럼 (시간 컬럼 + 모든 대상 명세가 참조하는 측정 컬럼)"""
+    columns = sorted({
+        measure.column
+        for target in TARGET_SPECS.values()
+        for measure in target.measures.values()
+        if measure.source == source_name
+    })
+    time_column = SOURCE_SPECS[source_name].time_column
+    return [time_column] + [column for column in columns if column != time_column]
+
+
+def _to_sqlite(value: Any) -> Any:
+    """MariaDB 값을 SQLite 저장 값으로 변환 (시각은 문자열 비교가 가능한 ISO 형식)"""
+    if isinstance(value, datetime):
+        return value.strftime('%Y-%m-%d %H:%M:%S')
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+
+class MariaDBScanBackend:
+    """운영 MariaDB 소스 테이블 스캔"""
+
+    name = "mariadb"
+
+    def __init__(self, db_manager):
+        """
+        Args:
+            db_manager: DatabaseManager 인스턴스
+        """
+        self.db = db_manager
+
+    async def scan(self, plans: Dict[str, Any], start_date: str, end_date: str) -> ScanResult:
+        """소스 테이블별 융합 스캔 실행 (하나의 연결에서 소스당 1회)"""
+        async with self.db.get_async_connection('planner') as connection:
+            def _fetch():
+                scanned = {}
+                cursor = connection.cursor()
+                try:
+                    for source_name, plan in plans.items():
+                        cursor.execute(plan.build_query(), [start_date, end_date])
+                        scanned[source_name] = {row[0]: row for row in cursor.fetchall()}
+                        logger.info(f"🔍 [Planner] {plan.source.table} 스캔 - {len(scanned[source_name])}일, "
+                                    f"측정값 {len(plan.measures)}개 → 대상 {plan.targets}")
+                    return scanned
+                finally:
+                    cursor.close()
+
+            return await self.db.run_in_executor(_fetch)
+
+
+class SQLiteScanBackend:
+    """로컬 SQLite 스냅샷 스캔 및 MariaDB → 스냅샷 내보내기"""
+
+    name = "sqlite"
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Args:
+            path: 스냅샷 파일 경로 (None 이면 SNAPSHOT_PATH)
+        """
+        self.path = path or settings.SNAPSHOT_PATH
+
+    def _connect(self) -> sqlite3.Connection:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        connection = sqlite3.connect(self.path)
+        connection.execute("PRAGMA journal_mode = WAL")
+        connection.execute("PRAGMA synchronous = NORMAL")
+        return connection
+
+    def _ensure_table(self, connection: sqlite3.Connection, source_name: str):
+        source = SOURCE_SPECS[source_name]
+        columns = source_columns(source_name)
+        connection.execute(
+            f"CREATE TABLE IF NOT EXISTS {source.table} ({', '.join(columns)})"
+        )
+        connection.execute(
+            f"CREATE INDEX IF NOT EXISTS ix_{source.table}_{source.time_column} "
+            f"ON {source.table} ({source.time_column})"
+        )
+
+    async def scan(self, plans: Dict[str, Any], start_date: str, end_date: str) -> ScanResult:
+        """스냅샷 파일에서 소스별 융합 스캔 실행 (MariaDB 스캔과 같은 결과 형식)"""
+        def _fetch():
+            scanned = {}
+            connection = self._connect()
+            try:
+                for source_name, plan in plans.items():
+                    self._ensure_table(connection, source_name)
+                    rows = connection.execute(plan.build_query("sqlite"), [start_date, end_date]).fetchall()
+                    # SQLite DATE() 결과는 문자열이므로 MariaDB 스캔과 같은 date 키로 변환
+                    scanned[source_name] = {
+                        date.fromisoformat(row[0]): (date.fromisoformat(row[0]),) + tuple(row[1:])
+                        for row in rows
+                    }
+                    logger.info(f"🔍 [Planner] {plan.source.table} 스냅샷 스캔 - {len(rows)}일, "
+                                f"측정값 {len(plan.measures)}개 → 대상 {plan.targets}")
+                return scanned
+            finally:
+                connection.close()
+
+        return await asyncio.get_running_loop().run_in_executor(None, _fetch)
+
+    async def export(self, db_manager, start_date: str, end_date: str,
+                     sources: Optional[List[str]] = None) -> Dict[str, int]:
+        """
+        MariaDB 소스 테이블의 날짜 범위를 스냅샷 파일로 내보내기 (같은 범위를 다시 내보내면 교체)
+
+        Args:
+            db_manager: DatabaseManager 인스턴스
+            start_date: 시작 날짜 (YYYY-MM-DD)
+            end_date: 종료 날짜 (YYYY-MM-DD, 포함)
+            sources: 소스 이름 목록 (None 이면 SOURCE_SPECS 전체)
+
+        Returns:
+            Dict: 소스 이름 → 내보낸 행 수
+        """
+        source_names = list(sources) if sources else list(SOURCE_SPECS)
+        batch_rows = max(1, settings.SNAPSHOT_BATCH_ROWS)
+
+        async with db_manager.get_async_connection('snapshot') as connection:
+            def _export():
+                exported = {}
+                snapshot = self._connect()
+                try:
+                    for source_name in source_names:
+                        source = SOURCE_SPECS[source_name]
+                        columns = source_columns(source_name)
+                        time_column = source.time_column
+                        self._ensure_table(snapshot, source_name)
+                        snapshot.execute(
+                            f"DELETE FROM {source.table} WHERE {time_column} >= ? AND {time_column} < DATE(?, '+1 day')",
+                            [start_date, end_date]
+                        )
+
+                        # 다년치 범위도 메모리에 모두 올리지 않도록 서버 측 커서로 나누어 읽음
+                        cursor = connection.cursor(pymysql.cursors.SSCursor)
+                        count = 0
+                        try:
+                            cursor.execute(f"""
+                            SELECT {", ".join(columns)}
+                            FROM {source.table}
+                            WHERE {time_column} >= %s AND {time_column} < DATE_ADD(%s, INTERVAL 1 DAY)
+                            """, [start_date, end_date])
+                            insert = (f"INSERT INTO {source.table} ({', '.join(columns)}) "
+                                      f"VALUES ({', '.join(['?'] * len(columns))})")
+                            while True:
+                                rows = cursor.fetchmany(batch_rows)
+                                if not rows:
+                                    break
+                                snapshot.executemany(insert, [tuple(_to_sqlite(value) for value in row) for row in rows])
+                                count += len(rows)
+                        finally:
+                            cursor.close()
+
+                        snapshot.commit()
+                        exported[source_name] = count
+                        logger.info(f"📦 [Snapshot] {source.table} {start_date} ~ {end_date} 내보내기 - {count}행")
+                    return exported
+                finally:
+                    snapshot.close()
+
+            return await db_manager.run_in_executor(_export)
+
+    async def status(self) -> Dict[str, Any]:
+        """스냅샷 파일의 소스별 행 수와 시간 범위"""
+        def _status():
+            connection = self._connect()
+            try:
+                tables = {}
+                for source_name, source in SOURCE_SPECS.items():
+                    self._ensure_table(connection, source_name)
+                    count, first, last = connection.execute(
+                        f"SELECT COUNT(*), MIN({source.time_column}), MAX({source.time_column}) FROM {source.table}"
+                    ).fetchone()
+                    tables[source_name] = {"table": source.table, "rows": count, "first": first, "last": last}
+                return {"path": self.path, "tables": tables}
+            finally:
+                connection.close()
+
+        return await asyncio.get_running_loop().run_in_executor(None, _status)
+
+
+def get_scan_backend(name: Optional[str] = None, db_manager=None, path: Optional[str] = None):
+    """
+    스캔 백엔드 생성
+
+    Args:
+        name: mariadb / sqlite (None 이면 SCAN_BACKEND)
+        db_manager: mariadb 백엔드가 사용할 DatabaseManager (None 이면 전역 인스턴스)
+        path: sqlite 스냅샷 파일 경로 (None 이면 SNAPSHOT_PATH)
+    """
+    name = name or settings.SCAN_BACKEND
+    if name == "sqlite":
+        return SQLiteScanBackend(path)
+    if name == "mariadb":
+        if db_manager is None:
+            from app.core.database import db_manager
+        return MariaDBScanBackend(db_manager)
+    raise ValueError(f"지원하지 않는 스캔 백엔드: {name} (mariadb / sqlite)")
@@ -2,11 +2,11 @@
 태양광 발전 데이터 집계 서비스
 tb_ai_solar_power 테이블에 데이터 적재
 """
-import asyncio
 import logging
-import pymysql.cursors
-from typing import Dict, Any, List
+from typing import Dict, Any
 from app.core.config import settings
+from app.core.records import empty_columnar, rows_to_columnar
+from app.services.run_history_service import track_run
 
 logger = logging.getLogger(__name__)
 
@@ -40,6 +40,24 @@ class SolarPowerService:
         Returns:
             Dict: 결과 정보 (success, inserted_count, target_date, message)
         """
+        # 실행 이력(소요 시간/영향받은 행 수) 기록
+        with track_run('solar_power', target_date) as run:
+            # 다른 워커/노드가 같은 (서비스, 날짜)를 집계 중이면 중복 UPSERT 없이 건너뜀
+            async with self.db.aggregation_locks(['solar_power'], target_date) as acquired:
+                if not acquired:
+                    run.result = {
+                        "success": False,
+                        "error_class": "AggregationLockBusy",
+                        "affected_rows": 0,
+                        "target_date": target_date,
+                        "message": f"{target_date} 날짜의 Solar Power 데이터는 다른 프로세스에서 집계 중입니다"
+                    }
+                    return run.result
+                run.result = await self._aggregate_and_insert(target_date)
+                return run.result
+
+    async def _aggregate_and_insert(self, target_date: str) -> Dict[str, Any]:
+        """락 획득 후 집계 및 적재 실행"""
         logger.info(f"📊 [Solar Power] 데이터 집계 및 적재 시작 - {target_date}")
 
         try:
@@ -98,23 +116,23 @@ class SolarPowerService:
 
             logger.info(f"🔍 [Solar Power] 파라미터: {params}")
 
-            async with self.db.get_async_connection() as connection:
-                def _execute():
-                    cursor = connection.cursor()
-                    try:
-                        cursor.execute(query, params)
-                        connection.commit()
-                        affected_rows = cursor.rowcount
-                        # ON DUPLICATE KEY UPDATE의 rowcount:
-                        # 1 = 새로운 행 삽입
-                        # 2 = 기존 행 업데이트
-                        # 0 = 업데이트했지만 값 변화 없음
-                        logger.info(f"✅ [Solar Power] rowcount: {affected_rows} (1=INSERT, 2=UPDATE, 0=변화없음)")
-                        return affected_rows
-                    finally:
-                        cursor.close()
-
-                affected_rows = await asyncio.get_event_loop().run_in_executor(None, _execute)
+            def _execute(connection):
+                cursor = connection.cursor()
+                try:
+                    cursor.execute(query, params)
+                    connection.commit()
+                    affected_rows = cursor.rowcount
+                    # ON DUPLICATE KEY UPDATE의 rowcount:
+                    # 1 = 새로운 행 삽입
+                    # 2 = 기존 행 업데이트
+                    # 0 = 업데이트했지만 값 변화 없음
+                    logger.info(f"✅ [Solar Power] rowcount: {affected_rows} (1=INSERT, 2=UPDATE, 0=변화없음)")
+                    return affected_rows
+                finally:
+                    cursor.close()
+
+            # 대상 테이블별 직렬화 + 데드락/락 대기 시 재시도
+            affected_rows = await self.db.execute_write(self.ai_solar_power_table, _execute, target_date, 'solar_power')
 
             logger.info(f"✅ [Solar Power] 데이터 집계 및 적재 완료 (영향받은 행: {affected_rows})")
 
@@ -129,12 +147,13 @@ class SolarPowerService:
             logger.error(f"❌ [Solar Power] 데이터 집계 및 적재 실패: {str(e)}")
             return {
                 "success": False,
+                "error_class": type(e).__name__,
                 "affected_rows": 0,
                 "target_date": target_date,
                 "message": f"Solar Power 데이터 적재 중 오류 발생: {str(e)}"
             }
 
-    async def verify_data(self, limit: int = 10) -> List[Dict[str, Any]]:
+    async def verify_data(self, limit: int = 10) -> Dict[str, Any]:
         """
         적재된 데이터 확인
 
@@ -142,35 +161,35 @@ class SolarPowerService:
             limit: 조회할 레코드 수
 
         Returns:
-            List[Dict]: 적재된 데이터 리스트
+            Dict: columns, rows (columns 순서의 행 행렬), count
         """
         query = f"""
         SELECT
-            ymdhms, tmn, tmx, ics,
-            pre_pwr_generation, today_generation, accum_generation
-        FROM {self.ai_solar_power_table}
-        ORDER BY ymdhms DESC
+            DATE_FORMAT(t.ymdhms, '%%Y-%%m-%%d %%H:%%i:%%s') AS ymdhms, t.tmn, t.tmx, t.ics,
+            t.pre_pwr_generation, t.today_generation, t.accum_generation
+        FROM {self.ai_solar_power_table} t
+        ORDER BY t.ymdhms DESC
         LIMIT %s
         """
 
         try:
-            async with self.db.get_async_connection() as connection:
+            async with self.db.get_async_connection('verify') as connection:
                 def _fetch():
-                    cursor = connection.cursor(pymysql.cursors.DictCursor)
+                    # 튜플 커서 결과를 행 행렬 그대로 반환 (datetime 포맷은 SQL 에서 처리)
+                    cursor = connection.cursor()
                     try:
                         cursor.execute(query, (limit,))
-                        results = cursor.fetchall()
-                        return results
+                        return rows_to_columnar(cursor.description, cursor.fetchall())
                     finally:
                         cursor.close()
 
-                results = await asyncio.get_event_loop().run_in_executor(None, _fetch)
-                logger.info(f"📊 [Solar Power] 최근 {len(results)}건의 데이터 조회 완료")
+                results = await self.db.run_in_executor(_fetch)
+                logger.info(f"📊 [Solar Power] 최근 {results['count']}건의 데이터 조회 완료")
                 return results
 
         except Exception as e:
             logger.error(f"❌ [Solar Power] 데이터 조회 실패: {str(e)}")
-            return []
+            return empty_columnar()
 
 # 전역 인스턴스
 _solar_power_service = None
@@ -1,13 +1,51 @@
 """
 TB AI Solar Power API 실행 스크립트
+
+개발 모드 (기본, 단일 프로세스 + reload):
+    python run.py
+
+운영 모드 (멀티 프로세스, 워커 수 기본값 = CPU 코어 수):
+    python run.py --prod --workers 4
+
+운영 모드에서는 WEB_CONCURRENCY 환경변수로 워커 수가 전달되어
+각 워커의 연결 풀이 DB_CONNECTION_BUDGET / 워커 수 로 나뉘어 구성됩니다.
 """
+import argparse
+import os
+
 import uvicorn
 
-if __name__ == "__main__":
+def main():
+    parser = argparse.ArgumentParser(description="TB AI Data Aggregation API 실행")
+    parser.add_argument("--prod", action="store_true", help="운영 모드 (멀티 프로세스, reload 비활성)")
+    parser.add_argument("--workers", type=int, default=None, help="워커 프로세스 수 (운영 모드, 기본값: CPU 코어 수)")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8003)
+    args = parser.parse_args()
+
+    if not args.prod:
+        uvicorn.run(
+            "app.main:app",
+            host=args.host,
+            port=args.port,
+            reload=True,
+            log_level="info"
+        )
+        return
+
+    workers = max(1, args.workers or os.cpu_count() or 1)
+    # 워커 프로세스들이 상속하여 프로세스별 연결 풀 크기를 계산하도록 전달
+    os.environ["WEB_CONCURRENCY"] = str(workers)
+
     uvicorn.run(
         "app.main:app",
-        host="0.0.0.0",
-        port=8003,
-        reload=True,
-        log_level="info"
+        host=args.host,
+        port=args.port,
+        workers=workers,
+        reload=False,
+        log_level="info",
+        access_log=False
     )
+
+if __name__ == "__main__":
+    main()
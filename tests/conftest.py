@@ -0,0 +1,59 @@
+"""
+공용 픽스처
+"""
+import asyncio
+from datetime import date, datetime
+
+import pytest
+
+from tests.fake_db import RecordingDatabaseManager
+
+TARGET_DATE = "2024-01-15"
+
+
+def source_responder(query, params):
+    """소스/대상 테이블에 하루치 데이터가 있는 것처럼 응답"""
+    q = " ".join(query.split())
+    if q.startswith("SELECT GET_LOCK"):
+        return [tuple(1 for _ in range(q.count("GET_LOCK(")))]
+    if "GROUP BY DATE(" in q:
+        # 공유 스캔: (dt, cnt, m0, m1, ...)
+        return [(date(2024, 1, 15), 24) + (1.0,) * q.count(" AS m")]
+    if "COUNT(*) as cnt" in q:
+        return [{"cnt": 1, "min_time": datetime(2024, 1, 15), "max_time": datetime(2024, 1, 15)}]
+    if "match_count" in q:
+        return [{"match_count": 24, "solar_forecast_sum": 100.0, "smarteye_forecast": 300.0, "pwr_ess": 200.0}]
+    if q.startswith("SELECT V_TIME, forecast_quantity"):
+        return [("20240115", 200.0)]
+    if q.startswith("SELECT k.ymdhms"):
+        # ESS Charge 조인 읽기: 세 소스 모두 있고 기존 행은 없음
+        return [(datetime(2024, 1, 15), 1, 1.0, 2.0, 1, 3.0, 4.0, 1, 5.0, 6.0, 0) + (None,) * 6]
+    return []
+
+
+@pytest.fixture
+def db():
+    manager = RecordingDatabaseManager(source_responder)
+    yield manager
+    manager.close()
+
+
+def steady_state(db, factory):
+    """
+    한 번 실행해 풀을 채운 뒤 다시 실행한 호출의 기록 반환
+    (첫 호출의 연결 생성/세션 설정은 요청마다 반복되는 비용이 아니므로 제외)
+
+    Args:
+        db: RecordingDatabaseManager
+        factory: 매번 새 코루틴을 만드는 함수
+
+    Returns:
+        Tuple: (두 번째 호출 결과, 기록 카운터)
+    """
+    async def _run():
+        await factory()
+        db.reset()
+        return await factory()
+
+    result = asyncio.run(_run())
+    return result, dict(db.counts)
@@ -0,0 +1,127 @@
+"""
+테스트용 기록 DB
+DatabaseManager 의 풀/레인/락/쓰기 스케줄러 로직은 그대로 사용하고, 물리 연결만 가짜 연결로 바꾸어
+연결 수, 문장 수, 왕복(round trip) 수를 기록
+"""
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import pymysql.cursors
+
+from app.core.database import DatabaseManager
+
+# (query, params) → 결과 행 목록 (DictCursor 로 조회하는 쿼리는 dict 행, executemany 는 params 에 행 목록)
+# 예외를 던지면 해당 문장의 DB 오류로 전달됨
+Responder = Callable[[str, Optional[Sequence[Any]]], List[Any]]
+
+
+def _empty(query: str, params: Optional[Sequence[Any]]) -> List[Any]:
+    return []
+
+
+class RecordingCursor:
+    """execute / executemany 를 기록하고 응답기의 결과를 돌려주는 커서"""
+
+    def __init__(self, db: "RecordingDatabaseManager", dict_rows: bool):
+        self.db = db
+        self.dict_rows = dict_rows
+        self.rowcount = 0
+        self.description = None
+        self._rows: List[Any] = []
+
+    def execute(self, query: str, params: Optional[Sequence[Any]] = None):
+        self.db.record("execute", query)
+        self._rows = list(self.db.responder(query, params))
+        # INSERT ... ON DUPLICATE KEY UPDATE 는 신규 삽입 1 로 간주
+        self.rowcount = len(self._rows) if query.lstrip().upper().startswith("SELECT") else 1
+        return self.rowcount
+
+    def executemany(self, query: str, rows: Sequence[Sequence[Any]]):
+        # VALUES 형식 INSERT 는 pymysql 이 다중 행 INSERT 하나로 묶어 보내므로 왕복 1회
+        self.db.record("executemany", query)
+        self.db.responder(query, rows)
+        self._rows = []
+        self.rowcount = len(rows)
+        return self.rowcount
+
+    def fetchone(self):
+        return self._rows.pop(0) if self._rows else None
+
+    def fetchmany(self, size: int = 1):
+        rows, self._rows = self._rows[:size], self._rows[size:]
+        return rows
+
+    def fetchall(self):
+        rows, self._rows = self._rows, []
+        return rows
+
+    def close(self):
+        pass
+
+
+class RecordingConnection:
+    """pymysql 연결 대신 사용하는 가짜 연결"""
+
+    def __init__(self, db: "RecordingDatabaseManager", connection_id: int):
+        self.db = db
+        self.connection_id = connection_id
+        self.open = True
+        self.server_status = 0
+
+    def cursor(self, cursorclass=None):
+        return RecordingCursor(self.db, dict_rows=cursorclass is pymysql.cursors.DictCursor)
+
+    def commit(self):
+        self.db.record("commit")
+
+    def rollback(self):
+        self.db.record("rollback")
+
+    def thread_id(self) -> int:
+        return self.connection_id
+
+    def close(self):
+        self.open = False
+
+
+class RecordingDatabaseManager(DatabaseManager):
+    """
+    물리 연결 생성만 가짜로 바꾼 DatabaseManager
+
+    - connects: 새로 만든 물리 연결 수 (풀 연결 + 락 전용 연결)
+    - checkouts: 풀에서 빌린 연결 수 (get_async_connection 호출 수)
+    - statements: execute / executemany 호출 수
+    - round_trips: 서버 왕복 수 (문장 + commit + rollback)
+    """
+
+    def __init__(self, responder: Optional[Responder] = None):
+        super().__init__()
+        self.responder = responder or _empty
+        self.statements: List[str] = []
+        self.counts: Dict[str, int] = {"connects": 0, "checkouts": 0, "statements": 0,
+                                       "round_trips": 0, "commits": 0}
+
+    def record(self, kind: str, query: Optional[str] = None):
+        self.counts["round_trips"] += 1
+        if kind in ("execute", "executemany"):
+            self.counts["statements"] += 1
+            self.statements.append(" ".join(query.split()))
+        elif kind == "commit":
+            self.counts["commits"] += 1
+
+    def get_connection(self):
+        self.counts["connects"] += 1
+        return RecordingConnection(self, self.counts["connects"])
+
+    def get_async_connection(self, service: Optional[str] = None):
+        self.counts["checkouts"] += 1
+        return super().get_async_connection(service)
+
+    def reset(self):
+        """지금까지의 기록 초기화 (풀에 남은 연결은 유지)"""
+        self.statements.clear()
+        for key in self.counts:
+            self.counts[key] = 0
+
+    def close(self):
+        for executor in self.executors.values():
+            executor.shutdown(wait=True)
@@ -0,0 +1,61 @@
+"""
+요청 취소 시 연결 폐기 테스트
+KILL QUERY 후 스레드에서 실행 중인 작업이 끝난 뒤에야, 이벤트 루프가 아닌 스레드에서 연결을 닫는지 확인
+"""
+import asyncio
+import threading
+import time
+
+import pytest
+
+from tests.fake_db import RecordingDatabaseManager
+
+
+def test_cancelled_connection_closes_after_running_call():
+    started = threading.Event()
+    killed = threading.Event()
+    events = []
+
+    def responder(query, params):
+        if query.startswith("KILL QUERY"):
+            killed.set()
+        elif query.startswith("SELECT SLEEP"):
+            started.set()
+            killed.wait(5)
+            # KILL QUERY 이후에도 드라이버가 오류 응답을 읽는 동안 연결을 쓰고 있음
+            time.sleep(0.05)
+            events.append("query_done")
+        return []
+
+    db = RecordingDatabaseManager(responder)
+
+    async def query():
+        async with db.get_async_connection() as connection:
+            close = connection.close
+
+            def recording_close():
+                events.append(("close", threading.current_thread() is threading.main_thread()))
+                close()
+
+            connection.close = recording_close
+
+            def run(conn):
+                conn.cursor().execute("SELECT SLEEP(10)")
+
+            await db.run_in_executor(run, connection)
+
+    async def main():
+        task = asyncio.create_task(query())
+        await asyncio.get_running_loop().run_in_executor(None, started.wait, 5)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    try:
+        asyncio.run(main())
+    finally:
+        db.close()
+
+    assert events == ["query_done", ("close", False)]
+    assert db.pool_stats["killed_queries"] == 1
+    assert db.pool_stats["discarded"] == 1
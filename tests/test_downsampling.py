@@ -0,0 +1,65 @@
+"""
+장기 범위 다운샘플링 테스트
+"""
+import asyncio
+import math
+from datetime import date, timedelta
+
+import pytest
+
+from app.core.downsampling import downsample
+from app.services.feature_service import FEATURE_COLUMNS, FeatureService
+from tests.fake_db import RecordingDatabaseManager
+
+START = date(2020, 1, 1)
+DAYS = 2000
+Y_INDEX = FEATURE_COLUMNS.index("today_generation")
+
+
+def feature_rows(days=DAYS):
+    """today_generation 이 주기 변동 + 하루 피크를 갖는 피처 행"""
+    rows = []
+    for offset in range(days):
+        y = 100 + 50 * math.sin(offset / 30)
+        if offset == 777:
+            y = 1000.0
+        row = [None] * len(FEATURE_COLUMNS)
+        row[0] = (START + timedelta(days=offset)).isoformat()
+        row[Y_INDEX] = y
+        rows.append(tuple(row))
+    return rows
+
+
+def _ordinal(row):
+    return date.fromisoformat(row[0]).toordinal()
+
+
+@pytest.mark.parametrize("method", ["lttb", "minmax"])
+def test_downsample_bounded_and_keeps_peak(method):
+    rows = feature_rows()
+    first, last = _ordinal(rows[0]), _ordinal(rows[-1])
+
+    sampler = downsample(rows, method, first, last, 200, Y_INDEX, _ordinal)
+
+    assert len(sampler.output) <= 200
+    assert sampler.source_count == DAYS
+    assert [row[0] for row in sampler.output] == sorted(row[0] for row in sampler.output)
+    assert rows[777] in sampler.output
+    if method == "lttb":
+        assert sampler.output[0] == rows[0] and sampler.output[-1] == rows[-1]
+
+
+def test_feature_range_streams_over_server_side_cursor():
+    rows = feature_rows()
+    db = RecordingDatabaseManager(lambda query, params: rows if "FROM (" in query else [])
+    try:
+        service = FeatureService(db)
+        result = asyncio.run(service.get_features(START.isoformat(), rows[-1][0], max_points=300))
+    finally:
+        db.close()
+
+    assert result["count"] <= 300
+    assert result["downsampling"]["source_count"] == DAYS
+    # 조인 쿼리 1회, 전체 행은 캐시하지 않음
+    assert len([statement for statement in db.statements if statement.startswith("SELECT")]) == 1
+    assert service.cache.get(START.isoformat(), rows[-1][0]) is None
@@ -0,0 +1,73 @@
+"""
+피처 스냅샷 세대 전환 테스트
+첫 날짜 이전 데이터가 들어와도 읽는 쪽은 항상 meta.json 과 일치하는 컬럼 파일을 봄
+"""
+import os
+from datetime import date, timedelta
+
+import pytest
+
+from app.services.feature_service import FEATURE_COLUMNS
+from app.services.feature_store import FeatureStore, FeatureStoreReader
+from tests.fake_db import RecordingDatabaseManager
+
+USAGE = FEATURE_COLUMNS.index("pwr_usage")
+
+
+def rows(start: date, days: int):
+    """pwr_usage 에 날짜 ordinal 을 넣은 피처 행 (정렬 확인용)"""
+    result = []
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        row = [None] * len(FEATURE_COLUMNS)
+        row[0] = day.isoformat()
+        row[USAGE] = float(day.toordinal())
+        result.append(tuple(row))
+    return result
+
+
+@pytest.fixture
+def store(tmp_path):
+    db = RecordingDatabaseManager()
+    feature_store = FeatureStore(db)
+    feature_store.directory = str(tmp_path)
+    feature_store.reader = FeatureStoreReader(str(tmp_path))
+    yield feature_store
+    db.close()
+
+
+def assert_aligned(reader, start, end):
+    view = reader.view(start, end, ["pwr_usage"])
+    first = date.fromisoformat(view["start"])
+    for offset, value in enumerate(view["columns"]["pwr_usage"]):
+        if view["present"][offset]:
+            assert value == (first + timedelta(days=offset)).toordinal()
+
+
+def test_prepend_switches_to_new_generation(store, tmp_path):
+    store._write_rows(rows(date(2024, 3, 1), 10))
+    before = store.reader.read_meta()["generation"]
+
+    store._write_rows(rows(date(2024, 2, 20), 5))
+
+    meta = store.reader.read_meta()
+    assert meta["base_date"] == "2024-02-20" and meta["days"] == 20
+    assert meta["generation"] != before
+    assert sorted(name for name in os.listdir(tmp_path) if name.startswith("gen-")) == [meta["generation"]]
+    assert_aligned(store.reader, "2024-02-01", "2024-03-31")
+
+
+def test_interrupted_prepend_keeps_previous_generation(store, monkeypatch):
+    store._write_rows(rows(date(2024, 3, 1), 10))
+    before = store.reader.read_meta()
+
+    def crash(*args):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(store, "_write_values", crash)
+    with pytest.raises(OSError):
+        store._write_rows(rows(date(2024, 2, 20), 5))
+
+    assert store.reader.read_meta() == before
+    assert_aligned(store.reader, "2024-02-01", "2024-03-31")
+    assert store.reader.view("2024-03-01", "2024-03-10")["days"] == 10
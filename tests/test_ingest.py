@@ -0,0 +1,87 @@
+"""
+원천 데이터 적재 실패 처리 테스트
+재시도해도 실패할 측정값이 버퍼를 막지 않고, 일시적 오류의 측정값만 재적재 대기하는지 확인
+"""
+import asyncio
+
+import pymysql
+import pytest
+
+from app.services.ingest_service import IngestService
+from tests.fake_db import RecordingDatabaseManager
+
+GOOD = [{"ymdhms": f"2025-01-15 {hour:02d}:00:00", "forecast_quantity": 1.0} for hour in range(3)]
+OUT_OF_RANGE = {"ymdhms": "2025-01-15 03:00:00", "forecast_quantity": 1e99}
+
+
+def _run(db, coroutine_factory):
+    try:
+        return asyncio.run(coroutine_factory())
+    finally:
+        db.close()
+
+
+def test_invalid_time_is_rejected_before_buffering():
+    db = RecordingDatabaseManager()
+    service = IngestService(db)
+
+    with pytest.raises(ValueError, match="ymdhms"):
+        _run(db, lambda: service.add("solar_day", GOOD + [{"ymdhms": "2025-02-30 00:00:00"}]))
+
+    assert service.buffers["solar_day"].rows == []
+
+
+def test_data_error_rejects_only_bad_readings():
+    def responder(query, params):
+        # executemany 는 행 목록, 행 단위 재적재(execute)는 행 하나
+        rows = params if isinstance(params, list) else [params]
+        if any(1e99 in row for row in rows):
+            raise pymysql.err.DataError(1264, "Out of range value for column 'forecast_quantity'")
+        return []
+
+    db = RecordingDatabaseManager(responder)
+    service = IngestService(db)
+
+    async def _add_and_flush():
+        await service.add("solar_day", GOOD + [OUT_OF_RANGE])
+        return await service.flush("solar_day")
+
+    _run(db, _add_and_flush)
+
+    stats = service.get_stats()["solar_day"]
+    assert stats["flushed"] == 3
+    assert stats["write_rejected"] == 1
+    assert stats["buffered"] == 0
+    assert stats["recent_write_rejected"][0]["reading"]["forecast_quantity"] == 1e99
+
+
+def test_transient_error_requeues_readings():
+    def responder(query, params):
+        raise pymysql.err.OperationalError(2013, "Lost connection to MySQL server during query")
+
+    db = RecordingDatabaseManager(responder)
+    service = IngestService(db)
+
+    async def _add_and_flush():
+        await service.add("solar_day", GOOD)
+        await service.flush("solar_day")
+
+    with pytest.raises(pymysql.err.OperationalError):
+        _run(db, _add_and_flush)
+
+    assert len(service.buffers["solar_day"].rows) == len(GOOD)
+    assert service.get_stats()["solar_day"]["write_rejected"] == 0
+
+
+def test_time_only_reading_is_idempotent():
+    db = RecordingDatabaseManager()
+    service = IngestService(db)
+
+    async def _add_and_flush():
+        await service.add("weather_info", [{"tm": "2025-01-15 00:00:00"}])
+        await service.flush("weather_info")
+
+    _run(db, _add_and_flush)
+
+    inserts = [statement for statement in db.statements if statement.startswith("INSERT")]
+    assert inserts and inserts[0].endswith("ON DUPLICATE KEY UPDATE tm = tm")
@@ -0,0 +1,30 @@
+"""
+실시간 집계 워터마크 테스트
+"""
+from datetime import date, datetime
+
+from app.services.live_aggregate_service import LiveAggregateService
+from tests.fake_db import RecordingDatabaseManager
+
+NOON = datetime(2025, 1, 15, 12)
+
+
+def test_row_committed_later_at_watermark_time_is_counted_once():
+    db = RecordingDatabaseManager()
+    try:
+        service = LiveAggregateService(db)
+        service._reset(date(2025, 1, 15))
+        width = len(service.columns["solar_day"])
+        first = (NOON,) + (1.0,) * width
+        late = (NOON,) + (2.0,) * width
+
+        assert service._apply({"solar_day": [first]}) == 1
+        # 다음 조회(>= 워터마크)에는 이미 반영한 행과 같은 시각에 늦게 커밋된 행이 함께 나옴
+        assert service._apply({"solar_day": [first, late]}) == 1
+        assert service._apply({"solar_day": [first, late]}) == 0
+
+        column = service.columns["solar_day"][0]
+        assert service.stats["solar_day"][column].sum == 3.0
+        assert service.row_counts["solar_day"] == 2
+    finally:
+        db.close()
@@ -0,0 +1,98 @@
+"""
+집계 호출별 DB 왕복 예산 회귀 테스트
+(반복 호출 기준) 연결 / 문장 / 왕복 수가 예산을 넘으면 실패 - 요청당 쿼리나 연결이 하나라도 늘면 여기서 드러남
+
+예산을 줄이는 변경은 예산도 함께 낮추고, 늘리는 변경은 이유를 확인한 뒤에만 올릴 것
+"""
+import json
+
+import pytest
+
+from app.api.aggregate_endpoints import aggregate_all_data
+from app.models.schemas import AggregationRequest
+from app.services.aggregation_planner import AggregationPlanner
+from app.services.ess_charge_service import ESSChargeService
+from app.services.ess_predict_service import ESSPredictService
+from app.services.ess_whatif_service import ESSWhatIfService
+from app.services.pipeline_service import PIPELINE_SERVICES, AggregationPipeline
+from app.services.power_usage_service import PowerUsageService
+from app.services.solar_power_service import SolarPowerService
+from tests.conftest import TARGET_DATE, steady_state
+
+# connects: 락 전용 연결 (GET_LOCK 은 연결 종료로 해제하므로 호출마다 새로 연결)
+# checkouts: 풀 연결 대여 수
+# round_trips: 문장 + commit
+BUDGETS = {
+    # GET_LOCK / INSERT ... SELECT / commit
+    SolarPowerService: {"connects": 1, "checkouts": 1, "statements": 2, "round_trips": 3},
+    # GET_LOCK / 소스 건수 확인 / INSERT ... SELECT / commit
+    PowerUsageService: {"connects": 1, "checkouts": 2, "statements": 3, "round_trips": 4},
+    # GET_LOCK / 매칭 확인 / INSERT ... SELECT / 적재 확인 / commit
+    ESSPredictService: {"connects": 1, "checkouts": 2, "statements": 4, "round_trips": 5},
+    # GET_LOCK / 조인 읽기 / 다중 행 UPSERT / commit
+    ESSChargeService: {"connects": 1, "checkouts": 1, "statements": 3, "round_trips": 4},
+}
+
+# GET_LOCK x4 (플래너 대상 3 + ESS Charge), 소스 스캔 3, 대상별 UPSERT 4, ESS Charge 조인 읽기 1,
+# 풀 연결의 서비스별 max_statement_time 전환 2 (planner ↔ ess_charge) / commit 4
+AGGREGATE_ALL_BUDGET = {"connects": 2, "checkouts": 5, "statements": 14, "round_trips": 18}
+
+
+def assert_within_budget(db, counts, budget):
+    over = {key: (counts[key], limit) for key, limit in budget.items() if counts[key] > limit}
+    assert not over, f"DB 왕복 예산 초과 (실제, 예산): {over}\n" + "\n".join(db.statements)
+
+
+@pytest.mark.parametrize("service_class", list(BUDGETS), ids=lambda cls: cls.__name__)
+def test_single_day_service_budget(db, service_class):
+    service = service_class(db)
+
+    result, counts = steady_state(db, lambda: service.aggregate_and_insert(TARGET_DATE))
+
+    assert result["success"], result["message"]
+    assert_within_budget(db, counts, BUDGETS[service_class])
+
+
+def test_ess_charge_range_does_not_scale_with_days(db):
+    service = ESSChargeService(db)
+
+    result, counts = steady_state(db, lambda: service.aggregate_range("2024-01-01", "2024-03-31"))
+
+    assert result["success"], result["message"]
+    assert_within_budget(db, counts, BUDGETS[ESSChargeService])
+
+
+def test_planner_range_scans_each_source_once(db):
+    planner = AggregationPlanner(db)
+    targets = ["solar_power", "power_usage", "ess_predict"]
+
+    results, _ = steady_state(db, lambda: planner.run("2024-01-01", "2024-12-31", targets=targets))
+
+    assert all(result["success"] for result in results.values())
+    scans = [statement for statement in db.statements if "GROUP BY DATE(" in statement]
+    assert len(scans) == 3, "\n".join(scans)
+
+
+def test_aggregate_all_budget(db):
+    pipeline = AggregationPipeline(AggregationPlanner(db), ESSChargeService(db))
+    request = AggregationRequest(target_date=TARGET_DATE)
+
+    response, counts = steady_state(db, lambda: aggregate_all_data(request, pipeline=pipeline))
+
+    assert response.status_code == 200
+    body = json.loads(response.body)
+    assert list(body) == PIPELINE_SERVICES
+    assert all(result["success"] for result in body.values()), body
+    assert_within_budget(db, counts, AGGREGATE_ALL_BUDGET)
+
+
+def test_ess_what_if_reads_once_and_never_writes(db):
+    service = ESSWhatIfService(db)
+
+    result, counts = steady_state(db, lambda: service.what_if("2024-01-01", "2024-12-31",
+                                                              [1000, 2000, 3120, 4000], [0.8, 1.0]))
+
+    assert len(result["scenarios"]) == 8
+    assert counts["commits"] == 0
+    assert not [statement for statement in db.statements if not statement.startswith("SELECT")]
+    assert_within_budget(db, counts, {"connects": 0, "checkouts": 1, "statements": 2, "round_trips": 2})